@@ -1,4 +1,18 @@
 """TicTacToe application package."""
-from app.main import app
+from typing import Any
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the FastAPI app on first access.
+
+    Importing any app module runs this file first; loading app.main here
+    eagerly would pull the web stack and the database into the bot worker
+    processes, which only need app.bot.mcts.
+    """
+    if name == "app":
+        from app.main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
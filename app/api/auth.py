@@ -11,6 +11,7 @@ from uuid import UUID
 from app.engine import get_db
 from app.schema.userDto import UserCreate, UserResponse, UserLogin, Token
 from app.services.user_service import user_service, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.services.game_service import BOT_USERNAME
 from app.crud import user_crud
 from app.model.user import User
 
@@ -67,9 +68,9 @@ def register_user(
     
     Returns the created user (without password).
     """
-    # Check if username already exists
+    # Check if username already exists (or is reserved for the computer opponent)
     existing_user = user_crud.get_user_by_username(db, user_data.username)
-    if existing_user:
+    if existing_user or user_data.username.lower() == BOT_USERNAME:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
@@ -2,18 +2,25 @@
 Game API endpoints.
 Handles game creation, retrieval, and move execution.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import base64
+import binascii
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from app.engine import get_db
-from app.schema.gameDto import GameResponse, GameWithMoves, BoardDisplay
-from app.schema.moveDto import MoveResponse
+from app.engine import get_db, get_read_db
+from app.schema.gameDto import GameResponse, GameWithMoves, BoardDisplay, MoveAnalysis, PositionAnalysis, GameReview, PurgeStatus
 from app.model.user import User
-from app.crud import game_crud, move_crud
+from app.model.game import Game
+from app.crud import game_crud, move_crud, review_crud
 from app.services.move_service import move_service
-from app.services.game_service import game_service, GameValidationError, GameNotFoundError
+from app.services.archive import complete_moves, get_archive, history_moves
+from app.services.purge_service import purge_service
+from app.services import export
+from app.services.game_service import game_service, GameValidationError, GameNotFoundError, GameConflictError
 from app.api.auth import get_current_user_dependency
 
 router = APIRouter(
@@ -22,8 +29,60 @@ router = APIRouter(
 )
 
 
+def _with_moves(db: Session, games: List[Game]) -> List[GameWithMoves]:
+    """Attach move histories to a list of games, loading all moves in one query."""
+    moves_by_game = move_crud.get_moves_by_games(
+        db,
+        [game.id for game in games],
+        since=min((game.created_at.replace(tzinfo=None) for game in games), default=None)
+    )
+    games_with_moves = []
+    for game in games:
+        game_dict = GameResponse.model_validate(game).model_dump()
+        game_dict['moves'] = complete_moves(game, moves_by_game[game.id])
+        games_with_moves.append(GameWithMoves(**game_dict))
+    return games_with_moves
+
+
+def _from_game_row(game: Game) -> GameWithMoves:
+    """Build a game response with the move history decoded from the game row alone."""
+    game_dict = GameResponse.model_validate(game).model_dump()
+    game_dict['moves'] = history_moves(game)
+    return GameWithMoves(**game_dict)
+
+
+def _encode_cursor(game: Game) -> str:
+    """Build the opaque cursor pointing after a game."""
+    raw = f"{game.created_at.isoformat()}|{game.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Parse a cursor built by _encode_cursor into (created_at, id)."""
+    try:
+        created_at, game_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(game_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _page(response: Response, games: List[Game], limit: int) -> List[Game]:
+    """Set the X-Next-Cursor header when more games may follow."""
+    if len(games) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(games[-1])
+    return games
+
+
 @router.post("", response_model=GameResponse, status_code=status.HTTP_201_CREATED)
 def create_game(
+    opponent: Optional[str] = Query(None, pattern="^computer$", description="Set to 'computer' to play against the bot"),
+    level: str = Query("hard", pattern="^(easy|medium|hard)$", description="Computer opponent level"),
+    rows: int = Query(3, ge=3, le=19, description="Number of board rows"),
+    cols: int = Query(3, ge=3, le=19, description="Number of board columns"),
+    win_length: int = Query(3, ge=3, le=19, description="Marks in a row needed to win"),
     current_user: User = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
 ):
@@ -32,8 +91,34 @@ def create_game(
     
     Creates a game for the authenticated user as Player X.
     Player O stays empty until another user joins via join endpoint.
+    
+    - **opponent**: Optional `computer` to play against the bot as Player O
+    - **level**: Computer opponent level (easy, medium, hard)
+    - **rows**, **cols**, **win_length**: Board size and winning run length
+      (default 3x3 with three in a row; e.g. 15x15 with five for Gomoku)
     """
-    return game_service.create_game_for_user(db=db, user_id=current_user.id)
+    try:
+        if opponent == "computer":
+            return game_service.create_game_vs_computer(
+                db=db,
+                user_id=current_user.id,
+                level=level,
+                board_rows=rows,
+                board_cols=cols,
+                win_length=win_length
+            )
+        return game_service.create_game_for_user(
+            db=db,
+            user_id=current_user.id,
+            board_rows=rows,
+            board_cols=cols,
+            win_length=win_length
+        )
+    except GameValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/{game_id}/join", response_model=GameWithMoves)
@@ -61,47 +146,81 @@ def join_game(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except GameConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except GameValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-    moves = move_crud.get_moves_by_game(db, game.id)
-    game_dict = GameResponse.model_validate(game).model_dump()
-    game_dict['moves'] = moves
-    return GameWithMoves(**game_dict)
+    return _from_game_row(game)
 
 
 @router.get("", response_model=List[GameWithMoves])
 def get_all_games(
+    response: Response,
     status: Optional[str] = Query(None, pattern="^(waiting|ongoing|won|draw)$", description="Filter by game status"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of games returned"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
     """
-    Retrieve a list of all games with move histories and statuses.
+    Retrieve a page of games with move histories and statuses.
     
     - **status**: Optional filter by game status (waiting, ongoing, won, draw)
+    - **limit**: Page size (default 100, at most 1000)
+    - **after**: Cursor of the previous page
     
-    Returns games with complete move histories.
+    Returns games in creation order with complete move histories. When more
+    games may follow, the response carries an `X-Next-Cursor` header to pass
+    as `after` for the next page.
     """
-    if status == "ongoing":
-        games = game_crud.get_ongoing_games(db)
-    else:
-        games = game_crud.get_all_games(db)
-        if status:
-            games = [g for g in games if g.status == status]
-    
-    # Add moves to each game
-    games_with_moves = []
-    for game in games:
-        moves = move_crud.get_moves_by_game(db, game.id)
-        game_dict = GameResponse.model_validate(game).model_dump()
-        game_dict['moves'] = moves
-        games_with_moves.append(GameWithMoves(**game_dict))
+    games = game_crud.get_games_page(
+        db,
+        status=status,
+        after=_decode_cursor(after) if after else None,
+        limit=limit
+    )
+    return _with_moves(db, _page(response, games, limit))
+
+
+@router.get("/export")
+def export_games(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format"),
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Games fetched per database round trip"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    """
+    Stream all games with their moves as NDJSON or CSV.
     
-    return games_with_moves
+    - **format**: `ndjson` (one game per line) or `csv`
+    - **chunk_size**: Games read from the database cursor at a time
+    
+    Games are streamed in creation order straight from a database cursor,
+    so the export never has to fit in memory. Moves are given as positions
+    in play order (X moves first).
+    """
+    # The stream outlives the request's session, so it reads through its own
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    
+    def _stream():
+        export_db = session_factory()
+        try:
+            yield from export.render_chunks(export_db, format, chunk_size)
+        finally:
+            export_db.close()
+    
+    return StreamingResponse(
+        _stream(),
+        media_type=export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="games.{format}"'}
+    )
 
 
 @router.get("/{game_id}", response_model=GameWithMoves)
@@ -115,23 +234,25 @@ def get_game_by_id(
     
     - **game_id**: UUID of the game
     
-    Returns the game with complete move history.
+    Returns the game with complete move history, read from the game row
+    (moves carry no id or timestamp here). Archived games are served from
+    the archive with their stored moves. If the computer's reply on a larger
+    board was lost, it is searched again.
     """
     game = game_crud.get_game_by_id(db, game_id)
     if not game:
+        archive = get_archive()
+        record = archive.get(game_id) if archive else None
+        if record:
+            return GameWithMoves(**record)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Game with id {game_id} not found"
         )
     
-    # Get moves for this game
-    moves = move_crud.get_moves_by_game(db, game.id)
-    
-    # Combine game and moves
-    game_dict = GameResponse.model_validate(game).model_dump()
-    game_dict['moves'] = moves
-    
-    return GameWithMoves(**game_dict)
+    # A computer reply lost to a failed search or a restart is searched again
+    move_service.resume_bot_move(db, game)
+    return _from_game_row(game)
 
 
 @router.get("/{game_id}/board", response_model=BoardDisplay)
@@ -145,7 +266,83 @@ def get_game_board(
     
     - **game_id**: UUID of the game
     
-    Returns the board as a 3x3 array.
+    Returns the board as a rows x cols array (3x3 by default).
+    """
+    game = game_crud.get_game_by_id(db, game_id)
+    if not game:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Game with id {game_id} not found"
+        )
+    
+    return BoardDisplay.from_board_state(game.board_state, cols=game.board_cols)
+
+
+@router.get("/{game_id}/analysis", response_model=PositionAnalysis)
+def get_game_analysis(
+    game_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    """
+    Analyze the current position of a 3x3 game.
+    
+    - **game_id**: UUID of the game
+    
+    Returns the perfect-play value of every legal move for the player to
+    move (win, draw or loss and the number of moves until the game ends)
+    together with the best move. Ties go to the quickest win or the
+    slowest loss.
+    """
+    game = game_crud.get_game_by_id(db, game_id)
+    if not game:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Game with id {game_id} not found"
+        )
+    if not game.is_standard_board:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Analysis is only available for 3x3 games"
+        )
+    
+    if game.status not in ('waiting', 'ongoing'):
+        return PositionAnalysis(game_id=game.id, board_state=game.board_state, status=game.status)
+    
+    moves = [
+        MoveAnalysis(position=position, result=result, plies_to_result=plies)
+        for position, result, plies in game_service.analyze_position(game.board_state, game.current_player)
+    ]
+    rank = {'win': 2, 'draw': 1, 'loss': 0}
+    best = max(
+        moves,
+        key=lambda move: (rank[move.result], -move.plies_to_result if move.result == 'win' else move.plies_to_result),
+        default=None
+    )
+    return PositionAnalysis(
+        game_id=game.id,
+        board_state=game.board_state,
+        status=game.status,
+        player=game.current_player,
+        best_move=best.position if best else None,
+        moves=moves
+    )
+
+
+@router.get("/{game_id}/review", response_model=GameReview)
+def get_game_review(
+    game_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    """
+    Get the post-game review of a finished 3x3 game.
+    
+    - **game_id**: UUID of the game
+    
+    Finished games are reviewed in the background. Until that has happened
+    the review is returned with status `pending`; afterwards it lists the
+    accuracy and blunder flag of every move.
     """
     game = game_crud.get_game_by_id(db, game_id)
     if not game:
@@ -153,8 +350,32 @@ def get_game_board(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Game with id {game_id} not found"
         )
+    if not game.is_standard_board:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Reviews are only available for 3x3 games"
+        )
+    if game.status not in ('won', 'draw'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Game is not finished yet"
+        )
+    
+    reviews = review_crud.get_reviews_by_game(db, game.id)
+    if not reviews:
+        return GameReview(game_id=game.id, status="pending")
+    
+    def _average(player: str) -> Optional[float]:
+        values = [review.accuracy for review in reviews if review.player == player]
+        return sum(values) / len(values) if values else None
     
-    return BoardDisplay.from_board_state(game.board_state)
+    return GameReview(
+        game_id=game.id,
+        status="complete",
+        accuracy_x=_average('X'),
+        accuracy_o=_average('O'),
+        moves=reviews
+    )
 
 
 @router.put("/{game_id}/move/{position}", response_model=GameWithMoves)
@@ -165,10 +386,10 @@ def make_move(
     db: Session = Depends(get_db)
 ):
     """
-    Make a move at the specified position (1–9) in the given game.
+    Make a move at the specified position (1–9 on the 3x3 board) in the given game.
     
     - **game_id**: UUID of the game
-    - **position**: Position on the board (1-9)
+    - **position**: Position on the board (1 to rows * cols, row-major)
     
     ```
     Board positions:
@@ -184,22 +405,24 @@ def make_move(
     **Errors:**
     - 404: Game not found
     - 400: Invalid move (waiting for second player, position occupied, out of bounds, wrong turn, game finished)
+    - 409: Another move was made in this game at the same time
     """
-    # Validate position
-    if not 1 <= position <= 9:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Position must be between 1 and 9"
-        )
-    
-    # Get game
-    game = game_crud.get_game_by_id(db, game_id)
+    # Get game and its moves in one query; the response is built from them in memory
+    game = game_crud.get_game_with_moves(db, game_id)
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Game with id {game_id} not found"
         )
     
+    # Validate position
+    cell_count = game.board_rows * game.board_cols
+    if not 1 <= position <= cell_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Position must be between 1 and {cell_count}"
+        )
+    
     # Execute move
     try:
         result = move_service.execute_move(
@@ -209,15 +432,17 @@ def make_move(
             player_id=current_user.id
         )
         
-        # Get updated game with moves
         updated_game = result["game"]
-        moves = move_crud.get_moves_by_game(db, updated_game.id)
-        
         game_dict = GameResponse.model_validate(updated_game).model_dump()
-        game_dict['moves'] = moves
+        game_dict['moves'] = updated_game.moves
         
         return GameWithMoves(**game_dict)
         
+    except GameConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -250,36 +475,67 @@ def delete_game(
 
 @router.delete("/completed/all", status_code=status.HTTP_200_OK)
 def delete_completed_games(
+    response: Response,
+    older_than_days: Optional[int] = Query(None, ge=0, description="Only delete games finished at least this many days ago"),
+    background: bool = Query(False, description="Start the purge in the background and return immediately"),
     current_user: User = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
 ):
     """
-    Delete all completed games (won or draw).
+    Delete completed games (won or draw).
     
-    Returns the number of games deleted.
+    Games are deleted in batches of PURGE_BATCH_SIZE, one transaction each.
+    Returns the number of games deleted. With `background=true` the purge is
+    started on a worker thread instead and 202 is returned with its status;
+    progress is reported by `GET /games/completed/purge`.
     """
-    count = game_crud.delete_completed_games(db)
+    older_than = timedelta(days=older_than_days) if older_than_days is not None else None
+    if background:
+        if not purge_service.start(db, older_than):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A purge of completed games is already running"
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return purge_service.status()
+    
+    count = game_crud.delete_completed_games(db, older_than=older_than, batch_size=purge_service.batch_size)
     return {"deleted_count": count, "message": f"Deleted {count} completed game(s)"}
 
 
+@router.get("/completed/purge", response_model=PurgeStatus)
+def get_purge_status(
+    current_user: User = Depends(get_current_user_dependency),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the progress of the current or last background purge.
+
+    A purge started by another app process shows as running without progress.
+    """
+    return purge_service.status(db)
+
+
 @router.get("/user/me", response_model=List[GameWithMoves])
 def get_my_games(
+    response: Response,
+    status: Optional[str] = Query(None, pattern="^(waiting|ongoing|won|draw)$", description="Filter by game status"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of games returned"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     current_user: User = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all games for the current authenticated user.
+    Get a page of games for the current authenticated user.
     
-    Returns games where the user is either Player X or Player O.
+    Returns games where the user is either Player X or Player O, paginated
+    like `GET /games`.
     """
-    games = game_crud.get_games_by_user(db, current_user.id)
-    
-    # Add moves to each game
-    games_with_moves = []
-    for game in games:
-        moves = move_crud.get_moves_by_game(db, game.id)
-        game_dict = GameResponse.model_validate(game).model_dump()
-        game_dict['moves'] = moves
-        games_with_moves.append(GameWithMoves(**game_dict))
-    
-    return games_with_moves
+    games = game_crud.get_games_page(
+        db,
+        status=status,
+        user_id=current_user.id,
+        after=_decode_cursor(after) if after else None,
+        limit=limit
+    )
+    return _with_moves(db, _page(response, games, limit))
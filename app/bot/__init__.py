@@ -0,0 +1,8 @@
+"""
+Move search for the computer opponent.
+
+These modules run inside the bot worker processes (see
+app.services.bot_pool), which import them to unpickle the search calls.
+They must not import the database or web layers, and this package is kept
+outside app.services so that loading it does not import every service.
+"""
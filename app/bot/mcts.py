@@ -0,0 +1,355 @@
+"""
+Monte Carlo Tree Search for the computer opponent on m,n,k boards.
+
+Exhaustive search stops scaling past 3x3, so larger boards are played with
+UCT: the tree grows within a wall-clock budget and each new leaf is scored
+with a random playout. Positions are compact bytearrays (0 empty, 1 X, 2 O)
+with precomputed line offsets, so playouts never touch board_state strings.
+
+Trees are kept per game in a process-wide table and advanced through the
+moves played since the last search, so the statistics gathered for the
+opponent's reply are reused on the next turn. The functions here run inside
+the bot worker processes (see app.services.bot_pool) and must stay free of
+database imports.
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+EMPTY_CODE = 0
+PLAYER_CODES = {'X': 1, 'O': 2}
+
+# UCT exploration constant
+EXPLORATION = 1.4
+
+# Only cells within this distance of an existing mark are considered as moves
+NEIGHBOURHOOD = 2
+
+# Number of game trees kept per worker process
+MAX_TREES = 128
+
+# Share of the time budget spent per computer level
+LEVEL_BUDGET_SCALE = {
+    'easy': 0.1,
+    'medium': 0.4,
+    'hard': 1.0,
+}
+
+_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class Geometry:
+    """Precomputed line offsets and neighbourhoods for one board shape."""
+
+    __slots__ = ("rows", "cols", "win_length", "size", "rays", "near", "center")
+
+    def __init__(self, rows: int, cols: int, win_length: int):
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.size = rows * cols
+        self.center = (rows // 2) * cols + cols // 2
+        # rays[index] holds one (forward, backward) pair of cell lists per direction,
+        # each at most win_length - 1 cells long
+        self.rays = []
+        self.near = []
+        for index in range(self.size):
+            row, col = divmod(index, cols)
+            pairs = []
+            for row_step, col_step in _DIRECTIONS:
+                pairs.append(tuple(
+                    [
+                        r * cols + c
+                        for r, c in (
+                            (row + sign * step * row_step, col + sign * step * col_step)
+                            for step in range(1, win_length)
+                        )
+                        if 0 <= r < rows and 0 <= c < cols
+                    ]
+                    for sign in (1, -1)
+                ))
+            self.rays.append(tuple(pairs))
+            self.near.append(tuple(
+                r * cols + c
+                for r in range(max(0, row - NEIGHBOURHOOD), min(rows, row + NEIGHBOURHOOD + 1))
+                for c in range(max(0, col - NEIGHBOURHOOD), min(cols, col + NEIGHBOURHOOD + 1))
+                if (r, c) != (row, col)
+            ))
+
+    def wins(self, cells: bytearray, index: int) -> bool:
+        """Check whether the mark on a cell completes a line through it."""
+        mark = cells[index]
+        for forward, backward in self.rays[index]:
+            count = 1
+            for neighbour in forward:
+                if cells[neighbour] != mark:
+                    break
+                count += 1
+            for neighbour in backward:
+                if cells[neighbour] != mark:
+                    break
+                count += 1
+            if count >= self.win_length:
+                return True
+        return False
+
+
+@lru_cache(maxsize=32)
+def get_geometry(rows: int, cols: int, win_length: int) -> Geometry:
+    """Return the (cached) geometry for a board shape."""
+    return Geometry(rows, cols, win_length)
+
+
+def encode(board_state: str) -> bytearray:
+    """Convert a board_state string to the compact cell array."""
+    return bytearray(PLAYER_CODES.get(cell, EMPTY_CODE) for cell in board_state)
+
+
+class Node:
+    """Search tree node; statistics are from the view of the player who moved into it."""
+
+    __slots__ = ("move", "parent", "mover", "children", "untried", "visits", "wins", "terminal")
+
+    def __init__(self, move: Optional[int], parent: Optional["Node"], mover: int, terminal: Optional[float] = None):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.children: List["Node"] = []
+        self.untried: Optional[List[int]] = None
+        self.visits = 0
+        self.wins = 0.0
+        # Result for the mover if the move ended the game (1 win, 0.5 draw)
+        self.terminal = terminal
+
+    def select_child(self) -> "Node":
+        """Pick the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+        )
+
+
+class SearchTree:
+    """MCTS tree rooted at the current position of one game."""
+
+    def __init__(self, geometry: Geometry, cells: bytearray, to_move: int):
+        self.geometry = geometry
+        self.cells = cells
+        self.root = Node(None, None, 3 - to_move)
+
+    @property
+    def to_move(self) -> int:
+        """Player code of the side to move at the root."""
+        return 3 - self.root.mover
+
+    def advance(self, cells: bytearray, to_move: int) -> bool:
+        """
+        Move the root to a later position of the same game.
+
+        Only succeeds when the new position follows from the root by at most
+        one move of the side to move; otherwise the caller starts a new tree.
+
+        Returns:
+            True if the tree now represents the given position
+        """
+        if len(cells) != len(self.cells):
+            return False
+        added = [i for i, (old, new) in enumerate(zip(self.cells, cells)) if old != new]
+        if not added:
+            return to_move == self.to_move
+        if len(added) != 1 or self.cells[added[0]] != EMPTY_CODE or cells[added[0]] != self.to_move:
+            return False
+        if to_move != 3 - self.to_move:
+            return False
+        self.play(added[0])
+        return True
+
+    def play(self, index: int) -> None:
+        """Apply a move at the root, keeping the matching subtree if it exists."""
+        child = next((child for child in self.root.children if child.move == index), None)
+        mover = self.to_move
+        self.cells[index] = mover
+        if child is None:
+            child = Node(index, None, mover)
+        child.parent = None
+        self.root = child
+
+    def _candidates(self, cells: bytearray, path: List[int], base: List[int]) -> List[int]:
+        """Empty cells next to existing marks, from the root candidates and the path."""
+        moves = set(base)
+        for index in path:
+            moves.update(self.geometry.near[index])
+        candidates = [index for index in moves if cells[index] == EMPTY_CODE]
+        return candidates or [index for index, cell in enumerate(cells) if cell == EMPTY_CODE]
+
+    def root_candidates(self) -> List[int]:
+        """Candidate moves at the root (the center on an empty board, every empty cell as a fallback)."""
+        near = self.geometry.near
+        moves = set()
+        for index, cell in enumerate(self.cells):
+            if cell != EMPTY_CODE:
+                moves.update(near[index])
+        if not moves:
+            return [self.geometry.center]
+        candidates = [index for index in moves if self.cells[index] == EMPTY_CODE]
+        return candidates or [index for index, cell in enumerate(self.cells) if cell == EMPTY_CODE]
+
+    def _playout(self, cells: bytearray, to_move: int, rng: random.Random) -> int:
+        """Play random moves to the end; return the winner's code or 0 for a draw."""
+        empties = [index for index, cell in enumerate(cells) if cell == EMPTY_CODE]
+        rng.shuffle(empties)
+        for index in empties:
+            cells[index] = to_move
+            if self.geometry.wins(cells, index):
+                return to_move
+            to_move = 3 - to_move
+        return 0
+
+    def search(self, deadline: float, rng: random.Random, max_iterations: Optional[int] = None) -> int:
+        """
+        Grow the tree until the deadline and return the number of iterations.
+
+        At least one iteration always runs.
+        """
+        base = self.root_candidates()
+        filled = sum(1 for cell in self.cells if cell != EMPTY_CODE)
+        iterations = 0
+        while True:
+            node = self.root
+            cells = bytearray(self.cells)
+            path: List[int] = []
+            depth_filled = filled
+
+            # Selection
+            while node.terminal is None and node.untried is not None and not node.untried and node.children:
+                node = node.select_child()
+                cells[node.move] = node.mover
+                path.append(node.move)
+                depth_filled += 1
+
+            # Expansion
+            if node.terminal is None:
+                if node.untried is None:
+                    node.untried = self._candidates(cells, path, base)
+                    rng.shuffle(node.untried)
+                if node.untried:
+                    index = node.untried.pop()
+                    mover = 3 - node.mover
+                    cells[index] = mover
+                    depth_filled += 1
+                    terminal = None
+                    if self.geometry.wins(cells, index):
+                        terminal = 1.0
+                    elif depth_filled == self.geometry.size:
+                        terminal = 0.5
+                    child = Node(index, node, mover, terminal)
+                    node.children.append(child)
+                    node = child
+
+            # Simulation
+            if node.terminal is not None:
+                winner = node.mover if node.terminal == 1.0 else 0
+            elif depth_filled == self.geometry.size:
+                winner = 0
+            else:
+                winner = self._playout(cells, 3 - node.mover, rng)
+
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if winner == node.mover:
+                    node.wins += 1.0
+                elif winner == 0:
+                    node.wins += 0.5
+                node = node.parent
+
+            iterations += 1
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            if time.perf_counter() >= deadline:
+                break
+        return iterations
+
+    def immediate_move(self) -> Optional[int]:
+        """Return a winning move, or a move blocking the opponent's win, if there is one."""
+        to_move = self.to_move
+        candidates = self.root_candidates()
+        for player in (to_move, 3 - to_move):
+            for index in candidates:
+                self.cells[index] = player
+                wins = self.geometry.wins(self.cells, index)
+                self.cells[index] = EMPTY_CODE
+                if wins:
+                    return index
+        return None
+
+    def best_move(self) -> Optional[int]:
+        """Return the most visited root move."""
+        if not self.root.children:
+            return None
+        return max(self.root.children, key=lambda child: child.visits).move
+
+
+# Process-wide trees: game key -> SearchTree, least recently used first
+_TREES: "OrderedDict[str, SearchTree]" = OrderedDict()
+
+
+def choose_move(
+    game_key: str,
+    rows: int,
+    cols: int,
+    win_length: int,
+    board_state: str,
+    player: str,
+    time_budget: float,
+    seed: Optional[int] = None
+) -> int:
+    """
+    Choose a move for the side to move within the time budget.
+
+    Args:
+        game_key: Identifier of the game, used to reuse its tree
+        rows: Board rows
+        cols: Board columns
+        win_length: Marks in a row needed to win
+        board_state: Current board_state string
+        player: Player to move ('X' or 'O')
+        time_budget: Wall-clock budget in seconds
+        seed: Optional random seed for reproducible searches
+
+    Returns:
+        Chosen position (1-based)
+
+    Raises:
+        ValueError: If there is no legal move
+    """
+    deadline = time.perf_counter() + time_budget
+    cells = encode(board_state)
+    to_move = PLAYER_CODES[player]
+
+    tree = _TREES.pop(game_key, None)
+    if tree is None or tree.geometry is not get_geometry(rows, cols, win_length) or not tree.advance(cells, to_move):
+        tree = SearchTree(get_geometry(rows, cols, win_length), cells, to_move)
+
+    index = tree.immediate_move()
+    if index is None:
+        tree.search(deadline, random.Random(seed))
+        index = tree.best_move()
+    if index is None:
+        raise ValueError("No moves available")
+
+    # Keep the subtree below our move for the next turn of this game
+    tree.play(index)
+    _TREES[game_key] = tree
+    while len(_TREES) > MAX_TREES:
+        _TREES.popitem(last=False)
+    return index + 1
+
+
+def forget(game_key: str) -> None:
+    """Drop the tree of a finished game."""
+    _TREES.pop(game_key, None)
@@ -1,6 +1,6 @@
 """
 CRUD operations package for TicTacToe application.
 """
-from app.crud import user_crud, game_crud, move_crud
+from app.crud import user_crud, game_crud, move_crud, review_crud
 
-__all__ = ["user_crud", "game_crud", "move_crud"]
+__all__ = ["user_crud", "game_crud", "move_crud", "review_crud"]
@@ -1,18 +1,27 @@
 """
 CRUD operations for Game model.
 """
-from sqlalchemy.orm import Session
-from typing import Optional, List
+import time
+from sqlalchemy import bindparam, delete, select, tuple_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Callable, Optional, List, Sequence, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
-from app.model.game import Game
+from datetime import datetime, timedelta, timezone
+from app.model.game import Game, encode_history
+from app.model.move import Move
+from app.model.move_review import MoveReview
 
 
 def create_game(
     db: Session,
     player_x_id: Optional[UUID] = None,
     player_o_id: Optional[UUID] = None,
-    status: str = "ongoing"
+    status: str = "ongoing",
+    bot_level: Optional[str] = None,
+    board_rows: int = 3,
+    board_cols: int = 3,
+    win_length: int = 3
 ) -> Game:
     """
     Create a new game.
@@ -22,6 +31,10 @@ def create_game(
         player_x_id: Optional UUID of player X
         player_o_id: Optional UUID of player O
         status: Initial game status
+        bot_level: Computer opponent level if Player O is the computer
+        board_rows: Number of board rows
+        board_cols: Number of board columns
+        win_length: Marks in a row needed to win
     
     Returns:
         Created Game object
@@ -31,7 +44,11 @@ def create_game(
         player_o_id=player_o_id,
         current_player="X",
         status=status,
-        board_state="---------"
+        board_state="-" * (board_rows * board_cols),
+        bot_level=bot_level,
+        board_rows=board_rows,
+        board_cols=board_cols,
+        win_length=win_length
     )
     db.add(db_game)
     db.commit()
@@ -53,6 +70,22 @@ def get_game_by_id(db: Session, game_id: UUID) -> Optional[Game]:
     return db.query(Game).filter(Game.id == game_id).first()
 
 
+def get_game_with_moves(db: Session, game_id: UUID) -> Optional[Game]:
+    """
+    Get a game by its ID with its moves loaded in the same query.
+    
+    Args:
+        db: Database session
+        game_id: Game UUID
+    
+    Returns:
+        Game object with moves in chronological order if found, None otherwise
+    """
+    return db.execute(
+        select(Game).options(joinedload(Game.moves)).where(Game.id == game_id)
+    ).unique().scalar_one_or_none()
+
+
 def get_all_games(db: Session) -> List[Game]:
     """
     Get all games.
@@ -97,6 +130,42 @@ def get_ongoing_games(db: Session) -> List[Game]:
     ).all()
 
 
+def get_games_page(
+    db: Session,
+    status: Optional[str] = None,
+    user_id: Optional[UUID] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 100
+) -> List[Game]:
+    """
+    Get one page of games in creation order, filtered in SQL.
+    
+    Pages are addressed by the (created_at, id) of the last game of the
+    previous page instead of an offset, so every page is an index range
+    scan no matter how deep into the table it is.
+    
+    Args:
+        db: Database session
+        status: Optional status filter (waiting, ongoing, won, draw)
+        user_id: Optional user UUID; only games where the user is X or O
+        after: (created_at, id) of the last game of the previous page
+        limit: Maximum number of games returned
+    
+    Returns:
+        List of Game objects ordered by (created_at, id)
+    """
+    query = select(Game)
+    if status:
+        # Rendered inline so the planner can match the partial status indexes
+        query = query.where(Game.status == bindparam("status", status, literal_execute=True))
+    if user_id:
+        query = query.where((Game.player_x_id == user_id) | (Game.player_o_id == user_id))
+    if after:
+        query = query.where(tuple_(Game.created_at, Game.id) > tuple_(*after))
+    query = query.order_by(Game.created_at, Game.id).limit(limit)
+    return list(db.execute(query).scalars())
+
+
 def update_game_board(
     db: Session,
     game_id: UUID,
@@ -111,7 +180,7 @@ def update_game_board(
     Args:
         db: Database session
         game_id: Game UUID
-        board_state: New board state (9 characters)
+        board_state: New board state (one character per cell)
         current_player: Current player (X or O)
         status: Game status (ongoing, won, draw)
         winner: Winner if game is won (X or O)
@@ -134,6 +203,81 @@ def update_game_board(
     return game
 
 
+def record_moves(
+    db: Session,
+    game: Game,
+    moves: Sequence[Tuple[UUID, str, int]],
+    board_state: str,
+    current_player: str,
+    status: str = "ongoing",
+    winner: Optional[str] = None
+) -> List[Move]:
+    """
+    Store new moves and the resulting game state in one transaction.
+    
+    The moves are inserted and the game is updated with a single commit and
+    no re-reads (the session does not expire the objects on this commit), so
+    a move is never stored without its board update. The
+    moves are numbered and appended to the game's move_history. The game
+    update only applies if its version is unchanged since the game was
+    loaded; otherwise nothing is stored.
+    
+    Args:
+        db: Database session
+        game: Game object (loaded in this session)
+        moves: (player_id, player, position) of each new move in play order
+        board_state: New board state (one character per cell)
+        current_player: Current player (X or O)
+        status: Game status (ongoing, won, draw)
+        winner: Winner if game is won (X or O)
+    
+    Returns:
+        Created Move objects
+    
+    Raises:
+        StaleDataError: If the game was changed by another transaction
+    """
+    now = datetime.now(timezone.utc)
+    cells = game.board_rows * game.board_cols
+    first_ply = len(game.history_positions) + 1
+    created = [
+        Move(
+            game_id=game.id,
+            player_id=player_id,
+            player=player,
+            position=position,
+            ply=first_ply + offset,
+            created_at=now + timedelta(microseconds=offset)
+        )
+        for offset, (player_id, player, position) in enumerate(moves)
+    ]
+    db.add_all(created)
+    if "moves" in game.__dict__:
+        game.moves.extend(created)
+    
+    game.move_history = (game.move_history or b"") + encode_history(
+        (position for _, _, position in moves), cells
+    )
+    game.board_state = board_state
+    game.current_player = current_player
+    game.status = status
+    game.winner = winner
+    game.updated_at = now
+    
+    # The caller builds its response from these objects; keeping them loaded
+    # past the commit saves re-reading the game and the new moves
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise
+    finally:
+        db.expire_on_commit = expire_on_commit
+    return created
+
+
 def delete_game(db: Session, game_id: UUID) -> bool:
     """
     Delete a game by ID. This will also delete all associated moves due to cascade.
@@ -154,18 +298,69 @@ def delete_game(db: Session, game_id: UUID) -> bool:
     return True
 
 
-def delete_completed_games(db: Session) -> int:
+def delete_games(db: Session, game_ids: Sequence[UUID]) -> int:
     """
-    Delete all completed games (won or draw).
+    Delete many games with their moves and reviews in one transaction.
+    
+    Dependent rows are deleted explicitly rather than through the database
+    cascade, so this also works where foreign keys are not enforced.
     
     Args:
         db: Database session
+        game_ids: Game UUIDs
     
     Returns:
         Number of games deleted
     """
-    count = db.query(Game).filter(
-        (Game.status == "won") | (Game.status == "draw")
-    ).delete()
+    if not game_ids:
+        return 0
+    ids = list(game_ids)
+    db.execute(delete(MoveReview).where(MoveReview.game_id.in_(ids)))
+    db.execute(delete(Move).where(Move.game_id.in_(ids)))
+    count = db.execute(delete(Game).where(Game.id.in_(ids))).rowcount
     db.commit()
     return count
+
+
+def delete_completed_games(
+    db: Session,
+    older_than: Optional[timedelta] = None,
+    batch_size: int = 1_000,
+    pause: float = 0.0,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Delete completed games (won or draw) in fixed-size batches.
+    
+    Every batch deletes its moves and reviews explicitly and commits on its
+    own (see delete_games), so locks are held only for one batch at a time
+    and the write volume is spread out instead of arriving in one burst.
+    
+    Args:
+        db: Database session
+        older_than: Only delete games last updated at least this long ago
+        batch_size: Games deleted per transaction
+        pause: Seconds to sleep between batches
+        progress: Called with the running total after every batch
+    
+    Returns:
+        Number of games deleted
+    """
+    query = select(Game.id).where(Game.status.in_(("won", "draw")))
+    if older_than is not None:
+        cutoff = (datetime.now(timezone.utc) - older_than).replace(tzinfo=None)
+        query = query.where(Game.updated_at < cutoff)
+    query = query.order_by(Game.created_at, Game.id).limit(batch_size)
+    
+    deleted = 0
+    while True:
+        game_ids = list(db.execute(query).scalars())
+        if not game_ids:
+            return deleted
+        deleted += delete_games(db, game_ids)
+        if progress is not None:
+            progress(deleted)
+        if len(game_ids) < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
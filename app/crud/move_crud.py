@@ -1,11 +1,17 @@
 """
 CRUD operations for Move model.
 """
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 from uuid import UUID
+from datetime import datetime, timedelta
 from app.model.move import Move
 
+# Moves are stamped by the clock of the app server that stored them, so the
+# created_at bound of history lookups allows for skew between servers
+CREATED_AT_SLACK = timedelta(days=1)
+
 
 def create_move(
     db: Session,
@@ -17,12 +23,15 @@ def create_move(
     """
     Create a new move in a game.
     
+    The move is numbered after the game's last stored move. The game row
+    (board and move_history) is not updated; see game_crud.record_moves.
+    
     Args:
         db: Database session
         game_id: UUID of the game
         player_id: UUID of the player making the move
         player: Player marker (X or O)
-        position: Position on the board (1-9)
+        position: Position on the board (1-based, row-major)
     
     Returns:
         Created Move object
@@ -31,7 +40,8 @@ def create_move(
         game_id=game_id,
         player_id=player_id,
         player=player,
-        position=position
+        position=position,
+        ply=select(func.coalesce(func.max(Move.ply), 0) + 1).where(Move.game_id == game_id).scalar_subquery()
     )
     db.add(db_move)
     db.commit()
@@ -53,20 +63,55 @@ def get_move_by_id(db: Session, move_id: UUID) -> Optional[Move]:
     return db.query(Move).filter(Move.id == move_id).first()
 
 
-def get_moves_by_game(db: Session, game_id: UUID) -> List[Move]:
+def get_moves_by_game(db: Session, game_id: UUID, since: Optional[datetime] = None) -> List[Move]:
     """
-    Get all moves for a specific game, ordered by creation time.
+    Get all moves for a specific game in play order.
     
     Args:
         db: Database session
         game_id: Game UUID
+        since: Optional lower bound on created_at, normally the game's
+            created_at; lets a moves table partitioned by month skip the
+            partitions older than the game
     
     Returns:
-        List of Move objects ordered chronologically
+        List of Move objects ordered by ply
     """
-    return db.query(Move).filter(
-        Move.game_id == game_id
-    ).order_by(Move.created_at).all()
+    query = db.query(Move).filter(Move.game_id == game_id)
+    if since is not None:
+        query = query.filter(Move.created_at >= since - CREATED_AT_SLACK)
+    return query.order_by(Move.ply).all()
+
+
+def get_moves_by_games(
+    db: Session,
+    game_ids: Iterable[UUID],
+    since: Optional[datetime] = None
+) -> Dict[UUID, List[Move]]:
+    """
+    Get the moves of many games with a single query, grouped by game.
+    
+    Args:
+        db: Database session
+        game_ids: Game UUIDs
+        since: Optional lower bound on created_at, normally the earliest
+            created_at of the games (see get_moves_by_game)
+    
+    Returns:
+        Dictionary mapping every given game UUID to its moves in
+        play order (empty list for games without moves)
+    """
+    moves_by_game: Dict[UUID, List[Move]] = {game_id: [] for game_id in game_ids}
+    if not moves_by_game:
+        return moves_by_game
+    
+    query = db.query(Move).filter(Move.game_id.in_(list(moves_by_game)))
+    if since is not None:
+        query = query.filter(Move.created_at >= since - CREATED_AT_SLACK)
+    moves = query.order_by(Move.ply).all()
+    for move in moves:
+        moves_by_game[move.game_id].append(move)
+    return moves_by_game
 
 
 def get_moves_by_player(
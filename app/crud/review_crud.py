@@ -0,0 +1,102 @@
+"""
+CRUD operations for MoveReview model.
+"""
+from datetime import datetime
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from app.model.game import Game
+from app.model.move_review import MoveReview
+
+
+def create_reviews(db: Session, reviews: List[Dict[str, Any]]) -> int:
+    """
+    Insert many move reviews with a single multi-row insert.
+    
+    Reviews of moves that already have one are skipped, so a game reviewed
+    by two processes at once is stored only once.
+    
+    Args:
+        db: Database session
+        reviews: Column values per review (game_id, ply, player, position, ...)
+    
+    Returns:
+        Number of reviews inserted
+    """
+    if not reviews:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(MoveReview).on_conflict_do_nothing(index_elements=["game_id", "ply"])
+    elif dialect == "sqlite":
+        statement = sqlite.insert(MoveReview).on_conflict_do_nothing(index_elements=["game_id", "ply"])
+    else:
+        db.execute(insert(MoveReview), reviews)
+        db.commit()
+        return len(reviews)
+    inserted = len(db.execute(statement.returning(MoveReview.id), reviews).all())
+    db.commit()
+    return inserted
+
+
+def get_reviews_by_game(db: Session, game_id: UUID) -> List[MoveReview]:
+    """
+    Get the move reviews of a game, in move order.
+    
+    Args:
+        db: Database session
+        game_id: Game UUID
+    
+    Returns:
+        List of MoveReview objects ordered by ply
+    """
+    return db.query(MoveReview).filter(
+        MoveReview.game_id == game_id
+    ).order_by(MoveReview.ply).all()
+
+
+def get_reviewed_game_ids(db: Session, game_ids: Iterable[UUID]) -> Set[UUID]:
+    """
+    Get which of the given games already have reviews.
+    
+    Args:
+        db: Database session
+        game_ids: Game UUIDs to check
+    
+    Returns:
+        Set of game UUIDs with stored reviews
+    """
+    return set(db.scalars(
+        select(MoveReview.game_id).where(MoveReview.game_id.in_(list(game_ids))).distinct()
+    ))
+
+
+def get_unreviewed_games(
+    db: Session,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 100
+) -> List[Tuple[datetime, UUID]]:
+    """
+    Get one page of finished 3x3 games that have no reviews yet.
+    
+    Args:
+        db: Database session
+        after: (created_at, id) of the last game of the previous page
+        limit: Maximum number of games returned
+    
+    Returns:
+        List of (created_at, id) tuples in creation order
+    """
+    query = select(Game.created_at, Game.id).where(
+        Game.status.in_(("won", "draw")),
+        Game.board_rows == 3,
+        Game.board_cols == 3,
+        Game.win_length == 3,
+        ~select(MoveReview.id).where(MoveReview.game_id == Game.id).exists()
+    )
+    if after:
+        query = query.where(tuple_(Game.created_at, Game.id) > tuple_(*after))
+    query = query.order_by(Game.created_at, Game.id).limit(limit)
+    return [tuple(row) for row in db.execute(query)]
@@ -25,7 +25,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
-def create_user(db: Session, username: str, email: str, password: str) -> Optional[User]:
+def create_user(
+    db: Session,
+    username: str,
+    email: str,
+    password: str,
+    user_id: Optional[UUID] = None
+) -> Optional[User]:
     """
     Create a new user with hashed password.
     
@@ -34,6 +40,7 @@ def create_user(db: Session, username: str, email: str, password: str) -> Option
         username: Unique username
         email: Unique email
         password: Plain text password (will be hashed)
+        user_id: Optional fixed UUID (generated if omitted)
     
     Returns:
         User object if successful, None if username/email already exists
@@ -45,6 +52,8 @@ def create_user(db: Session, username: str, email: str, password: str) -> Option
             email=email,
             hashed_password=hashed_password
         )
+        if user_id is not None:
+            db_user.id = user_id
         db.add(db_user)
         db.commit()
         db.refresh(db_user)
@@ -3,6 +3,6 @@ Database engine package for TicTacToe application.
 Provides SQLAlchemy Base, engine, and session management.
 """
 from app.engine.base import Base
-from app.engine.session import engine, SessionLocal, get_db, init_db
+from app.engine.session import engine, SessionLocal, get_db, get_read_db, init_db
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db", "init_db"]
+__all__ = ["Base", "engine", "SessionLocal", "get_db", "get_read_db", "init_db"]
@@ -0,0 +1,296 @@
+"""
+Versioned schema migrations.
+
+create_all() only creates missing tables, so columns and indexes added to
+existing tables are applied here. Every migration runs once and is recorded
+in the schema_version table; init_db() runs the pending ones at startup.
+
+Migrations are written to be safe on a live database:
+- they are idempotent (IF NOT EXISTS), so a run interrupted between a step
+  and its bookkeeping can simply be repeated
+- on PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY, which does
+  not block writes, and an advisory lock keeps several starting app workers
+  from migrating at the same time
+- existing rows are backfilled in batches of games, each in its own short
+  transaction, with set-based statements rather than a query per row
+
+Usage:
+    python -m app.engine.migrations
+"""
+from itertools import groupby
+from typing import Any, Callable, Iterator, List, Tuple
+
+from sqlalchemy import Index, LargeBinary, bindparam, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex
+
+from app.engine.base import Base
+
+# Arbitrary key of the PostgreSQL advisory lock held while migrating
+ADVISORY_LOCK_KEY = 0x7474_6D69
+
+# Games whose rows a data backfill updates per transaction
+MIGRATION_BATCH_SIZE = 1000
+
+
+def _index(name: str) -> Index:
+    """Look up an index declared on the models by name."""
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(name)
+
+
+def _create_index(conn: Connection, name: str) -> None:
+    """Create a declared index unless it exists, without blocking writes on PostgreSQL."""
+    index = _index(name)
+    if conn.dialect.name == "postgresql":
+        # A failed concurrent build leaves an invalid index behind; rebuild it
+        invalid = conn.execute(
+            text(
+                "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+            ),
+            {"name": name}
+        ).first()
+        if invalid:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        index.dialect_options["postgresql"]["concurrently"] = True
+        try:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        finally:
+            index.dialect_options["postgresql"]["concurrently"] = False
+    else:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _add_games_version(conn: Connection) -> None:
+    """Add the optimistic locking column to games."""
+    columns = {column["name"] for column in inspect(conn).get_columns("games")}
+    if "version" not in columns:
+        # Constant defaults are a metadata-only change on PostgreSQL 11+
+        conn.execute(text("ALTER TABLE games ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+
+def _add_hot_path_indexes(conn: Connection) -> None:
+    """Index the filters and sort orders of the game and move queries."""
+    for name in (
+        "ix_games_created_at_id",
+        "ix_games_status",
+        "ix_games_player_x_id",
+        "ix_games_player_o_id",
+        "ix_games_waiting_created_at_id",
+        "ix_games_ongoing_created_at_id",
+        "ix_moves_game_id_created_at",
+    ):
+        _create_index(conn, name)
+
+
+def _add_board_columns(conn: Connection) -> None:
+    """Add the bot level and board size columns to games and widen board_state."""
+    columns = {column["name"] for column in inspect(conn).get_columns("games")}
+    for name, definition in (
+        ("bot_level", "VARCHAR(10)"),
+        ("board_rows", "INTEGER NOT NULL DEFAULT 3"),
+        ("board_cols", "INTEGER NOT NULL DEFAULT 3"),
+        ("win_length", "INTEGER NOT NULL DEFAULT 3"),
+    ):
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE games ADD COLUMN {name} {definition}"))
+    if conn.dialect.name == "postgresql":
+        # VARCHAR(9) to TEXT is binary compatible, so the table is not rewritten;
+        # SQLite does not enforce VARCHAR lengths
+        conn.execute(text("ALTER TABLE games ALTER COLUMN board_state TYPE TEXT"))
+
+
+def _game_batches(conn: Connection) -> Iterator[List[Any]]:
+    """Yield the ids of all games in keyset batches of MIGRATION_BATCH_SIZE."""
+    after = None
+    while True:
+        query = "SELECT id FROM games" + (" WHERE id > :after" if after is not None else "")
+        batch = conn.execute(
+            text(query + " ORDER BY id LIMIT :limit"),
+            {"after": after, "limit": MIGRATION_BATCH_SIZE}
+        ).scalars().all()
+        if not batch:
+            return
+        yield batch
+        after = batch[-1]
+
+
+def _number_moves(conn: Connection, game_ids: List[Any]) -> None:
+    """Number the unnumbered moves of some games in creation order (id breaks timestamp ties)."""
+    conn.execute(
+        text(
+            "UPDATE moves SET ply = numbered.number FROM ("
+            "SELECT id, ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY created_at, id) AS number "
+            "FROM moves WHERE game_id IN :games"
+            ") AS numbered WHERE moves.id = numbered.id AND moves.ply IS NULL"
+        ).bindparams(bindparam("games", expanding=True)),
+        {"games": game_ids}
+    )
+
+
+def _fill_move_history(conn: Connection, game_ids: List[Any]) -> None:
+    """Build move_history from the numbered moves of some games that have none yet."""
+    from app.model.game import HISTORY_BYTE_CELLS, encode_history
+
+    if conn.dialect.name == "postgresql":
+        # One or two big-endian bytes per position, concatenated in ply order
+        conn.execute(
+            text(
+                "UPDATE games SET move_history = history.positions FROM ("
+                "SELECT moves.game_id, string_agg(decode(lpad(to_hex(moves.position), "
+                f"CASE WHEN owner.board_rows * owner.board_cols <= {HISTORY_BYTE_CELLS} THEN 2 ELSE 4 END, '0'), 'hex'), "
+                "''::bytea ORDER BY moves.ply) AS positions "
+                "FROM moves JOIN games AS owner ON owner.id = moves.game_id "
+                "WHERE moves.game_id IN :games GROUP BY moves.game_id"
+                ") AS history WHERE games.id = history.game_id AND games.move_history = ''::bytea"
+            ).bindparams(bindparam("games", expanding=True)),
+            {"games": game_ids}
+        )
+        return
+
+    rows = conn.execute(
+        text(
+            "SELECT games.id, games.board_rows * games.board_cols, moves.position "
+            "FROM games JOIN moves ON moves.game_id = games.id "
+            "WHERE games.id IN :games AND games.move_history = :empty ORDER BY games.id, moves.ply"
+        ).bindparams(bindparam("games", expanding=True), bindparam("empty", b"", type_=LargeBinary)),
+        {"games": game_ids}
+    ).all()
+    histories = [
+        {"game_id": game_id, "history": encode_history((row[2] for row in group), cells)}
+        for (game_id, cells), group in groupby(rows, key=lambda row: (row[0], row[1]))
+    ]
+    if histories:
+        conn.execute(
+            text("UPDATE games SET move_history = :history WHERE id = :game_id").bindparams(
+                bindparam("history", type_=LargeBinary)
+            ),
+            histories
+        )
+
+
+def _add_move_plies(conn: Connection) -> None:
+    """
+    Number the moves of every game and keep the positions on the game row.
+
+    Both columns are added without rewriting the tables; existing rows are
+    then filled in batches of MIGRATION_BATCH_SIZE games, each its own short
+    transaction. On PostgreSQL, ply is made NOT NULL through a NOT VALID
+    check constraint, which is validated without blocking writes, so SET NOT
+    NULL does not have to scan the table under an exclusive lock. App
+    processes of the previous release cannot store moves once the constraint
+    is added; they should be stopped before this migration finishes.
+    """
+    move_columns = {column["name"] for column in inspect(conn).get_columns("moves")}
+    if "ply" not in move_columns:
+        conn.execute(text("ALTER TABLE moves ADD COLUMN ply INTEGER"))
+    game_columns = {column["name"] for column in inspect(conn).get_columns("games")}
+    if "move_history" not in game_columns:
+        binary = LargeBinary().compile(dialect=conn.dialect)
+        empty = "''" if conn.dialect.name == "postgresql" else "X''"
+        conn.execute(text(f"ALTER TABLE games ADD COLUMN move_history {binary} NOT NULL DEFAULT {empty}"))
+
+    for game_ids in _game_batches(conn):
+        _number_moves(conn, game_ids)
+        _fill_move_history(conn, game_ids)
+
+    if conn.dialect.name == "postgresql":
+        if not conn.execute(text("SELECT 1 FROM pg_constraint WHERE conname = 'moves_ply_not_null'")).first():
+            conn.execute(text("ALTER TABLE moves ADD CONSTRAINT moves_ply_not_null CHECK (ply IS NOT NULL) NOT VALID"))
+        # Moves stored by the previous release before the constraint existed
+        unnumbered = conn.execute(text("SELECT DISTINCT game_id FROM moves WHERE ply IS NULL")).scalars().all()
+        for start in range(0, len(unnumbered), MIGRATION_BATCH_SIZE):
+            _number_moves(conn, unnumbered[start:start + MIGRATION_BATCH_SIZE])
+        conn.execute(text("ALTER TABLE moves VALIDATE CONSTRAINT moves_ply_not_null"))
+        conn.execute(text("ALTER TABLE moves ALTER COLUMN ply SET NOT NULL"))
+        conn.execute(text("ALTER TABLE moves DROP CONSTRAINT moves_ply_not_null"))
+    _create_index(conn, "ux_moves_game_id_ply")
+
+
+def _add_unique_move_reviews(conn: Connection) -> None:
+    """Remove duplicate move reviews and allow only one review per move."""
+    conn.execute(text(
+        "DELETE FROM move_reviews WHERE id IN ("
+        "SELECT id FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY game_id, ply ORDER BY id) AS copy "
+        "FROM move_reviews) AS numbered WHERE copy > 1)"
+    ))
+    _create_index(conn, "ux_move_reviews_game_id_ply")
+
+
+# (version, description, step) in the order they are applied; never reorder
+# or edit a released migration, append a new one instead
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Add games.version", _add_games_version),
+    (2, "Add indexes for game listings and move histories", _add_hot_path_indexes),
+    (3, "Add games.bot_level, board size columns and TEXT board_state", _add_board_columns),
+    (4, "Add moves.ply and games.move_history", _add_move_plies),
+    (5, "Add a unique index on move_reviews (game_id, ply)", _add_unique_move_reviews),
+]
+
+
+def applied_versions(conn: Connection) -> List[int]:
+    """Return the versions recorded in schema_version (creating the table if needed)."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(200) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+    return [row[0] for row in conn.execute(text("SELECT version FROM schema_version ORDER BY version"))]
+
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Apply all pending migrations.
+
+    Expects the tables to exist (init_db() creates them first).
+
+    Args:
+        engine: Engine of the database to migrate
+
+    Returns:
+        Versions applied by this run
+    """
+    import app.model  # noqa: F401  (declares the indexes looked up by the steps)
+    
+    applied = []
+    # Autocommit: CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        try:
+            done = set(applied_versions(conn))
+            for version, description, step in MIGRATIONS:
+                if version in done:
+                    continue
+                print(f"Applying migration {version}: {description}")
+                step(conn)
+                conn.execute(
+                    text(
+                        "INSERT INTO schema_version (version, description, applied_at) "
+                        "VALUES (:version, :description, CURRENT_TIMESTAMP)"
+                    ),
+                    {"version": version, "description": description}
+                )
+                applied.append(version)
+        finally:
+            if postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+    return applied
+
+
+def main() -> None:
+    """Apply pending migrations to the configured database."""
+    from app.engine.session import init_db
+
+    init_db()
+    print("Database schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Optional monthly range partitioning of the moves table (PostgreSQL only).
+
+`convert` turns moves into a table partitioned by created_at month, with one
+partition per month from the oldest move up to --months-ahead months from
+now and a default partition that catches anything outside those ranges.
+`maintain` is meant to run regularly (e.g. daily from cron): it creates the
+partitions of the coming months and, with --retain-months, drops the
+partitions older than that or only detaches them (--detach) so they remain
+as standalone tables that can be dumped and dropped later.
+
+PostgreSQL requires the partition key in every unique constraint, so on a
+partitioned moves table the primary key is (id, created_at) and the unique
+index on (game_id, ply) becomes (game_id, ply, created_at). Concurrent moves
+on one game are still rejected by the games.version check. games itself stays
+unpartitioned: moves and move_reviews reference games.id, and a foreign key
+can only point at a unique key that includes the partition key.
+
+Dropped partitions remove the move rows only; every game keeps its complete
+move list in games.move_history.
+
+Usage:
+    python -m app.engine.partitioning convert [--months-ahead N]
+    python -m app.engine.partitioning maintain [--months-ahead N] [--retain-months N] [--detach]
+"""
+import argparse
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARTITIONED_TABLE = "moves"
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{PARTITIONED_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def add_months(month: date, count: int) -> date:
+    """Return the first day of the month count months after (or before) month."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the moves of a month."""
+    return f"{PARTITIONED_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """First day of the month held by a partition, or None for other tables."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def create_partition_sql(month: date, parent: str = PARTITIONED_TABLE) -> str:
+    """DDL of the partition for one month."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def plan_maintenance(
+    existing: List[date],
+    today: date,
+    months_ahead: int,
+    retain_months: Optional[int] = None
+) -> Tuple[List[date], List[date]]:
+    """
+    Decide which monthly partitions to create and which have expired.
+
+    Args:
+        existing: Months that already have a partition
+        today: Current date
+        months_ahead: Create partitions up to this many months after the current one
+        retain_months: Keep the current month and this many before it (None keeps all)
+
+    Returns:
+        Tuple of (months to create, expired months), both sorted
+    """
+    current = date(today.year, today.month, 1)
+    wanted = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    create = [month for month in wanted if month not in existing]
+    expired: List[date] = []
+    if retain_months is not None:
+        cutoff = add_months(current, -retain_months)
+        expired = sorted(month for month in existing if month < cutoff)
+    return create, expired
+
+
+def _require_postgres(conn: Connection) -> None:
+    """Partitioning is a PostgreSQL feature; refuse to run elsewhere."""
+    if conn.dialect.name != "postgresql":
+        raise RuntimeError(f"Partitioning needs PostgreSQL, not {conn.dialect.name}")
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """Return whether moves is already a partitioned table."""
+    return conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": PARTITIONED_TABLE}
+    ).first() is not None
+
+
+def existing_partitions(conn: Connection) -> List[date]:
+    """Return the months that have a partition attached to moves."""
+    names = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARTITIONED_TABLE}
+    ).scalars()
+    return sorted(month for month in map(partition_month, names) if month is not None)
+
+
+def convert(conn: Connection, months_ahead: int = 3, today: Optional[date] = None) -> List[date]:
+    """
+    Rebuild moves as a partitioned table, copying every existing move.
+
+    Runs in the caller's transaction and holds an exclusive lock on moves
+    until it commits, so writes to moves wait for the copy.
+
+    Args:
+        conn: Connection inside a transaction
+        months_ahead: Partitions to create after the current month
+        today: Current date (defaults to today in UTC)
+
+    Returns:
+        Months for which a partition was created (empty if already partitioned)
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL
+    """
+    _require_postgres(conn)
+    if is_partitioned(conn):
+        return []
+    today = today or datetime.now(timezone.utc).date()
+
+    conn.execute(text(f"LOCK TABLE {PARTITIONED_TABLE} IN ACCESS EXCLUSIVE MODE"))
+    oldest = conn.execute(text(f"SELECT MIN(created_at) FROM {PARTITIONED_TABLE}")).scalar()
+    first = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = add_months(date(today.year, today.month, 1), months_ahead)
+    months = []
+    month = first
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+
+    staging = f"{PARTITIONED_TABLE}_partitioned"
+    conn.execute(text(
+        f"CREATE TABLE {staging} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+    ))
+    for month in months:
+        conn.execute(text(create_partition_sql(month, parent=staging)))
+    conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {staging} DEFAULT"))
+    conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {PARTITIONED_TABLE}"))
+
+    # Swap the tables, then recreate keys and indexes under their usual names
+    conn.execute(text(f"DROP TABLE {PARTITIONED_TABLE}"))
+    conn.execute(text(f"ALTER TABLE {staging} RENAME TO {PARTITIONED_TABLE}"))
+    for statement in (
+        "ALTER TABLE moves ADD CONSTRAINT moves_pkey PRIMARY KEY (id, created_at)",
+        "ALTER TABLE moves ADD CONSTRAINT moves_game_id_fkey FOREIGN KEY (game_id) REFERENCES games (id) ON DELETE CASCADE",
+        "ALTER TABLE moves ADD CONSTRAINT moves_player_id_fkey FOREIGN KEY (player_id) REFERENCES users (id)",
+        "CREATE INDEX ix_moves_game_id_created_at ON moves (game_id, created_at)",
+        "CREATE UNIQUE INDEX ux_moves_game_id_ply ON moves (game_id, ply, created_at)",
+    ):
+        conn.execute(text(statement))
+    return months
+
+
+def maintain(
+    conn: Connection,
+    months_ahead: int = 3,
+    retain_months: Optional[int] = None,
+    detach: bool = False,
+    today: Optional[date] = None
+) -> Tuple[List[date], List[date]]:
+    """
+    Create upcoming partitions and remove expired ones.
+
+    Args:
+        conn: Connection inside a transaction
+        months_ahead: Create partitions up to this many months after the current one
+        retain_months: Keep the current month and this many before it (None keeps all)
+        detach: Detach expired partitions as standalone tables instead of dropping them
+        today: Current date (defaults to today in UTC)
+
+    Returns:
+        Tuple of (months created, months dropped or detached)
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL or moves is not partitioned
+    """
+    _require_postgres(conn)
+    if not is_partitioned(conn):
+        raise RuntimeError("moves is not partitioned yet; run the convert command first")
+
+    create, expired = plan_maintenance(
+        existing_partitions(conn),
+        today or datetime.now(timezone.utc).date(),
+        months_ahead,
+        retain_months
+    )
+    for month in create:
+        conn.execute(text(create_partition_sql(month)))
+    for month in expired:
+        if detach:
+            conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {partition_name(month)}"))
+        else:
+            conn.execute(text(f"DROP TABLE {partition_name(month)}"))
+
+    stray = conn.execute(text(f"SELECT COUNT(*) FROM {DEFAULT_PARTITION}")).scalar()
+    if stray:
+        print(f"Warning: {stray} move(s) in {DEFAULT_PARTITION} fall outside every monthly partition")
+    return create, expired
+
+
+def main() -> None:
+    """Parse arguments and convert or maintain the partitions of the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert_parser = commands.add_parser("convert", help="Partition the moves table by month")
+    convert_parser.add_argument("--months-ahead", type=int, default=3, help="Future months to create partitions for")
+    maintain_parser = commands.add_parser("maintain", help="Create upcoming and remove expired partitions")
+    maintain_parser.add_argument("--months-ahead", type=int, default=3, help="Future months to create partitions for")
+    maintain_parser.add_argument("--retain-months", type=int, help="Keep this many months before the current one")
+    maintain_parser.add_argument("--detach", action="store_true", help="Detach expired partitions instead of dropping them")
+    args = parser.parse_args()
+
+    from app.engine.session import engine
+
+    with engine.begin() as conn:
+        if args.command == "convert":
+            months = convert(conn, args.months_ahead)
+            if months:
+                print(f"Partitioned moves into {len(months)} monthly partition(s) from {months[0]:%Y-%m} to {months[-1]:%Y-%m}")
+            else:
+                print("moves is already partitioned")
+        else:
+            created, expired = maintain(conn, args.months_ahead, args.retain_months, args.detach)
+            print(f"Created {len(created)} partition(s): {', '.join(map(partition_name, created)) or '-'}")
+            action = "Detached" if args.detach else "Dropped"
+            print(f"{action} {len(expired)} partition(s): {', '.join(map(partition_name, expired)) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
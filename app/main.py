@@ -8,7 +8,10 @@ from fastapi.responses import RedirectResponse
 from contextlib import asynccontextmanager
 import textwrap
 
-from app.engine import init_db
+from app.engine import init_db, engine, SessionLocal
+from app.services.bot_pool import bot_pool
+from app.services.move_service import move_service
+from app.services.review_service import review_service
 from app.api import auth, games
 from app.config import env_str, env_int, env_bool, env_list
 
@@ -24,11 +27,23 @@ async def lifespan(app: FastAPI):
     print("Initializing database...")
     init_db()
     print("Database initialized successfully!")
+    # Also sweeps for finished games whose review was dropped or lost at shutdown
+    review_service.start(engine)
+    # Computer replies that were being searched when the server stopped
+    db = SessionLocal()
+    try:
+        resumed = move_service.resume_pending_bot_moves(db)
+    finally:
+        db.close()
+    if resumed:
+        print(f"Resumed the computer's move in {resumed} game(s)")
     
     yield
     
     # Shutdown
     print("Shutting down TicTacToe API...")
+    bot_pool.shutdown()
+    review_service.shutdown()
 
 
 # Create FastAPI application
@@ -4,5 +4,6 @@ Models package for TicTacToe application.
 from .game import Game
 from .user import User
 from .move import Move
+from .move_review import MoveReview
 
-__all__ = ["Game", "User", "Move"]
+__all__ = ["Game", "User", "Move", "MoveReview"]
@@ -1,10 +1,26 @@
-from typing import final, Optional
+from typing import final, Optional, Iterable, List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, Text, Integer, LargeBinary, DateTime, ForeignKey, Index, text
 from datetime import datetime, timezone
 from app.engine import Base
+from app.model.ids import uuid7
 from uuid import UUID
-import uuid
+
+# Boards up to this many cells store one byte per move in move_history, larger ones two
+HISTORY_BYTE_CELLS = 255
+
+
+def encode_history(positions: Iterable[int], cells: int) -> bytes:
+    """Pack 1-based move positions into the compact move_history form."""
+    width = 1 if cells <= HISTORY_BYTE_CELLS else 2
+    return b"".join(position.to_bytes(width, "big") for position in positions)
+
+
+def decode_history(history: bytes, cells: int) -> List[int]:
+    """Unpack move_history into 1-based move positions in play order."""
+    width = 1 if cells <= HISTORY_BYTE_CELLS else 2
+    return [int.from_bytes(history[start:start + width], "big") for start in range(0, len(history), width)]
+
 
 @final
 class Game(Base):
@@ -13,19 +29,57 @@ class Game(Base):
     """
     __tablename__ = "games"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     player_x_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
     player_o_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id"), nullable=True)
     current_player: Mapped[str] = mapped_column(String(1), default="X", nullable=False)
     status: Mapped[str] = mapped_column(String(20), default="ongoing", nullable=False)  # waiting, ongoing, won, draw
     winner: Mapped[Optional[str]] = mapped_column(String(1), nullable=True)  # X, O, or None
-    board_state: Mapped[str] = mapped_column(String(9), default="---------", nullable=False)
+    board_state: Mapped[str] = mapped_column(Text, default="---------", nullable=False)  # one character per cell, row-major
+    board_rows: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    board_cols: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    win_length: Mapped[int] = mapped_column(Integer, default=3, nullable=False)  # marks in a row needed to win
+    bot_level: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # easy, medium, hard when Player O is the computer
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # bumped on every update
+    move_history: Mapped[bytes] = mapped_column(LargeBinary, default=b"", nullable=False)  # positions in play order, see encode_history
+    
+    # Every UPDATE is a compare-and-swap on version; a stale game raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+    
+    # Keyset pagination walks games in (created_at, id) order; the partial
+    # indexes serve the lobby and active-game listings. Existing databases
+    # get these through app.engine.migrations.
+    __table_args__ = (
+        Index("ix_games_created_at_id", "created_at", "id"),
+        Index("ix_games_status", "status"),
+        Index("ix_games_player_x_id", "player_x_id"),
+        Index("ix_games_player_o_id", "player_o_id"),
+        Index(
+            "ix_games_waiting_created_at_id", "created_at", "id",
+            postgresql_where=text("status = 'waiting'"),
+            sqlite_where=text("status = 'waiting'")
+        ),
+        Index(
+            "ix_games_ongoing_created_at_id", "created_at", "id",
+            postgresql_where=text("status = 'ongoing'"),
+            sqlite_where=text("status = 'ongoing'")
+        ),
+    )
     
     # Relationships
     player_x = relationship("User", foreign_keys=[player_x_id], back_populates="games_as_x")
     player_o = relationship("User", foreign_keys=[player_o_id], back_populates="games_as_o")
-    moves = relationship("Move", back_populates="game", cascade="all, delete-orphan")
-    
-    
\ No newline at end of file
+    moves = relationship("Move", back_populates="game", cascade="all, delete-orphan", order_by="Move.ply")
+    reviews = relationship("MoveReview", back_populates="game", cascade="all, delete-orphan", order_by="MoveReview.ply")
+
+    @property
+    def history_positions(self) -> List[int]:
+        """Positions (1-based) of all moves in play order; X moves first."""
+        return decode_history(self.move_history or b"", self.board_rows * self.board_cols)
+
+    @property
+    def is_standard_board(self) -> bool:
+        """True for the classic 3x3 board with three in a row."""
+        return (self.board_rows, self.board_cols, self.win_length) == (3, 3, 3)
@@ -0,0 +1,48 @@
+"""
+Time-ordered primary keys.
+
+uuid7() builds RFC 9562 version 7 UUIDs: a 48-bit Unix timestamp in
+milliseconds followed by random bits. New keys therefore sort after older
+ones, so inserts append to the right edge of a primary-key B-tree instead of
+landing on random pages as uuid4 keys do.
+"""
+import os
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    """
+    Generate a version 7 UUID.
+
+    Within one millisecond the 12-bit rand_a field is used as a counter
+    (RFC 9562 section 6.2, method 1) started at a random value, so keys made
+    by this process are strictly increasing. If the counter runs out, the
+    timestamp is advanced by one millisecond.
+    """
+    global _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Start low enough that a burst within the millisecond rarely overflows
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        unix_ms, rand_a = _last_ms, _counter
+
+    value = (unix_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= rand_a << 64
+    value |= 0b10 << 62
+    value |= rand_b
+    return UUID(int=value)
@@ -1,10 +1,10 @@
 from typing import final
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Integer, ForeignKey
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Index
 from datetime import datetime, timezone
 from app.engine import Base
+from app.model.ids import uuid7
 from uuid import UUID
-import uuid
 
 @final
 class Move(Base):
@@ -13,13 +13,20 @@ class Move(Base):
     """
     __tablename__ = "moves"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     game_id: Mapped[UUID] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), nullable=False)
     player_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     player: Mapped[str] = mapped_column(String(1), nullable=False)  # X or O
-    position: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-9
+    position: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-9 on 3x3, up to rows * cols
+    ply: Mapped[int] = mapped_column(Integer, nullable=False)  # 1 for the first move of the game
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     
+    # Move histories are read per game in play order
+    __table_args__ = (
+        Index("ix_moves_game_id_created_at", "game_id", "created_at"),
+        Index("ux_moves_game_id_ply", "game_id", "ply", unique=True),
+    )
+    
     # Relationships
     game = relationship("Game", back_populates="moves")
     player_user = relationship("User", back_populates="moves")
@@ -0,0 +1,34 @@
+from typing import final
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Float, Boolean, DateTime, ForeignKey, Index
+from datetime import datetime, timezone
+from app.engine import Base
+from app.model.ids import uuid7
+from uuid import UUID
+
+@final
+class MoveReview(Base):
+    """
+    Represents the post-game review of a single move, comparing it with perfect play.
+    """
+    __tablename__ = "move_reviews"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
+    game_id: Mapped[UUID] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
+    ply: Mapped[int] = mapped_column(Integer, nullable=False)  # 1 for the first move of the game
+    player: Mapped[str] = mapped_column(String(1), nullable=False)  # X or O
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    played_result: Mapped[str] = mapped_column(String(4), nullable=False)  # win, draw, loss for the mover after this move
+    best_result: Mapped[str] = mapped_column(String(4), nullable=False)  # best result the mover could have kept
+    best_position: Mapped[int] = mapped_column(Integer, nullable=False)
+    accuracy: Mapped[float] = mapped_column(Float, nullable=False)  # 1.0 = perfect, 0.0 = worst legal move
+    is_blunder: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # gave away a better result
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        # One review per move, even if several processes review a game at once
+        Index("ux_move_reviews_game_id_ply", "game_id", "ply", unique=True),
+    )
+
+    # Relationships
+    game = relationship("Game", back_populates="reviews")
@@ -15,13 +15,15 @@ from app.schema.gameDto import (
     GameResponse,
     GameWithMoves,
     GameUpdate,
-    BoardDisplay
+    BoardDisplay,
+    GameReview
 )
 from app.schema.moveDto import (
     MoveBase,
     MoveCreate,
     MoveResponse,
-    MoveRequest
+    MoveRequest,
+    MoveReviewResponse
 )
 
 __all__ = [
@@ -39,9 +41,11 @@ __all__ = [
     "GameWithMoves",
     "GameUpdate",
     "BoardDisplay",
+    "GameReview",
     # Move schemas
     "MoveBase",
     "MoveCreate",
     "MoveResponse",
-    "MoveRequest"
+    "MoveRequest",
+    "MoveReviewResponse"
 ]
@@ -21,7 +21,11 @@ class GameResponse(BaseModel):
     current_player: str = Field(..., description="Current player (X or O)")
     status: str = Field(..., description="Game status: waiting, ongoing, won, draw")
     winner: Optional[str] = Field(None, description="Winner (X or O) if game is won")
-    board_state: str = Field(..., description="Board state as 9-character string")
+    board_state: str = Field(..., description="Board state, one character per cell in row-major order (9 for 3x3)")
+    board_rows: int = Field(3, description="Number of board rows")
+    board_cols: int = Field(3, description="Number of board columns")
+    win_length: int = Field(3, description="Marks in a row needed to win")
+    bot_level: Optional[str] = Field(None, description="Computer opponent level (easy, medium, hard) if Player O is the computer")
     created_at: datetime
     updated_at: datetime
     
@@ -35,7 +39,7 @@ class GameWithMoves(GameResponse):
 
 class GameUpdate(BaseModel):
     """Schema for updating a game."""
-    board_state: Optional[str] = Field(None, min_length=9, max_length=9)
+    board_state: Optional[str] = Field(None, min_length=9, max_length=361)
     current_player: Optional[str] = Field(None, pattern="^[XO]$")
     status: Optional[str] = Field(None, pattern="^(waiting|ongoing|won|draw)$")
     winner: Optional[str] = Field(None, pattern="^[XO]$")
@@ -43,19 +47,54 @@ class GameUpdate(BaseModel):
 
 class BoardDisplay(BaseModel):
     """Schema for displaying the board in a readable format."""
-    board: List[List[str]] = Field(..., description="3x3 board representation")
+    board: List[List[str]] = Field(..., description="Board as rows of cells (3x3 by default)")
     
     @classmethod
-    def from_board_state(cls, board_state: str) -> "BoardDisplay":
-        """Convert board_state string to 3x3 array."""
+    def from_board_state(cls, board_state: str, cols: int = 3) -> "BoardDisplay":
+        """Convert board_state string to a rows x cols array."""
         board = [
-            [board_state[0], board_state[1], board_state[2]],
-            [board_state[3], board_state[4], board_state[5]],
-            [board_state[6], board_state[7], board_state[8]]
+            list(board_state[start:start + cols])
+            for start in range(0, len(board_state), cols)
         ]
         return cls(board=board)
 
 
+class MoveAnalysis(BaseModel):
+    """Schema for the perfect-play value of one legal move."""
+    position: int = Field(..., ge=1, le=9, description="Board position (1-9)")
+    result: str = Field(..., description="Result for the player to move with perfect play: win, draw, loss")
+    plies_to_result: int = Field(..., description="Moves until the game ends, including this one")
+
+
+class PositionAnalysis(BaseModel):
+    """Schema for the analysis of a game's current position."""
+    game_id: UUID
+    board_state: str
+    status: str = Field(..., description="Game status: waiting, ongoing, won, draw")
+    player: Optional[str] = Field(None, description="Player to move (X or O), None if the game is over")
+    best_move: Optional[int] = Field(None, description="Best position for the player to move")
+    moves: List[MoveAnalysis] = Field(default_factory=list, description="Value of every legal move")
+
+
+class GameReview(BaseModel):
+    """Schema for the post-game review of a finished game."""
+    game_id: UUID
+    status: str = Field(..., description="Review status: pending until the background review has run, then complete")
+    accuracy_x: Optional[float] = Field(None, description="Average accuracy of Player X")
+    accuracy_o: Optional[float] = Field(None, description="Average accuracy of Player O")
+    moves: List["MoveReviewResponse"] = Field(default_factory=list, description="Review of every move in order")
+
+
+class PurgeStatus(BaseModel):
+    """Schema for the progress of the background purge of completed games."""
+    running: bool = Field(..., description="Whether a purge is in progress")
+    deleted: int = Field(..., description="Games deleted so far by the current or last purge")
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = Field(None, description="Error that stopped the last purge")
+
+
 # Import MoveResponse for forward reference
-from app.schema.moveDto import MoveResponse
+from app.schema.moveDto import MoveResponse, MoveReviewResponse
 GameWithMoves.model_rebuild()
+GameReview.model_rebuild()
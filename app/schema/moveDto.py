@@ -9,7 +9,7 @@ from typing import Optional
 
 class MoveBase(BaseModel):
     """Base Move schema."""
-    position: int = Field(..., ge=1, le=9, description="Position on the board (1-9)")
+    position: int = Field(..., ge=1, le=361, description="Position on the board (1-9 on 3x3, up to rows * cols)")
 
 
 class MoveCreate(MoveBase):
@@ -19,11 +19,26 @@ class MoveCreate(MoveBase):
 
 class MoveResponse(MoveBase):
     """Schema for move response."""
-    id: UUID
+    id: Optional[UUID] = Field(None, description="Move id; not set when the history is read from the game row")
     game_id: UUID
     player_id: UUID
     player: str = Field(..., description="Player who made the move (X or O)")
-    created_at: datetime
+    ply: int = Field(..., description="Move number, starting at 1")
+    created_at: Optional[datetime] = Field(None, description="Time of the move; not set when the history is read from the game row")
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MoveReviewResponse(BaseModel):
+    """Schema for the post-game review of one move."""
+    ply: int = Field(..., description="Move number, starting at 1")
+    player: str = Field(..., description="Player who made the move (X or O)")
+    position: int
+    played_result: str = Field(..., description="Result the move keeps for the mover with perfect play: win, draw, loss")
+    best_result: str = Field(..., description="Best result the mover could have kept")
+    best_position: int = Field(..., description="A best position for this move")
+    accuracy: float = Field(..., description="1.0 for a best move, 0.0 for the worst legal move")
+    is_blunder: bool = Field(..., description="True if the move gave away a better result")
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,4 @@
+"""
+Command-line scripts for maintenance, analytics and load testing.
+Run them as modules, e.g. `python -m app.scripts.rederive_game_status`.
+"""
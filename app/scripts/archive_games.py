@@ -0,0 +1,44 @@
+"""
+Move finished games into the cold-storage archive.
+
+Won and drawn games whose last update is older than --days are written to
+a new compressed segment in ARCHIVE_DIR (or --directory) and deleted from
+the database, one segment per batch. GET /games/{id} keeps serving them
+from the archive.
+
+Usage:
+    python -m app.scripts.archive_games [--days N] [--batch-size N] [--directory DIR]
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.config import env_str
+from app.services.archive import GameArchive, archive_games
+
+
+def main() -> None:
+    """Parse arguments and archive old finished games from the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30, help="Archive games finished more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Games per segment")
+    parser.add_argument("--directory", default=env_str("ARCHIVE_DIR", ""), help="Archive directory (default ARCHIVE_DIR)")
+    args = parser.parse_args()
+    if not args.directory:
+        parser.error("set ARCHIVE_DIR or pass --directory")
+
+    from app.engine import SessionLocal
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        count = archive_games(db, GameArchive(args.directory), timedelta(days=args.days), args.batch_size)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Archived {count} game(s) to {args.directory} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compare insert throughput and primary-key index size of uuid4 and uuid7 keys.
+
+For each key version a scratch table shaped like moves (id, game_id, ply,
+position, created_at) is filled with --rows rows in batches of --batch-size,
+committing every batch, and then the size of its primary-key index and of the
+table is measured (pg_relation_size on PostgreSQL, dbstat on SQLite). The
+scratch tables are dropped afterwards unless --keep is given.
+
+Usage:
+    python -m app.scripts.bench_uuid_keys [--rows N] [--batch-size N] [--keep]
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Uuid, insert, text
+from sqlalchemy.engine import Engine
+
+from app.model.ids import uuid7
+
+GENERATORS: Dict[str, Callable[[], UUID]] = {"uuid4": uuid4, "uuid7": uuid7}
+
+
+def _table(metadata: MetaData, version: str) -> Table:
+    """Scratch table with the column layout of moves."""
+    return Table(
+        f"bench_keys_{version}",
+        metadata,
+        Column("id", Uuid, primary_key=True),
+        Column("game_id", Uuid, nullable=False),
+        Column("ply", Integer, nullable=False),
+        Column("position", Integer, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+
+
+def _sizes(engine: Engine, table: Table) -> Dict[str, Optional[int]]:
+    """Bytes used by the table and by its primary-key index."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            index = conn.execute(text(
+                "SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = CAST(:table AS regclass) AND indisprimary"
+            ), {"table": table.name}).scalar_one()
+            return {
+                "table_bytes": conn.execute(text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": table.name}).scalar_one(),
+                "index_bytes": conn.execute(text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": index}).scalar_one(),
+            }
+        if engine.dialect.name == "sqlite":
+            # Non-integer primary keys get an automatic index named sqlite_autoindex_<table>_1
+            sizes = dict(conn.execute(text(
+                "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN (:table, :index) GROUP BY name"
+            ), {"table": table.name, "index": f"sqlite_autoindex_{table.name}_1"}).all())
+            return {
+                "table_bytes": sizes.get(table.name),
+                "index_bytes": sizes.get(f"sqlite_autoindex_{table.name}_1"),
+            }
+    return {"table_bytes": None, "index_bytes": None}
+
+
+def benchmark(engine: Engine, version: str, rows: int, batch_size: int, keep: bool = False) -> Dict[str, Optional[float]]:
+    """
+    Insert rows keyed by one UUID version and measure throughput and size.
+
+    Args:
+        engine: Database to benchmark on
+        version: 'uuid4' or 'uuid7'
+        rows: Total number of rows inserted
+        batch_size: Rows per multi-row INSERT and transaction
+        keep: Leave the scratch table in place
+
+    Returns:
+        Dictionary with rows, seconds, rows_per_second, table_bytes and index_bytes
+    """
+    generate = GENERATORS[version]
+    metadata = MetaData()
+    table = _table(metadata, version)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    now = datetime.now(timezone.utc)
+    game_id = uuid7()
+    elapsed = 0.0
+    try:
+        for start in range(0, rows, batch_size):
+            batch = [
+                {"id": generate(), "game_id": game_id, "ply": index % 9 + 1, "position": index % 9 + 1, "created_at": now}
+                for index in range(start, min(start + batch_size, rows))
+            ]
+            began = time.perf_counter()
+            with engine.begin() as conn:
+                conn.execute(insert(table), batch)
+            elapsed += time.perf_counter() - began
+        result: Dict[str, Optional[float]] = {
+            "rows": rows,
+            "seconds": elapsed,
+            "rows_per_second": rows / elapsed if elapsed else None,
+        }
+        result.update(_sizes(engine, table))
+        return result
+    finally:
+        if not keep:
+            metadata.drop_all(engine)
+
+
+def main() -> None:
+    """Parse arguments and benchmark both key versions on the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows inserted per key version")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per transaction")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables")
+    args = parser.parse_args()
+
+    from app.engine import engine
+
+    for version in GENERATORS:
+        result = benchmark(engine, version, args.rows, args.batch_size, args.keep)
+        index_mb = f"{result['index_bytes'] / 1_048_576:.1f} MB" if result["index_bytes"] is not None else "n/a"
+        table_mb = f"{result['table_bytes'] / 1_048_576:.1f} MB" if result["table_bytes"] is not None else "n/a"
+        print(
+            f"{version}: {args.rows} rows in {result['seconds']:.1f}s "
+            f"({result['rows_per_second'] or 0:,.0f} rows/s), primary key index {index_mb}, table {table_mb}"
+        )
+
+
+if __name__ == "__main__":
+    main()
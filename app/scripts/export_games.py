@@ -0,0 +1,44 @@
+"""
+Export all games with their moves as NDJSON or CSV.
+
+Reads the games table through a server-side cursor in fixed-size chunks and
+writes each chunk as it arrives, so memory stays constant regardless of
+table size. The output format matches GET /games/export.
+
+Usage:
+    python -m app.scripts.export_games [--format ndjson|csv] [--chunk-size N] [--output FILE]
+"""
+import argparse
+import sys
+import time
+
+from app.services import export
+
+
+def main() -> None:
+    """Parse arguments and stream the export of the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(export.FORMATS), default="ndjson", help="Output format")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Games fetched per database round trip")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    from app.engine import SessionLocal
+
+    db = SessionLocal()
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        for chunk in export.render_chunks(db, args.format, args.chunk_size):
+            output.write(chunk)
+    finally:
+        db.close()
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Export finished in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
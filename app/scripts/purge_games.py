@@ -0,0 +1,47 @@
+"""
+Delete completed (won or draw) games in batches.
+
+Each batch of --batch-size games is deleted with its moves and reviews in
+its own transaction, with a --pause-ms sleep in between, so locks stay
+short and the write load is spread out. Progress is printed per batch.
+
+Usage:
+    python -m app.scripts.purge_games [--days N] [--batch-size N] [--pause-ms N]
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.crud import game_crud
+from app.services.purge_service import PURGE_BATCH_SIZE, PURGE_PAUSE_MS
+
+
+def main() -> None:
+    """Parse arguments and purge completed games from the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, help="Only delete games finished more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="Games per transaction")
+    parser.add_argument("--pause-ms", type=int, default=PURGE_PAUSE_MS, help="Sleep between batches")
+    args = parser.parse_args()
+
+    from app.engine import SessionLocal
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        count = game_crud.delete_completed_games(
+            db,
+            older_than=timedelta(days=args.days) if args.days is not None else None,
+            batch_size=args.batch_size,
+            pause=args.pause_ms / 1000,
+            progress=lambda deleted: print(f"Deleted {deleted} game(s) so far")
+        )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Purged {count} completed game(s) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Re-derive the status/winner columns of 3x3 games from their board_state.
+
+Streams the games table in chunks, evaluates each chunk with the
+vectorized batch evaluator and writes back only the rows that changed.
+Waiting games are left alone, since their status does not follow from
+the board.
+
+Usage:
+    python -m app.scripts.rederive_game_status [--chunk-size N] [--dry-run]
+"""
+import argparse
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.model.game import Game
+from app.services import batch_eval
+
+
+def _write_rows(write_db: Session, updates: List[Dict[str, Any]]) -> int:
+    """
+    Write one row at a time as a compare-and-swap on its version.
+
+    Used for a chunk whose bulk update hit a game changed by a live move
+    since it was read; such games are skipped, the rest are written.
+
+    Returns:
+        Number of rows written
+    """
+    written = 0
+    for row in updates:
+        result = write_db.execute(
+            update(Game)
+            .where(Game.id == row["id"], Game.version == row["version"])
+            .values(status=row["status"], winner=row["winner"], version=Game.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        written += result.rowcount
+    write_db.commit()
+    return written
+
+
+def rederive_statuses(
+    read_db: Session,
+    write_db: Session,
+    chunk_size: int = 50_000,
+    dry_run: bool = False
+) -> Tuple[int, int, int]:
+    """
+    Recompute status and winner for every finished or ongoing 3x3 game.
+
+    Args:
+        read_db: Session used to stream the games table
+        write_db: Session used to write corrected rows (one commit per chunk)
+        chunk_size: Number of games evaluated per batch
+        dry_run: Count changes without writing them
+
+    Returns:
+        Tuple of (games scanned, games changed, games skipped because a
+        move changed them after they were read)
+    """
+    query = (
+        select(Game.id, Game.board_state, Game.status, Game.winner, Game.version)
+        .where(
+            Game.board_rows == 3,
+            Game.board_cols == 3,
+            Game.win_length == 3,
+            Game.status != "waiting"
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+
+    scanned = 0
+    changed = 0
+    skipped = 0
+    for rows in read_db.execute(query).partitions():
+        status_codes, winner_codes = batch_eval.evaluate_board_states([row.board_state for row in rows])
+        updates = []
+        for row, status_code, winner_code in zip(rows, status_codes, winner_codes):
+            status = batch_eval.STATUS_NAMES[status_code]
+            winner = batch_eval.WINNER_NAMES[winner_code]
+            if status != row.status or winner != row.winner:
+                # The version makes the write a compare-and-swap against concurrent moves
+                updates.append({"id": row.id, "version": row.version, "status": status, "winner": winner})
+
+        scanned += len(rows)
+        if not updates or dry_run:
+            changed += len(updates)
+            continue
+        try:
+            write_db.execute(update(Game), updates)
+            write_db.commit()
+            changed += len(updates)
+        except StaleDataError:
+            write_db.rollback()
+            written = _write_rows(write_db, updates)
+            changed += written
+            skipped += len(updates) - written
+
+    return scanned, changed, skipped
+
+
+def main() -> None:
+    """Parse arguments and re-derive statuses against the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Games evaluated per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would change")
+    args = parser.parse_args()
+
+    from app.engine import SessionLocal
+
+    read_db = SessionLocal()
+    write_db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        scanned, changed, skipped = rederive_statuses(read_db, write_db, args.chunk_size, args.dry_run)
+    finally:
+        read_db.close()
+        write_db.close()
+
+    elapsed = time.perf_counter() - started
+    action = "would change" if args.dry_run else "changed"
+    print(f"Scanned {scanned} game(s), {action} {changed}, skipped {skipped} changed by live moves in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
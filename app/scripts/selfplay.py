@@ -0,0 +1,252 @@
+"""
+Parallel self-play simulator.
+
+Plays N 3x3 games between configurable policies with the same bitboard
+rules MoveService uses, spread across a process pool. Finished games are
+streamed as compact NDJSON records, one per line:
+
+    {"moves": "5137", "status": "won", "winner": "X"}
+
+where `moves` lists the positions (1-9) in play order. With --load the
+games and their moves are also bulk-inserted into the games/moves tables,
+e.g. to load-test the list and history endpoints.
+
+Usage:
+    python -m app.scripts.selfplay --games 100000 --workers 8 \
+        --x-policy mixed --o-policy solver --output games.ndjson [--load]
+"""
+import argparse
+import json
+import os
+import random
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.services import bitboard, solver
+
+# Probability that the mixed policy plays a random move instead of the solver's
+MIXED_RANDOM_RATE = 0.25
+
+Policy = Callable[[bitboard.BoardState, str, random.Random], int]
+
+
+def random_policy(board: bitboard.BoardState, player: str, rng: random.Random) -> int:
+    """Play a uniformly random legal move."""
+    empty = bitboard.empty_mask(board.x_bits, board.o_bits)
+    return rng.choice([index for index in range(bitboard.CELL_COUNT) if empty >> index & 1])
+
+
+def solver_policy(board: bitboard.BoardState, player: str, rng: random.Random) -> int:
+    """Play a perfect move, choosing randomly among equally good ones."""
+    scores = solver.score_moves(board.x_bits, board.o_bits, player)
+    best = max(score for _, score in scores)
+    return rng.choice([index for index, score in scores if score == best])
+
+
+def mixed_policy(board: bitboard.BoardState, player: str, rng: random.Random) -> int:
+    """Play like the solver, but make a random move MIXED_RANDOM_RATE of the time."""
+    if rng.random() < MIXED_RANDOM_RATE:
+        return random_policy(board, player, rng)
+    return solver_policy(board, player, rng)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "solver": solver_policy,
+    "mixed": mixed_policy,
+}
+
+
+def play_game(x_policy: Policy, o_policy: Policy, rng: random.Random) -> Dict[str, Optional[str]]:
+    """
+    Play one game to the end.
+
+    Returns:
+        Compact record with the move string, final status and winner
+    """
+    board = bitboard.BoardState(0, 0, 0)
+    player = 'X'
+    status, winner = 'ongoing', None
+    moves = []
+    while status == 'ongoing':
+        policy = x_policy if player == 'X' else o_policy
+        index = policy(board, player, rng)
+        board, status, winner = bitboard.apply_move(board, index, player)
+        moves.append(str(index + 1))
+        player = 'O' if player == 'X' else 'X'
+    return {"moves": ''.join(moves), "status": status, "winner": winner}
+
+
+def play_batch(
+    count: int,
+    x_policy: str,
+    o_policy: str,
+    seed: Optional[int]
+) -> Tuple[int, float, List[Dict[str, Optional[str]]]]:
+    """
+    Play a batch of games in a worker process.
+
+    Returns:
+        Tuple of (worker pid, seconds spent, records)
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    records = [play_game(POLICIES[x_policy], POLICIES[o_policy], rng) for _ in range(count)]
+    return os.getpid(), time.perf_counter() - started, records
+
+
+def _get_or_create_player(db: Session, username: str):
+    """Get or create a simulation account with an unusable random password."""
+    from app.crud import user_crud
+
+    user = user_crud.get_user_by_username(db, username)
+    if user:
+        return user
+    return user_crud.create_user(db, username, f"{username}@tictactoe.local", secrets.token_urlsafe(32))
+
+
+def load_records(
+    db: Session,
+    records: Iterable[Dict[str, Optional[str]]],
+    player_x_id: UUID,
+    player_o_id: UUID
+) -> int:
+    """
+    Bulk-insert simulated games and their moves with multi-row inserts.
+
+    Args:
+        db: Database session (committed once per call)
+        records: Compact game records from play_game()
+        player_x_id: User recorded as Player X
+        player_o_id: User recorded as Player O
+
+    Returns:
+        Number of games inserted
+    """
+    from app.model.game import Game, encode_history
+    from app.model.move import Move
+    from app.model.ids import uuid7
+
+    game_rows = []
+    move_rows = []
+    now = datetime.now(timezone.utc)
+    for record in records:
+        game_id = uuid7()
+        board = ['-'] * bitboard.CELL_COUNT
+        for ply, position in enumerate(record["moves"]):
+            player = 'X' if ply % 2 == 0 else 'O'
+            board[int(position) - 1] = player
+            move_rows.append({
+                "id": uuid7(),
+                "game_id": game_id,
+                "player_id": player_x_id if player == 'X' else player_o_id,
+                "player": player,
+                "position": int(position),
+                "ply": ply + 1,
+                "created_at": now + timedelta(microseconds=ply),
+            })
+        # Finished games keep the player who made the last move, as in MoveService
+        last_player = 'X' if len(record["moves"]) % 2 else 'O'
+        game_rows.append({
+            "id": game_id,
+            "player_x_id": player_x_id,
+            "player_o_id": player_o_id,
+            "current_player": last_player,
+            "status": record["status"],
+            "winner": record["winner"],
+            "board_state": ''.join(board),
+            "move_history": encode_history((int(position) for position in record["moves"]), bitboard.CELL_COUNT),
+            "board_rows": 3,
+            "board_cols": 3,
+            "win_length": 3,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    if game_rows:
+        db.execute(insert(Game), game_rows)
+        db.execute(insert(Move), move_rows)
+        db.commit()
+    return len(game_rows)
+
+
+def main() -> None:
+    """Parse arguments, run the simulation and report throughput per worker."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=10_000, help="Number of games to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Games per worker task")
+    parser.add_argument("--x-policy", choices=sorted(POLICIES), default="mixed", help="Policy for Player X")
+    parser.add_argument("--o-policy", choices=sorted(POLICIES), default="mixed", help="Policy for Player O")
+    parser.add_argument("--seed", type=int, default=None, help="Base random seed for reproducible runs")
+    parser.add_argument("--output", default="-", help="NDJSON output file ('-' for stdout, '' to disable)")
+    parser.add_argument("--load", action="store_true", help="Also bulk-load the games into the database")
+    args = parser.parse_args()
+
+    db = None
+    if args.load:
+        from app.engine import SessionLocal
+
+        db = SessionLocal()
+        player_x = _get_or_create_player(db, "selfplay_x")
+        player_o = _get_or_create_player(db, "selfplay_o")
+
+    output = None
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output:
+        output = open(args.output, "w", encoding="utf-8")
+
+    batches = [
+        min(args.batch_size, args.games - start)
+        for start in range(0, args.games, args.batch_size)
+    ]
+    per_worker: Dict[int, List[float]] = {}
+    loaded = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(
+                    play_batch,
+                    count,
+                    args.x_policy,
+                    args.o_policy,
+                    None if args.seed is None else args.seed + number
+                )
+                for number, count in enumerate(batches)
+            ]
+            for future in as_completed(futures):
+                pid, elapsed, records = future.result()
+                stats = per_worker.setdefault(pid, [0, 0.0])
+                stats[0] += len(records)
+                stats[1] += elapsed
+                if output is not None:
+                    output.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+                if db is not None:
+                    loaded += load_records(db, records, player_x.id, player_o.id)
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+        if db is not None:
+            db.close()
+
+    total_elapsed = time.perf_counter() - started
+    report = sys.stderr if output is sys.stdout else sys.stdout
+    for pid, (games, elapsed) in sorted(per_worker.items()):
+        print(f"worker {pid}: {int(games)} games, {games / elapsed:,.0f} games/s", file=report)
+    print(f"Total: {args.games} games in {total_elapsed:.1f}s ({args.games / total_elapsed:,.0f} games/s)", file=report)
+    if db is not None:
+        print(f"Loaded {loaded} game(s) into the database", file=report)
+
+
+if __name__ == "__main__":
+    main()
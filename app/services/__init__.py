@@ -2,17 +2,24 @@
 Services package for TicTacToe application.
 Contains business logic for game operations.
 """
-from app.services.game_service import game_service, GameService, GameValidationError, GameNotFoundError
+from app.services.game_service import game_service, GameService, GameValidationError, GameNotFoundError, GameConflictError
 from app.services.move_service import move_service, MoveService
 from app.services.user_service import user_service, UserService
+from app.services.review_service import review_service, ReviewService
+from app.services.purge_service import purge_service, PurgeService
 
 __all__ = [
     "game_service",
     "GameService",
     "GameValidationError",
     "GameNotFoundError",
+    "GameConflictError",
     "move_service",
     "MoveService",
     "user_service",
-    "UserService"
+    "UserService",
+    "review_service",
+    "ReviewService",
+    "purge_service",
+    "PurgeService"
 ]
@@ -0,0 +1,242 @@
+"""
+Cold storage for finished games.
+
+Won and drawn games are never modified again, so once they are old enough
+they are moved out of the database into append-only segment files on local
+disk. Every archive run writes one new segment and never touches existing
+ones:
+
+    segment-00000001.dat  blocks of zlib-compressed NDJSON game records
+    segment-00000001.idx  header, then count x (game id, block offset,
+                          block length, line in block), sorted by game id
+
+A segment is complete once its index file exists; both files are written
+under temporary names and renamed into place. Index files are
+memory-mapped, so a lookup is a binary search per segment plus one block
+read. GET /games/{id} falls back to the archive configured in ARCHIVE_DIR
+for games that are no longer in the database.
+
+Only one archive run may write to a directory at a time. If a run stops
+after writing a segment but before deleting the games, the next run
+archives them again; lookups return the copy from the newest segment.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import env_str
+from app.crud import game_crud, move_crud
+from app.model.game import Game
+from app.schema.gameDto import GameResponse
+from app.schema.moveDto import MoveResponse
+
+MAGIC = b"TTTA"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sH2xQ")
+ENTRY = struct.Struct("<16sQII")
+
+# Game records compressed together; larger blocks compress better but make lookups read more
+BLOCK_GAMES = 256
+
+
+class GameArchive:
+    """Append-only segment files of archived games in one directory."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._segments: Dict[str, mmap.mmap] = {}
+
+    def _refresh(self) -> List[str]:
+        """Map index files written since the last call; return segment names, newest first."""
+        if self.directory.is_dir():
+            for path in self.directory.glob("segment-*.idx"):
+                if path.stem not in self._segments:
+                    with open(path, "rb") as handle:
+                        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                    magic, version, count = HEADER.unpack_from(mapped, 0)
+                    if (magic, version) != (MAGIC, FORMAT_VERSION) or len(mapped) != HEADER.size + count * ENTRY.size:
+                        mapped.close()
+                        raise ValueError(f"{path} is not a compatible archive index")
+                    self._segments[path.stem] = mapped
+        return sorted(self._segments, reverse=True)
+
+    @staticmethod
+    def _find(mapped: mmap.mmap, key: bytes) -> Optional[Tuple[int, int, int]]:
+        """Binary search an index for a game id; return (offset, length, line)."""
+        low, high = 0, (len(mapped) - HEADER.size) // ENTRY.size
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * ENTRY.size
+            if mapped[start:start + 16] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low * ENTRY.size + HEADER.size < len(mapped):
+            found, offset, length, line = ENTRY.unpack_from(mapped, HEADER.size + low * ENTRY.size)
+            if found == key:
+                return offset, length, line
+        return None
+
+    def get(self, game_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Look up an archived game.
+
+        Args:
+            game_id: Game UUID
+
+        Returns:
+            The game record (GameWithMoves fields) or None if not archived
+        """
+        for name in self._refresh():
+            location = self._find(self._segments[name], game_id.bytes)
+            if location is None:
+                continue
+            offset, length, line = location
+            with open(self.directory / f"{name}.dat", "rb") as handle:
+                handle.seek(offset)
+                block = zlib.decompress(handle.read(length))
+            return json.loads(block.splitlines()[line])
+        return None
+
+    def write_segment(self, records: List[Dict[str, Any]]) -> Path:
+        """
+        Write game records as a new segment.
+
+        Args:
+            records: JSON-serializable game records, each with an "id"
+
+        Returns:
+            Path of the new segment's index file
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        names = [path.stem for path in self.directory.glob("segment-*.idx")]
+        number = max((int(name.split("-")[1]) for name in names), default=0) + 1
+        name = f"segment-{number:08d}"
+
+        entries = []
+        data_tmp = self.directory / f"{name}.dat.tmp"
+        with open(data_tmp, "wb") as handle:
+            for start in range(0, len(records), BLOCK_GAMES):
+                block = records[start:start + BLOCK_GAMES]
+                payload = zlib.compress(b"\n".join(json.dumps(record).encode() for record in block))
+                offset = handle.tell()
+                handle.write(payload)
+                for line, record in enumerate(block):
+                    entries.append((UUID(record["id"]).bytes, offset, len(payload), line))
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        entries.sort()
+        index_tmp = self.directory / f"{name}.idx.tmp"
+        with open(index_tmp, "wb") as handle:
+            handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+            for entry in entries:
+                handle.write(ENTRY.pack(*entry))
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        # The index appears last, so readers never see a partial segment
+        os.replace(data_tmp, self.directory / f"{name}.dat")
+        os.replace(index_tmp, self.directory / f"{name}.idx")
+        return self.directory / f"{name}.idx"
+
+
+def history_moves(game: Game) -> List[MoveResponse]:
+    """Decode a game's moves from games.move_history (no ids or timestamps)."""
+    return [
+        MoveResponse(
+            game_id=game.id,
+            player_id=game.player_x_id if ply % 2 else game.player_o_id,
+            player='X' if ply % 2 else 'O',
+            position=position,
+            ply=ply
+        )
+        for ply, position in enumerate(game.history_positions, start=1)
+    ]
+
+
+def complete_moves(game: Game, moves: List[Any]) -> List[Any]:
+    """
+    Return the move rows of a game, or its decoded history if rows are missing.
+
+    Partition retention (app.engine.partitioning maintain --retain-months)
+    drops old move rows, but games.move_history always holds every move.
+    """
+    if len(moves) == len(game.history_positions):
+        return moves
+    return history_moves(game)
+
+
+def game_record(game: Game, moves: List[Any]) -> Dict[str, Any]:
+    """Serialize a game and its moves the way GET /games/{id} returns them."""
+    record = GameResponse.model_validate(game).model_dump(mode="json")
+    record["moves"] = [
+        MoveResponse.model_validate(move).model_dump(mode="json") for move in complete_moves(game, moves)
+    ]
+    return record
+
+
+def archive_games(
+    db: Session,
+    archive: GameArchive,
+    older_than: timedelta,
+    batch_size: int = 10_000
+) -> int:
+    """
+    Move finished games last updated before a cutoff into the archive.
+
+    Each batch is written as one segment and then deleted from the
+    database, moves and reviews included.
+
+    Args:
+        db: Database session
+        archive: Archive to write to
+        older_than: Minimum age since the game's last update
+        batch_size: Games per segment (and per delete transaction)
+
+    Returns:
+        Number of games archived
+    """
+    cutoff = (datetime.now(timezone.utc) - older_than).replace(tzinfo=None)
+    archived = 0
+    while True:
+        games = list(db.execute(
+            select(Game)
+            .where(Game.status.in_(("won", "draw")), Game.updated_at < cutoff)
+            .order_by(Game.created_at, Game.id)
+            .limit(batch_size)
+        ).scalars())
+        if not games:
+            return archived
+
+        moves_by_game = move_crud.get_moves_by_games(
+            db,
+            [game.id for game in games],
+            since=min(game.created_at.replace(tzinfo=None) for game in games)
+        )
+        archive.write_segment([game_record(game, moves_by_game[game.id]) for game in games])
+        archived += game_crud.delete_games(db, [game.id for game in games])
+        db.expunge_all()
+
+
+_archive: Optional[GameArchive] = None
+
+
+def get_archive() -> Optional[GameArchive]:
+    """Return the archive in ARCHIVE_DIR, or None if archiving is not configured."""
+    global _archive
+    directory = env_str("ARCHIVE_DIR", "")
+    if not directory:
+        return None
+    if _archive is None or _archive.directory != Path(directory):
+        _archive = GameArchive(directory)
+    return _archive
@@ -0,0 +1,98 @@
+"""
+NumPy-vectorized batch evaluator for 3x3 positions.
+
+Evaluates millions of encoded boards at once with array-wide mask
+operations, without a per-board Python loop. Used by analytics backfills,
+bot training and the status re-derivation script.
+
+Requires the optional `analytics` dependencies (numpy).
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from app.services import bitboard
+
+# Status codes returned by evaluate_batch()
+STATUS_ONGOING = 0
+STATUS_WON = 1
+STATUS_DRAW = 2
+STATUS_NAMES = ('ongoing', 'won', 'draw')
+
+# Winner codes returned by evaluate_batch()
+WINNER_NONE = 0
+WINNER_X = 1
+WINNER_O = 2
+WINNER_NAMES = (None, 'X', 'O')
+
+WIN_MASKS = np.array(bitboard.WIN_MASKS, dtype=np.uint16)
+_CELL_WEIGHTS = np.left_shift(1, np.arange(bitboard.CELL_COUNT)).astype(np.uint16)
+_CELL_CODES = np.frombuffer(b"XO-", dtype=np.uint8)
+
+
+def encode_boards(board_states: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode many 9-character board_state strings into bitboard arrays.
+
+    Args:
+        board_states: Sequence of 9-character board strings
+
+    Returns:
+        Tuple of (x_bits, o_bits) uint16 arrays
+
+    Raises:
+        ValueError: If a board does not have exactly 9 cells or contains
+            anything but X, O and -
+    """
+    lengths = np.fromiter(map(len, board_states), dtype=np.intp, count=len(board_states))
+    if (lengths != bitboard.CELL_COUNT).any():
+        raise ValueError("Every board_state must have exactly 9 cells")
+    try:
+        raw = np.frombuffer(''.join(board_states).encode('ascii'), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise ValueError("A board_state may only contain X, O and -") from None
+    cells = raw.reshape(-1, bitboard.CELL_COUNT)
+    if not np.isin(cells, _CELL_CODES).all():
+        raise ValueError("A board_state may only contain X, O and -")
+    x_bits = (cells == ord('X')).astype(np.uint16) @ _CELL_WEIGHTS
+    o_bits = (cells == ord('O')).astype(np.uint16) @ _CELL_WEIGHTS
+    return x_bits, o_bits
+
+
+def _has_line(bits: np.ndarray) -> np.ndarray:
+    """Return a bool array that is True where the mask contains a full line."""
+    return ((bits[:, None] & WIN_MASKS) == WIN_MASKS).any(axis=1)
+
+
+def evaluate_batch(x_bits: np.ndarray, o_bits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Determine status and winner for every position in the batch.
+
+    Args:
+        x_bits: Array of X bit masks
+        o_bits: Array of O bit masks (same shape)
+
+    Returns:
+        Tuple of (status, winner) uint8 arrays using the STATUS_* and
+        WINNER_* codes. If both players have a line, X is reported,
+        matching GameService.check_winner().
+    """
+    x_bits = np.asarray(x_bits, dtype=np.uint16).ravel()
+    o_bits = np.asarray(o_bits, dtype=np.uint16).ravel()
+    x_won = _has_line(x_bits)
+    o_won = _has_line(o_bits) & ~x_won
+    full = (x_bits | o_bits) == bitboard.FULL_MASK
+
+    winner = np.full(x_bits.shape, WINNER_NONE, dtype=np.uint8)
+    winner[x_won] = WINNER_X
+    winner[o_won] = WINNER_O
+
+    status = np.full(x_bits.shape, STATUS_ONGOING, dtype=np.uint8)
+    status[full] = STATUS_DRAW
+    status[winner != WINNER_NONE] = STATUS_WON
+    return status, winner
+
+
+def evaluate_board_states(board_states: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode and evaluate many board_state strings; see evaluate_batch()."""
+    return evaluate_batch(*encode_boards(board_states))
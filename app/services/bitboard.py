@@ -0,0 +1,178 @@
+"""
+Bitboard representation of the 3x3 TicTacToe board.
+
+A position is a pair of 9-bit integers (x_bits, o_bits). Bit i is set when
+cell i (0-8, row-major; i.e. position i + 1) holds that player's mark.
+The 9-character board_state string is only used at the ORM/DTO edge via
+encode() and decode().
+"""
+from typing import NamedTuple, Optional, Tuple, List
+
+EMPTY = '-'
+CELL_COUNT = 9
+FULL_MASK = (1 << CELL_COUNT) - 1
+
+# Win patterns as bit masks (rows, columns, diagonals)
+WIN_MASKS: Tuple[int, ...] = tuple(
+    (1 << a) | (1 << b) | (1 << c)
+    for a, b, c in (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),
+        (0, 4, 8), (2, 4, 6),
+    )
+)
+
+# LINE_TABLE[bits] is True when the 9-bit mask contains a complete line.
+# Built once from the 8 mask ANDs so a win check is a single lookup.
+LINE_TABLE: Tuple[bool, ...] = tuple(
+    any(bits & mask == mask for mask in WIN_MASKS)
+    for bits in range(FULL_MASK + 1)
+)
+
+# Win masks through each cell (2 to 4 lines), for incremental checks.
+LINES_THROUGH: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(mask for mask in WIN_MASKS if mask >> index & 1)
+    for index in range(CELL_COUNT)
+)
+
+# Translation tables turning a board_state string into a binary literal.
+_X_DIGITS = str.maketrans({'X': '1', 'O': '0', EMPTY: '0'})
+_O_DIGITS = str.maketrans({'X': '0', 'O': '1', EMPTY: '0'})
+
+
+def encode(board_state: str) -> Tuple[int, int]:
+    """
+    Convert a 9-character board_state string into (x_bits, o_bits).
+
+    Args:
+        board_state: 9-character string representing the board
+
+    Returns:
+        Tuple of the X and O bit masks
+    """
+    reversed_state = board_state[::-1]
+    return (
+        int(reversed_state.translate(_X_DIGITS), 2),
+        int(reversed_state.translate(_O_DIGITS), 2),
+    )
+
+
+def decode(x_bits: int, o_bits: int) -> str:
+    """
+    Convert (x_bits, o_bits) back into a 9-character board_state string.
+
+    Args:
+        x_bits: Bit mask of X marks
+        o_bits: Bit mask of O marks
+
+    Returns:
+        9-character board_state string
+    """
+    return ''.join(
+        'X' if x_bits >> i & 1 else 'O' if o_bits >> i & 1 else EMPTY
+        for i in range(CELL_COUNT)
+    )
+
+
+def empty_mask(x_bits: int, o_bits: int) -> int:
+    """Return the bit mask of empty cells (legal moves)."""
+    return ~(x_bits | o_bits) & FULL_MASK
+
+
+def is_full(x_bits: int, o_bits: int) -> bool:
+    """Return True if every cell is occupied."""
+    return x_bits | o_bits == FULL_MASK
+
+
+def winner(x_bits: int, o_bits: int) -> Optional[str]:
+    """
+    Return 'X' or 'O' if that player has a complete line, None otherwise.
+    """
+    if LINE_TABLE[x_bits]:
+        return 'X'
+    if LINE_TABLE[o_bits]:
+        return 'O'
+    return None
+
+
+def status(x_bits: int, o_bits: int) -> Tuple[str, Optional[str]]:
+    """
+    Determine (status, winner) for a position.
+
+    Returns:
+        Tuple of (status, winner) where status is 'ongoing', 'won', or 'draw'
+    """
+    mark = winner(x_bits, o_bits)
+    if mark:
+        return 'won', mark
+    if is_full(x_bits, o_bits):
+        return 'draw', None
+    return 'ongoing', None
+
+
+def place(x_bits: int, o_bits: int, index: int, player: str) -> Tuple[int, int]:
+    """
+    Place a mark on an empty cell.
+
+    Args:
+        x_bits: Bit mask of X marks
+        o_bits: Bit mask of O marks
+        index: Cell index (0-8)
+        player: Player making the move ('X' or 'O')
+
+    Returns:
+        New (x_bits, o_bits)
+    """
+    bit = 1 << index
+    if player == 'X':
+        return x_bits | bit, o_bits
+    return x_bits, o_bits | bit
+
+
+def mask_to_positions(mask: int) -> List[int]:
+    """Convert a cell bit mask into a sorted list of positions (1-9)."""
+    return [i + 1 for i in range(CELL_COUNT) if mask >> i & 1]
+
+
+class BoardState(NamedTuple):
+    """Bitboard position with a running count of filled cells."""
+    x_bits: int
+    o_bits: int
+    filled: int
+
+    @classmethod
+    def from_board_state(cls, board_state: str) -> "BoardState":
+        """Build a BoardState from a 9-character board_state string."""
+        x_bits, o_bits = encode(board_state)
+        return cls(x_bits, o_bits, (x_bits | o_bits).bit_count())
+
+
+def apply_move(
+    state: BoardState,
+    index: int,
+    player: str
+) -> Tuple[BoardState, str, Optional[str]]:
+    """
+    Place a mark and determine the resulting status incrementally.
+
+    Only the lines through the placed cell are checked for a win, and the
+    running filled count decides the draw, so the previous position is
+    assumed to be ongoing.
+
+    Args:
+        state: Position before the move
+        index: Cell index (0-8) of the move
+        player: Player making the move ('X' or 'O')
+
+    Returns:
+        Tuple of (new state, status, winner)
+    """
+    x_bits, o_bits = place(state.x_bits, state.o_bits, index, player)
+    new_state = BoardState(x_bits, o_bits, state.filled + 1)
+    mover_bits = x_bits if player == 'X' else o_bits
+    for mask in LINES_THROUGH[index]:
+        if mover_bits & mask == mask:
+            return new_state, 'won', player
+    if new_state.filled == CELL_COUNT:
+        return new_state, 'draw', None
+    return new_state, 'ongoing', None
@@ -0,0 +1,146 @@
+"""
+Worker process pool for the computer opponent on large boards.
+
+MCTS searches are CPU-bound and take a full time budget, so they run in
+separate processes instead of the FastAPI request thread pool. The pool
+is a set of single-process shards and every game is routed to the same
+shard, so its search tree survives between turns. Results are delivered
+through a callback; the request that triggered the search does not wait.
+
+BOT_POOL_WORKERS=0 runs searches inline in the calling thread, which is
+meant for tests and single-process tools.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Set
+from uuid import UUID
+
+from app.config import env_int
+from app.bot import mcts
+
+
+class BotPool:
+    """Routes bot searches to per-game worker process shards."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._shards: List[ProcessPoolExecutor] = []
+        self._pending: Set[UUID] = set()
+        self._lock = threading.Lock()
+
+    def _shard(self, game_id: UUID) -> ProcessPoolExecutor:
+        """Return the worker shard that owns a game, starting the shards lazily."""
+        with self._lock:
+            if not self._shards:
+                # Spawned workers do not inherit the server's threads or connections
+                context = multiprocessing.get_context("spawn")
+                self._shards = [
+                    ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    for _ in range(self.workers)
+                ]
+            return self._shards[game_id.int % self.workers]
+
+    def submit(
+        self,
+        game_id: UUID,
+        rows: int,
+        cols: int,
+        win_length: int,
+        board_state: str,
+        player: str,
+        time_budget: float,
+        callback: Callable[[int], None],
+        on_error: Optional[Callable[[Exception], None]] = None
+    ) -> Optional[Future]:
+        """
+        Search a move for a game and pass the chosen position to the callback.
+
+        Args:
+            game_id: Game the move is for
+            rows: Board rows
+            cols: Board columns
+            win_length: Marks in a row needed to win
+            board_state: Current board_state string
+            player: Player to move ('X' or 'O')
+            time_budget: Wall-clock budget in seconds
+            callback: Called with the chosen position (1-based); runs in a pool
+                thread, or in the calling thread when the pool is inline
+            on_error: Called with the exception if the search fails, so the
+                caller can still make a move
+
+        Returns:
+            Future of the search, or None when it ran inline
+        """
+        args = (str(game_id), rows, cols, win_length, board_state, player, time_budget)
+        if self.workers <= 0:
+            try:
+                position = mcts.choose_move(*args)
+            except Exception as e:
+                self._failed(game_id, e, on_error)
+                return None
+            callback(position)
+            return None
+
+        with self._lock:
+            self._pending.add(game_id)
+        try:
+            future = self._shard(game_id).submit(mcts.choose_move, *args)
+        except Exception:
+            with self._lock:
+                self._pending.discard(game_id)
+            raise
+
+        def _deliver(done: Future) -> None:
+            try:
+                position = done.result()
+            except Exception as e:
+                self._failed(game_id, e, on_error)
+                return
+            finally:
+                with self._lock:
+                    self._pending.discard(game_id)
+            try:
+                callback(position)
+            except Exception as e:
+                print(f"Computer move for game {game_id} could not be stored: {e}")
+
+        future.add_done_callback(_deliver)
+        return future
+
+    @staticmethod
+    def _failed(game_id: UUID, error: Exception, on_error: Optional[Callable[[Exception], None]]) -> None:
+        """Report a failed search and hand it to the caller's fallback."""
+        print(f"Computer move search for game {game_id} failed: {error}")
+        if on_error is None:
+            return
+        try:
+            on_error(error)
+        except Exception as e:
+            print(f"Fallback computer move for game {game_id} failed: {e}")
+
+    def is_pending(self, game_id: UUID) -> bool:
+        """Return whether a search for the game is queued or running."""
+        with self._lock:
+            return game_id in self._pending
+
+    def forget(self, game_id: UUID) -> None:
+        """Drop the search tree of a finished game in the worker that owns it."""
+        if self.workers <= 0:
+            mcts.forget(str(game_id))
+            return
+        with self._lock:
+            started = bool(self._shards)
+        if started:
+            self._shard(game_id).submit(mcts.forget, str(game_id))
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            for shard in self._shards:
+                shard.shutdown(wait=False, cancel_futures=True)
+            self._shards = []
+            self._pending.clear()
+
+
+bot_pool = BotPool(env_int("BOT_POOL_WORKERS", 2))
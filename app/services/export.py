@@ -0,0 +1,124 @@
+"""
+Streaming export of games and their moves.
+
+Games are read with a server-side cursor (yield_per) in fixed-size chunks as
+plain column tuples, so no ORM objects accumulate and memory stays constant
+however large the table is. The moves come from each game's move_history,
+which avoids a second query per chunk. Each chunk is rendered to one string,
+as NDJSON (one game per line, moves as a list of positions) or CSV (moves as
+space-separated positions).
+"""
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.model.game import Game, decode_history
+
+# Column order of the CSV export (and the keys of every NDJSON record)
+EXPORT_COLUMNS = [
+    "id",
+    "player_x_id",
+    "player_o_id",
+    "current_player",
+    "status",
+    "winner",
+    "board_state",
+    "board_rows",
+    "board_cols",
+    "win_length",
+    "bot_level",
+    "created_at",
+    "updated_at",
+    "moves",
+]
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    """Convert a selected games row to an export record."""
+    return {
+        "id": str(row.id),
+        "player_x_id": str(row.player_x_id) if row.player_x_id else None,
+        "player_o_id": str(row.player_o_id) if row.player_o_id else None,
+        "current_player": row.current_player,
+        "status": row.status,
+        "winner": row.winner,
+        "board_state": row.board_state,
+        "board_rows": row.board_rows,
+        "board_cols": row.board_cols,
+        "win_length": row.win_length,
+        "bot_level": row.bot_level,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "moves": decode_history(row.move_history or b"", row.board_rows * row.board_cols),
+    }
+
+
+def iter_record_chunks(db: Session, chunk_size: int = 1_000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream all games in (created_at, id) order as chunks of export records.
+
+    Args:
+        db: Database session
+        chunk_size: Rows fetched from the server-side cursor at a time
+
+    Yields:
+        Lists of at most chunk_size export records
+    """
+    columns = [getattr(Game, name) for name in EXPORT_COLUMNS if name != "moves"]
+    query = (
+        select(*columns, Game.move_history)
+        .order_by(Game.created_at, Game.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for rows in db.execute(query).partitions():
+        yield [_record(row) for row in rows]
+
+
+def render_chunks(db: Session, export_format: str, chunk_size: int = 1_000) -> Iterator[str]:
+    """
+    Stream the export as text, one string per chunk of games.
+
+    Args:
+        db: Database session
+        export_format: 'ndjson' or 'csv'
+        chunk_size: Games per chunk
+
+    Yields:
+        Text chunks; for CSV the first one is the header row
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if export_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    if export_format == "ndjson":
+        for records in iter_record_chunks(db, chunk_size):
+            yield "".join(json.dumps(record) + "\n" for record in records)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for records in iter_record_chunks(db, chunk_size):
+        for record in records:
+            writer.writerow([
+                " ".join(map(str, record[name])) if name == "moves" else _csv_value(record[name])
+                for name in EXPORT_COLUMNS
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _csv_value(value: Optional[Any]) -> Any:
+    """CSV has no null; missing values are written as empty fields."""
+    return "" if value is None else value
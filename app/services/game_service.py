@@ -3,11 +3,21 @@ Business logic service for Game operations.
 Contains TicTacToe game logic (win conditions, draw detection, etc.)
 """
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from typing import Optional, Tuple, List
 from uuid import UUID
+import secrets
 
 from app.model.game import Game
-from app.crud import game_crud
+from app.model.user import User
+from app.crud import game_crud, user_crud
+from app.services import bitboard, outcome_table, solver, mnk_engine, tablebase
+
+
+# Reserved account that plays Player O in games against the computer
+BOT_USER_ID = UUID("00000000-0000-0000-0000-0000000000b0")
+BOT_USERNAME = "computer"
+BOT_EMAIL = "computer@tictactoe.local"
 
 
 class GameValidationError(ValueError):
@@ -18,20 +28,101 @@ class GameNotFoundError(GameValidationError):
     """Raised when a requested game does not exist."""
 
 
+class GameConflictError(GameValidationError):
+    """Raised when a game was changed by a concurrent request."""
+
+
 class GameService:
     """Service class containing TicTacToe game logic."""
 
     @staticmethod
-    def create_game_for_user(db: Session, user_id: UUID) -> Game:
+    def create_game_for_user(
+        db: Session,
+        user_id: UUID,
+        board_rows: int = 3,
+        board_cols: int = 3,
+        win_length: int = 3
+    ) -> Game:
         """
         Create a new game with the authenticated user as Player X.
         Player O remains empty until another user joins.
+
+        Raises:
+            GameValidationError: If the board dimensions are invalid.
         """
+        error = mnk_engine.validate_dimensions(board_rows, board_cols, win_length)
+        if error:
+            raise GameValidationError(error)
+
         return game_crud.create_game(
             db=db,
             player_x_id=user_id,
             player_o_id=None,
-            status="waiting"
+            status="waiting",
+            board_rows=board_rows,
+            board_cols=board_cols,
+            win_length=win_length
+        )
+
+    @staticmethod
+    def get_or_create_bot_user(db: Session) -> User:
+        """
+        Get the reserved computer opponent account, creating it on first use.
+        Its password is random and never stored, so nobody can log in as it.
+        """
+        bot = user_crud.get_user_by_id(db, BOT_USER_ID)
+        if bot:
+            return bot
+
+        bot = user_crud.create_user(
+            db=db,
+            username=BOT_USERNAME,
+            email=BOT_EMAIL,
+            password=secrets.token_urlsafe(32),
+            user_id=BOT_USER_ID
+        )
+        if not bot:
+            # Created concurrently by another request
+            bot = user_crud.get_user_by_id(db, BOT_USER_ID)
+        if not bot:
+            raise GameValidationError("Computer opponent account is unavailable")
+        return bot
+
+    @staticmethod
+    def create_game_vs_computer(
+        db: Session,
+        user_id: UUID,
+        level: str = solver.DEFAULT_LEVEL,
+        board_rows: int = 3,
+        board_cols: int = 3,
+        win_length: int = 3
+    ) -> Game:
+        """
+        Create a new game against the computer.
+        The authenticated user is Player X and the computer is Player O,
+        so the game starts immediately. The 3x3 board is played by the
+        solver, larger boards by the MCTS engine.
+
+        Raises:
+            GameValidationError: If the level or the board dimensions are invalid.
+        """
+        if level not in solver.LEVELS:
+            raise GameValidationError(f"Unknown computer level: {level}")
+
+        error = mnk_engine.validate_dimensions(board_rows, board_cols, win_length)
+        if error:
+            raise GameValidationError(error)
+
+        bot = GameService.get_or_create_bot_user(db)
+        return game_crud.create_game(
+            db=db,
+            player_x_id=user_id,
+            player_o_id=bot.id,
+            status="ongoing",
+            bot_level=level,
+            board_rows=board_rows,
+            board_cols=board_cols,
+            win_length=win_length
         )
 
     @staticmethod
@@ -41,6 +132,7 @@ class GameService:
 
         Raises:
             GameValidationError: If game cannot be joined.
+            GameConflictError: If the game was changed by a concurrent request.
         """
         game = game_crud.get_game_by_id(db, game_id)
         if not game:
@@ -57,7 +149,12 @@ class GameService:
 
         game.player_o_id = user_id
         game.status = "ongoing"
-        db.commit()
+        try:
+            db.commit()
+        except StaleDataError:
+            # Another player joined (or the game changed) since it was read
+            db.rollback()
+            raise GameConflictError("Game was joined by another player, please reload it")
         db.refresh(game)
         return game
     
@@ -87,11 +184,7 @@ class GameService:
         Returns:
             'X' if X won, 'O' if O won, None if no winner
         """
-        for pattern in GameService.WIN_PATTERNS:
-            positions = [board_state[i] for i in pattern]
-            if positions[0] != '-' and positions[0] == positions[1] == positions[2]:
-                return positions[0]
-        return None
+        return bitboard.winner(*bitboard.encode(board_state))
     
     @staticmethod
     def check_draw(board_state: str) -> bool:
@@ -104,7 +197,7 @@ class GameService:
         Returns:
             True if draw, False otherwise
         """
-        return '-' not in board_state and GameService.check_winner(board_state) is None
+        return outcome_table.status(*bitboard.encode(board_state))[0] == 'draw'
     
     @staticmethod
     def is_valid_move(board_state: str, position: int) -> bool:
@@ -112,13 +205,13 @@ class GameService:
         Check if a move is valid.
         
         Args:
-            board_state: 9-character string representing the board
-            position: Position to check (1-9)
+            board_state: Board state string (one character per cell)
+            position: Position to check (1 to number of cells)
         
         Returns:
             True if position is empty and within bounds, False otherwise
         """
-        if not 1 <= position <= 9:
+        if not 1 <= position <= len(board_state):
             return False
         index = position - 1
         return board_state[index] == '-'
@@ -142,10 +235,8 @@ class GameService:
         if not GameService.is_valid_move(board_state, position):
             raise ValueError(f"Invalid move: Position {position} is already occupied or out of bounds")
         
-        index = position - 1
-        board_list = list(board_state)
-        board_list[index] = player
-        return ''.join(board_list)
+        x_bits, o_bits = bitboard.encode(board_state)
+        return bitboard.decode(*bitboard.place(x_bits, o_bits, position - 1, player))
     
     @staticmethod
     def get_next_player(current_player: str) -> str:
@@ -173,14 +264,40 @@ class GameService:
             - status: 'ongoing', 'won', or 'draw'
             - winner: 'X', 'O', or None
         """
-        winner = GameService.check_winner(board_state)
-        if winner:
-            return 'won', winner
+        return outcome_table.status(*bitboard.encode(board_state))
+    
+    @staticmethod
+    def get_game_status_after_move(
+        board_state: str,
+        position: int,
+        player: str
+    ) -> Tuple[str, str, Optional[str]]:
+        """
+        Make a move and determine the new status incrementally.
+        
+        Only the lines through the placed position are checked, so the
+        given board_state must be an ongoing game.
+        
+        Args:
+            board_state: Current 9-character board state
+            position: Position to place the mark (1-9)
+            player: Player making the move ('X' or 'O')
         
-        if GameService.check_draw(board_state):
-            return 'draw', None
+        Returns:
+            Tuple of (new board_state, status, winner)
         
-        return 'ongoing', None
+        Raises:
+            ValueError: If move is invalid
+        """
+        if not GameService.is_valid_move(board_state, position):
+            raise ValueError(f"Invalid move: Position {position} is already occupied or out of bounds")
+        
+        board, status, winner = bitboard.apply_move(
+            bitboard.BoardState.from_board_state(board_state),
+            position - 1,
+            player
+        )
+        return bitboard.decode(board.x_bits, board.o_bits), status, winner
     
     @staticmethod
     def display_board(board_state: str) -> str:
@@ -213,7 +330,76 @@ class GameService:
         Returns:
             List of available positions (1-9)
         """
-        return [i + 1 for i, cell in enumerate(board_state) if cell == '-']
+        return bitboard.mask_to_positions(bitboard.empty_mask(*bitboard.encode(board_state)))
+    
+    @staticmethod
+    def get_best_positions(
+        board_state: str,
+        board_rows: int = 3,
+        board_cols: int = 3,
+        win_length: int = 3
+    ) -> List[int]:
+        """
+        Get the positions that are optimal for the side to move (hints).
+        
+        3x3 boards use the outcome table; larger boards use a loaded endgame
+        tablebase for their shape, if one covers the position.
+        
+        Args:
+            board_state: String representing the board, one character per cell
+            board_rows: Number of board rows
+            board_cols: Number of board columns
+            win_length: Marks in a row needed to win
+        
+        Returns:
+            List of optimal positions, empty if the game is over or the
+            position is not covered
+        """
+        if (board_rows, board_cols, win_length) != (3, 3, 3):
+            table = tablebase.get_tablebase(board_rows, board_cols, win_length)
+            scores = table.score_moves(board_state) if table else None
+            if not scores:
+                return []
+            best = max(score for _, score in scores)
+            return [position for position, score in scores if score == best]
+        
+        outcome = outcome_table.lookup(*bitboard.encode(board_state))
+        if outcome is None:
+            return []
+        return bitboard.mask_to_positions(outcome.best_mask)
+    
+    @staticmethod
+    def analyze_position(board_state: str, player: str) -> List[Tuple[int, str, int]]:
+        """
+        Evaluate every legal move of a 3x3 position under perfect play.
+        
+        Scores come from the solver's process-wide memo keyed on the
+        canonical position, so each symmetry class is searched only once.
+        
+        Args:
+            board_state: 9-character string representing the board
+            player: Player to move ('X' or 'O')
+        
+        Returns:
+            List of (position, result, plies to result) sorted by position,
+            where result is 'win', 'draw' or 'loss' for the player and the
+            plies include the move itself. Empty if the game is over.
+        """
+        x_bits, o_bits = bitboard.encode(board_state)
+        empties = bitboard.empty_mask(x_bits, o_bits).bit_count()
+        if not empties or bitboard.winner(x_bits, o_bits):
+            return []
+        
+        # A decisive score is 1 + the empty cells left when the game ends
+        analysis = []
+        for index, score in solver.score_moves(x_bits, o_bits, player):
+            if score > 0:
+                analysis.append((index + 1, 'win', empties - score + 1))
+            elif score < 0:
+                analysis.append((index + 1, 'loss', empties + score + 1))
+            else:
+                analysis.append((index + 1, 'draw', empties))
+        return analysis
 
 
 # Create singleton instance
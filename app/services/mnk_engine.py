@@ -0,0 +1,133 @@
+"""
+Generalized m,n,k board engine.
+
+Supports any board of `rows` x `cols` cells where `win_length` marks in a row
+(horizontally, vertically or diagonally) win, e.g. 15x15 five-in-a-row.
+The board_state string keeps one character per cell in row-major order, so
+the same storage format serves 3x3 and large boards.
+
+Win detection is incremental: after a move only the four lines through the
+placed cell are inspected, counting the run of equal marks in both
+directions up to win_length - 1 cells, so each check is O(k) instead of a
+rescan of every possible line. A running filled-cell count decides draws.
+"""
+from typing import List, Optional, Tuple
+
+EMPTY = '-'
+MIN_BOARD_SIZE = 3
+MAX_BOARD_SIZE = 19
+MAX_CELLS = MAX_BOARD_SIZE * MAX_BOARD_SIZE
+
+_EMPTY_CODE = ord(EMPTY)
+
+# Line directions as (row step, column step): horizontal, vertical, both diagonals
+DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def validate_dimensions(rows: int, cols: int, win_length: int) -> Optional[str]:
+    """
+    Validate board dimensions.
+
+    Returns:
+        Error message if invalid, None if valid
+    """
+    if not MIN_BOARD_SIZE <= rows <= MAX_BOARD_SIZE or not MIN_BOARD_SIZE <= cols <= MAX_BOARD_SIZE:
+        return f"Board rows and columns must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}"
+    if not MIN_BOARD_SIZE <= win_length <= max(rows, cols):
+        return f"Win length must be between {MIN_BOARD_SIZE} and {max(rows, cols)}"
+    return None
+
+
+def empty_board_state(rows: int, cols: int) -> str:
+    """Return the board_state string of an empty rows x cols board."""
+    return EMPTY * (rows * cols)
+
+
+class MNKBoard:
+    """Mutable m,n,k board with incremental win detection."""
+
+    __slots__ = ("rows", "cols", "win_length", "cells", "filled")
+
+    def __init__(self, rows: int, cols: int, win_length: int, board_state: Optional[str] = None):
+        """
+        Create a board, optionally from an existing board_state string.
+
+        Raises:
+            ValueError: If the board_state length does not match the dimensions
+        """
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        if board_state is None:
+            board_state = empty_board_state(rows, cols)
+        if len(board_state) != rows * cols:
+            raise ValueError(f"Board state must have {rows * cols} cells")
+        self.cells = bytearray(board_state, "ascii")
+        self.filled = len(self.cells) - self.cells.count(_EMPTY_CODE)
+
+    @property
+    def size(self) -> int:
+        """Number of cells on the board."""
+        return len(self.cells)
+
+    def to_board_state(self) -> str:
+        """Return the board_state string for storage."""
+        return self.cells.decode("ascii")
+
+    def is_valid_move(self, position: int) -> bool:
+        """Check that a position (1-based) is on the board and empty."""
+        return 1 <= position <= len(self.cells) and self.cells[position - 1] == _EMPTY_CODE
+
+    def available_positions(self) -> List[int]:
+        """Return all empty positions (1-based)."""
+        return [i + 1 for i, cell in enumerate(self.cells) if cell == _EMPTY_CODE]
+
+    def run_length(self, index: int, row_step: int, col_step: int) -> int:
+        """
+        Count the run of equal marks through a cell along one line.
+
+        Walks at most win_length - 1 cells in each direction.
+        """
+        mark = self.cells[index]
+        row, col = divmod(index, self.cols)
+        count = 1
+        for sign in (1, -1):
+            r, c = row + sign * row_step, col + sign * col_step
+            while (
+                count < self.win_length
+                and 0 <= r < self.rows
+                and 0 <= c < self.cols
+                and self.cells[r * self.cols + c] == mark
+            ):
+                count += 1
+                r += sign * row_step
+                c += sign * col_step
+        return count
+
+    def place(self, position: int, player: str) -> Tuple[str, Optional[str]]:
+        """
+        Place a mark and determine the resulting status incrementally.
+
+        Args:
+            position: Position to place the mark (1-based)
+            player: Player making the move ('X' or 'O')
+
+        Returns:
+            Tuple of (status, winner)
+
+        Raises:
+            ValueError: If move is invalid
+        """
+        if not self.is_valid_move(position):
+            raise ValueError(f"Invalid move: Position {position} is already occupied or out of bounds")
+
+        index = position - 1
+        self.cells[index] = ord(player)
+        self.filled += 1
+
+        for row_step, col_step in DIRECTIONS:
+            if self.run_length(index, row_step, col_step) >= self.win_length:
+                return 'won', player
+        if self.filled == len(self.cells):
+            return 'draw', None
+        return 'ongoing', None
@@ -2,14 +2,31 @@
 Business logic service for Move operations.
 Handles move validation and execution.
 """
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from typing import Optional, Dict, Any
 from uuid import UUID
 
+from app.engine import SessionLocal
+
 from app.model.move import Move
 from app.model.game import Game
-from app.crud import move_crud, game_crud
-from app.services.game_service import game_service
+from app.crud import game_crud
+from app.services.game_service import game_service, GameConflictError
+from app.bot import mcts
+from app.services import bitboard, outcome_table, solver, mnk_engine, tablebase
+from app.services.bot_pool import bot_pool
+from app.services.review_service import review_service
+from app.config import env_int
+
+
+# Wall-clock budget for the computer opponent's reply
+BOT_MOVE_TIME_BUDGET = env_int("BOT_MOVE_TIME_BUDGET_MS", 200) / 1000
+
+# Wall-clock budget for the computer's MCTS search on larger boards (hard level)
+BOT_MCTS_TIME_BUDGET = env_int("BOT_MCTS_TIME_BUDGET_MS", 1000) / 1000
 
 
 class MoveService:
@@ -26,7 +43,7 @@ class MoveService:
         
         Args:
             game: Game object
-            position: Position to place the mark (1-9)
+            position: Position to place the mark (1 to number of cells)
             player_id: UUID of the player making the move
         
         Returns:
@@ -40,8 +57,13 @@ class MoveService:
         if game.status != 'ongoing':
             return f"Game is already finished with status: {game.status}"
         
-        # Check if position is valid
-        if not game_service.is_valid_move(game.board_state, position):
+        # Check if position is valid; 3x3 boards read every legal cell from the outcome table
+        if game.is_standard_board:
+            legal = (1 <= position <= bitboard.CELL_COUNT
+                     and outcome_table.legal_mask(*bitboard.encode(game.board_state)) >> (position - 1) & 1)
+        else:
+            legal = game_service.is_valid_move(game.board_state, position)
+        if not legal:
             return f"Position {position} is already occupied or out of bounds"
         
         # Determine which player should make the move
@@ -62,18 +84,21 @@ class MoveService:
     ) -> Dict[str, Any]:
         """
         Execute a move and update the game state.
+        In games against the computer, the bot's reply is played as well.
+        The move(s) and the game update are committed in one transaction.
         
         Args:
             db: Database session
             game: Game object
-            position: Position to place the mark (1-9)
+            position: Position to place the mark (1 to number of cells)
             player_id: UUID of the player making the move
         
         Returns:
-            Dictionary with move result and updated game state
+            Dictionary with move result, the bot's reply (if any) and updated game state
         
         Raises:
             ValueError: If move is invalid
+            GameConflictError: If another move was stored since the game was loaded
         """
         # Validate move
         error = MoveService.validate_move(game, position, player_id)
@@ -81,47 +106,260 @@ class MoveService:
             raise ValueError(error)
         
         current_player = game.current_player
+        next_player = game_service.get_next_player(current_player)
+        last_player = current_player
+        bot_position = None
         
-        # Make the move
-        new_board_state = game_service.make_move(
-            game.board_state,
-            position,
-            current_player
-        )
-        
-        # Check game status
-        status, winner = game_service.get_game_status(new_board_state)
+        if game.is_standard_board:
+            # Make the move on the bitboard, checking only the lines through it;
+            # the string form is only rebuilt for storage
+            board, status, winner = bitboard.apply_move(
+                bitboard.BoardState.from_board_state(game.board_state),
+                position - 1,
+                current_player
+            )
+            
+            # Play the computer's reply right away in games against the bot
+            if status == 'ongoing' and game.bot_level and next_player == 'O':
+                bot_index = solver.choose_move(
+                    board.x_bits,
+                    board.o_bits,
+                    next_player,
+                    level=game.bot_level,
+                    time_budget=BOT_MOVE_TIME_BUDGET
+                )
+                board, status, winner = bitboard.apply_move(board, bot_index, next_player)
+                bot_position = bot_index + 1
+                last_player = next_player
+                next_player = current_player
+            
+            new_board_state = bitboard.decode(board.x_bits, board.o_bits)
+        else:
+            # Larger m,n,k boards count runs through the placed cell only
+            board = mnk_engine.MNKBoard(
+                game.board_rows,
+                game.board_cols,
+                game.win_length,
+                game.board_state
+            )
+            status, winner = board.place(position, current_player)
+            
+            # Endgames covered by a tablebase are answered right away; other
+            # positions are searched in the bot pool after the move is stored
+            if status == 'ongoing' and game.bot_level and next_player == 'O':
+                table = tablebase.get_tablebase(game.board_rows, game.board_cols, game.win_length)
+                bot_position = table.best_move(board.to_board_state()) if table else None
+                if bot_position is not None:
+                    status, winner = board.place(bot_position, next_player)
+                    last_player = next_player
+                    next_player = current_player
+            
+            new_board_state = board.to_board_state()
         
-        # Get next player
-        next_player = game_service.get_next_player(current_player)
+        # Store the move(s) and the new game state in one transaction
+        new_moves = [(player_id, current_player, position)]
+        if bot_position is not None:
+            new_moves.append((game.player_o_id, last_player, bot_position))
+        try:
+            created = game_crud.record_moves(
+                db=db,
+                game=game,
+                moves=new_moves,
+                board_state=new_board_state,
+                current_player=next_player if status == 'ongoing' else last_player,
+                status=status,
+                winner=winner
+            )
+        except StaleDataError:
+            raise GameConflictError("Game was changed by another move, please reload it")
+        move = created[0]
+        bot_move = created[1] if bot_position is not None else None
+        updated_game = game
         
-        # Create move record
-        move = move_crud.create_move(
-            db=db,
-            game_id=game.id,
-            player_id=player_id,
-            player=current_player,
-            position=position
-        )
+        if status in ('won', 'draw') and game.is_standard_board:
+            # Reviewed in the background; queuing never blocks the request
+            review_service.enqueue(db, game.id)
+        elif status in ('won', 'draw') and game.bot_level:
+            # The bot's search tree for this game is no longer needed
+            bot_pool.forget(game.id)
         
-        # Update game
-        updated_game = game_crud.update_game_board(
-            db=db,
-            game_id=game.id,
-            board_state=new_board_state,
-            current_player=next_player if status == 'ongoing' else current_player,
-            status=status,
-            winner=winner
-        )
+        message = MoveService._get_status_message(status, winner)
+        if status == 'ongoing' and game.bot_level and next_player == 'O' and not game.is_standard_board:
+            # Larger boards are searched in the bot pool; the reply is stored when ready
+            MoveService.schedule_bot_move(db, updated_game)
+            message = "Move successful. Waiting for the computer's move."
         
         return {
             "move": move,
+            "bot_move": bot_move,
             "game": updated_game,
             "status": status,
             "winner": winner,
-            "message": MoveService._get_status_message(status, winner)
+            "message": message
         }
     
+    @staticmethod
+    def schedule_bot_move(db: Session, game: Game) -> None:
+        """
+        Search the computer's reply on a larger board without blocking the request.
+        
+        The move is searched with MCTS in the bot worker pool and applied
+        through a new session on the same database once it is ready. If the
+        search fails, a quick heuristic move is stored instead, so the game
+        never waits for a reply that will not come.
+        
+        Args:
+            db: Database session the game was loaded with
+            game: Game in which the computer (Player O) is to move
+        """
+        bind = db.get_bind()
+        game_id = game.id
+        board_state = game.board_state
+        rows, cols, win_length = game.board_rows, game.board_cols, game.win_length
+        
+        def _apply(position: int) -> None:
+            MoveService.apply_bot_move(bind, game_id, board_state, position)
+        
+        def _fallback(error: Exception) -> None:
+            position = MoveService.fallback_bot_position(rows, cols, win_length, board_state)
+            MoveService.apply_bot_move(bind, game_id, board_state, position)
+        
+        bot_pool.submit(
+            game_id,
+            rows,
+            cols,
+            win_length,
+            board_state,
+            'O',
+            BOT_MCTS_TIME_BUDGET * mcts.LEVEL_BUDGET_SCALE.get(game.bot_level, 1.0),
+            _apply,
+            on_error=_fallback
+        )
+    
+    @staticmethod
+    def needs_bot_move(game: Game) -> bool:
+        """Return whether a larger-board game waits for the computer's reply."""
+        return (
+            game.status == 'ongoing'
+            and game.bot_level is not None
+            and game.current_player == 'O'
+            and not game.is_standard_board
+        )
+    
+    @staticmethod
+    def resume_bot_move(db: Session, game: Game) -> bool:
+        """
+        Schedule the computer's reply again if it was lost.
+        
+        A search can be lost when the server restarts while it is pending.
+        Called when a game is read, so a stuck game recovers the next time
+        the player looks at it.
+        
+        Returns:
+            True if a search was scheduled
+        """
+        if not MoveService.needs_bot_move(game) or bot_pool.is_pending(game.id):
+            return False
+        MoveService.schedule_bot_move(db, game)
+        return True
+    
+    @staticmethod
+    def resume_pending_bot_moves(db: Session) -> int:
+        """
+        Schedule the computer's reply in every larger-board game waiting for it.
+        
+        Called at startup, since searches pending before a restart are gone.
+        
+        Returns:
+            Number of searches scheduled
+        """
+        games = db.execute(
+            select(Game).where(
+                Game.status == 'ongoing',
+                Game.bot_level.is_not(None),
+                Game.current_player == 'O'
+            )
+        ).scalars().all()
+        return sum(MoveService.resume_bot_move(db, game) for game in games)
+    
+    @staticmethod
+    def fallback_bot_position(rows: int, cols: int, win_length: int, board_state: str) -> int:
+        """
+        Pick a move without searching: win if possible, else block, else the
+        free cell nearest the centre.
+        
+        Returns:
+            Chosen position (1-based)
+        
+        Raises:
+            ValueError: If there is no legal move
+        """
+        board = mnk_engine.MNKBoard(rows, cols, win_length, board_state)
+        available = board.available_positions()
+        if not available:
+            raise ValueError("No moves available")
+        for player in ('O', 'X'):
+            for position in available:
+                trial = mnk_engine.MNKBoard(rows, cols, win_length, board_state)
+                if trial.place(position, player)[0] == 'won':
+                    return position
+        center_row, center_col = (rows - 1) / 2, (cols - 1) / 2
+        return min(
+            available,
+            key=lambda position: abs((position - 1) // cols - center_row) + abs((position - 1) % cols - center_col)
+        )
+    
+    @staticmethod
+    def apply_bot_move(
+        bind: Engine,
+        game_id: UUID,
+        board_state: str,
+        position: int
+    ) -> Optional[Move]:
+        """
+        Store a searched computer move on a larger board.
+        
+        The move is dropped if the game changed since the search started.
+        
+        Args:
+            bind: Engine of the database the game lives in
+            game_id: UUID of the game
+            board_state: Board the move was searched for
+            position: Chosen position (1-based)
+        
+        Returns:
+            The created move, or None if the game moved on
+        """
+        db = SessionLocal(bind=bind)
+        try:
+            game = game_crud.get_game_by_id(db, game_id)
+            if (
+                not game
+                or game.status != 'ongoing'
+                or game.current_player != 'O'
+                or game.board_state != board_state
+            ):
+                return None
+            
+            board = mnk_engine.MNKBoard(game.board_rows, game.board_cols, game.win_length, board_state)
+            status, winner = board.place(position, 'O')
+            move = game_crud.record_moves(
+                db=db,
+                game=game,
+                moves=[(game.player_o_id, 'O', position)],
+                board_state=board.to_board_state(),
+                current_player='X' if status == 'ongoing' else 'O',
+                status=status,
+                winner=winner
+            )[0]
+            if status != 'ongoing':
+                bot_pool.forget(game_id)
+            return move
+        except StaleDataError:
+            return None
+        finally:
+            db.close()
+    
     @staticmethod
     def _get_status_message(status: str, winner: Optional[str]) -> str:
         """Get a human-readable status message."""
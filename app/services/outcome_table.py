@@ -0,0 +1,221 @@
+"""
+Precomputed outcome table for every reachable 3x3 position.
+
+Each board is addressed by its base-3 index (cell i contributes 3**i for X
+and 2 * 3**i for O), computed from the bitboards with two table lookups.
+For each of the 3**9 indices the table stores one fixed-size record:
+
+    byte 0  flags: reachable bit, status code, winner code
+    byte 1  game-theoretic value for X under perfect play (+1, 0, -1)
+    byte 2  plies to the end of the game under perfect play
+    byte 3  reserved
+    byte 4-5  legal-move mask (little endian)
+    byte 6-7  best-move mask for the side to move (little endian)
+
+Only the 5,478 positions reachable from the empty board are marked as such.
+Lookups for other boards fall back to the plain bitboard functions.
+
+The table is built once at import. If OUTCOME_TABLE_PATH points to a file
+written by write_table(), that file is memory-mapped read-only instead, so
+every uvicorn worker process shares the same physical pages.
+"""
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from app.config import env_str
+from app.services import bitboard
+
+MAGIC = b"TTTO"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<BbBBHH")
+RECORD_SIZE = RECORD.size
+POSITION_COUNT = 3 ** bitboard.CELL_COUNT
+
+REACHABLE = 0x80
+_STATUS_CODES = {'ongoing': 0, 'won': 1, 'draw': 2}
+_WINNER_CODES = {None: 0, 'X': 1, 'O': 2}
+
+# Ternary weight of every 9-bit mask, per player.
+TERNARY_X: Tuple[int, ...] = tuple(
+    sum(3 ** i for i in range(bitboard.CELL_COUNT) if bits >> i & 1)
+    for bits in range(bitboard.FULL_MASK + 1)
+)
+TERNARY_O: Tuple[int, ...] = tuple(2 * weight for weight in TERNARY_X)
+
+# Decoded (status, winner) for every flags byte, None if not reachable.
+_STATUS_NAMES = {code: name for name, code in _STATUS_CODES.items()}
+_WINNER_NAMES = {code: name for name, code in _WINNER_CODES.items()}
+_STATUS_BY_FLAGS: Tuple[Optional[Tuple[str, Optional[str]]], ...] = tuple(
+    (_STATUS_NAMES[flags & 0x3], _WINNER_NAMES[flags >> 2 & 0x3])
+    if flags & REACHABLE and flags & 0x3 in _STATUS_NAMES and flags >> 2 & 0x3 in _WINNER_NAMES
+    else None
+    for flags in range(256)
+)
+
+
+class Outcome(NamedTuple):
+    """Decoded outcome table record."""
+    status: str
+    winner: Optional[str]
+    value: int
+    plies_to_end: int
+    legal_mask: int
+    best_mask: int
+
+
+def index_of(x_bits: int, o_bits: int) -> int:
+    """Return the base-3 index of a position."""
+    return TERNARY_X[x_bits] + TERNARY_O[o_bits]
+
+
+def _solve(
+    x_bits: int,
+    o_bits: int,
+    records: Dict[int, Tuple[int, int, int, int, int]]
+) -> Tuple[int, int]:
+    """
+    Depth-first walk from a position, filling records for every reachable child.
+
+    Returns:
+        Tuple of (value for X, plies to end) under perfect play
+    """
+    index = index_of(x_bits, o_bits)
+    cached = records.get(index)
+    if cached is not None:
+        return cached[1], cached[2]
+
+    status, winner = bitboard.status(x_bits, o_bits)
+    flags = REACHABLE | _STATUS_CODES[status] | _WINNER_CODES[winner] << 2
+    if status != 'ongoing':
+        value = 0 if winner is None else (1 if winner == 'X' else -1)
+        records[index] = (flags, value, 0, 0, 0)
+        return value, 0
+
+    legal = bitboard.empty_mask(x_bits, o_bits)
+    x_to_move = bin(x_bits).count('1') == bin(o_bits).count('1')
+    sign = 1 if x_to_move else -1
+    player = 'X' if x_to_move else 'O'
+
+    children = {}
+    for cell in range(bitboard.CELL_COUNT):
+        if legal >> cell & 1:
+            children[cell] = _solve(*bitboard.place(x_bits, o_bits, cell, player), records)
+
+    # Prefer the best value for the mover, then the fastest win / slowest loss.
+    def rank(result: Tuple[int, int]) -> Tuple[int, int]:
+        value, plies = result
+        mover_value = value * sign
+        return mover_value, -plies if mover_value > 0 else plies
+
+    best_rank = max(rank(result) for result in children.values())
+    best = 0
+    for cell, result in children.items():
+        if rank(result) == best_rank:
+            best |= 1 << cell
+    best_value = best_rank[0] * sign
+    plies = 1 + min(children[cell][1] for cell in children if best >> cell & 1)
+
+    records[index] = (flags, best_value, plies, legal, best)
+    return best_value, plies
+
+
+def build_table() -> bytes:
+    """
+    Enumerate every reachable position and pack the outcome table.
+
+    Returns:
+        Immutable table of POSITION_COUNT records
+    """
+    records: Dict[int, Tuple[int, int, int, int, int]] = {}
+    _solve(0, 0, records)
+
+    buffer = bytearray(POSITION_COUNT * RECORD_SIZE)
+    for index, (flags, value, plies, legal, best) in records.items():
+        RECORD.pack_into(buffer, index * RECORD_SIZE, flags, value, plies, 0, legal, best)
+    return bytes(buffer)
+
+
+def write_table(path: Union[str, Path]) -> None:
+    """Write a freshly built table, with header, to a binary file."""
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, POSITION_COUNT))
+        handle.write(build_table())
+
+
+def load_table(path: Optional[Union[str, Path]] = None) -> Union[bytes, memoryview]:
+    """
+    Load the outcome table.
+
+    Args:
+        path: Optional table file written by write_table(). It is
+            memory-mapped read-only so its pages are shared across processes.
+
+    Returns:
+        Read-only buffer of POSITION_COUNT records
+
+    Raises:
+        ValueError: If the file is not a compatible outcome table
+    """
+    if not path:
+        return build_table()
+
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, record_size, count = HEADER.unpack_from(mapped, 0)
+    expected_size = HEADER.size + count * record_size
+    if (magic, version, record_size, count) != (MAGIC, FORMAT_VERSION, RECORD_SIZE, POSITION_COUNT) \
+            or len(mapped) != expected_size:
+        mapped.close()
+        raise ValueError(f"{path} is not a compatible outcome table")
+    return memoryview(mapped)[HEADER.size:]
+
+
+TABLE = load_table(env_str("OUTCOME_TABLE_PATH", ""))
+
+
+def lookup(x_bits: int, o_bits: int) -> Optional[Outcome]:
+    """
+    Return the full outcome record for a position, or None if unreachable.
+    """
+    offset = index_of(x_bits, o_bits) * RECORD_SIZE
+    flags, value, plies, _, legal, best = RECORD.unpack_from(TABLE, offset)
+    decoded = _STATUS_BY_FLAGS[flags]
+    if decoded is None:
+        return None
+    return Outcome(decoded[0], decoded[1], value, plies, legal, best)
+
+
+def status(x_bits: int, o_bits: int) -> Tuple[str, Optional[str]]:
+    """
+    Determine (status, winner) with a single table lookup.
+
+    Falls back to bitboard.status() for unreachable positions.
+    """
+    decoded = _STATUS_BY_FLAGS[TABLE[index_of(x_bits, o_bits) * RECORD_SIZE]]
+    if decoded is None:
+        return bitboard.status(x_bits, o_bits)
+    return decoded
+
+
+def legal_mask(x_bits: int, o_bits: int) -> int:
+    """
+    Return the legal-move mask (empty when the game is over).
+
+    Falls back to the empty-cell mask for unreachable positions.
+    """
+    outcome = lookup(x_bits, o_bits)
+    if outcome is None:
+        return bitboard.empty_mask(x_bits, o_bits)
+    return outcome.legal_mask
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "outcome_table.bin"
+    write_table(target)
+    print(f"Outcome table written to {target}")
@@ -0,0 +1,177 @@
+"""
+Background purge of completed games.
+Runs game_crud.delete_completed_games on a worker thread so the request
+that starts it does not wait for the delete, and keeps its progress.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+
+from app.crud import game_crud
+from app.config import env_int
+
+
+# Games deleted per transaction and the pause between two transactions
+PURGE_BATCH_SIZE = env_int("PURGE_BATCH_SIZE", 1_000)
+PURGE_PAUSE_MS = env_int("PURGE_PAUSE_MS", 100)
+
+# Arbitrary key of the PostgreSQL advisory lock held by the process that purges
+PURGE_LOCK_KEY = 0x7474_7067
+
+
+class PurgeService:
+    """
+    Service class for purging completed games in the background.
+
+    Only one purge runs at a time. On PostgreSQL the purge holds the advisory
+    lock PURGE_LOCK_KEY, so a purge started by another app process is
+    refused too and shows as running in status(). The progress (deleted,
+    started_at, finished_at and error) is only kept by the process that
+    runs the purge; other processes report running with no progress.
+    """
+
+    def __init__(self, batch_size: int, pause_ms: int):
+        self.batch_size = batch_size
+        self.pause_ms = pause_ms
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict[str, Any] = {
+            "running": False,
+            "deleted": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+    def status(self, db: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Return a copy of the progress of the current or last purge.
+
+        Args:
+            db: Database session used to check for a purge running in
+                another process (PostgreSQL only)
+        """
+        with self._lock:
+            status = dict(self._status)
+        if not status["running"] and db is not None and db.get_bind().dialect.name == "postgresql":
+            # Single-key advisory locks are listed with the key split into classid and objid
+            held = db.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND granted "
+                "AND database = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+                "AND classid::bigint = :classid AND objid::bigint = :objid AND objsubid = 1)"
+            ), {"classid": PURGE_LOCK_KEY >> 32, "objid": PURGE_LOCK_KEY & 0xFFFF_FFFF}).scalar()
+            db.rollback()
+            if held:
+                status = {"running": True, "deleted": 0, "started_at": None, "finished_at": None, "error": None}
+        return status
+
+    def start(self, db: Session, older_than: Optional[timedelta] = None) -> bool:
+        """
+        Start a purge in the background without blocking.
+
+        Args:
+            db: Database session whose database is purged
+            older_than: Only delete games last updated at least this long ago
+
+        Returns:
+            True if started, False if a purge is already running here or,
+            on PostgreSQL, in another process
+        """
+        bind = db.get_bind()
+        with self._lock:
+            if self._status["running"]:
+                return False
+            lock = None
+            if bind.dialect.name == "postgresql":
+                lock = self._take_purge_lock(bind)
+                if lock is None:
+                    return False
+            self._status = {
+                "running": True,
+                "deleted": 0,
+                "started_at": datetime.now(timezone.utc),
+                "finished_at": None,
+                "error": None
+            }
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(bind, older_than, lock),
+                name="game-purge",
+                daemon=True
+            )
+            self._thread.start()
+        return True
+
+    @staticmethod
+    def _take_purge_lock(bind: Engine) -> Optional[Connection]:
+        """
+        Try to take the PostgreSQL advisory lock PURGE_LOCK_KEY.
+
+        Returns the connection holding the lock, or None if another process
+        holds it.
+        """
+        conn = bind.connect()
+        try:
+            locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": PURGE_LOCK_KEY}).scalar()
+            conn.commit()
+        except Exception:
+            conn.invalidate()
+            conn.close()
+            raise
+        if not locked:
+            conn.close()
+            return None
+        return conn
+
+    @staticmethod
+    def _release_purge_lock(conn: Connection) -> None:
+        """Release the purge lock before the connection goes back to the pool."""
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PURGE_LOCK_KEY})
+            conn.commit()
+        except Exception:
+            # Closing the broken connection ends its session and the lock with it
+            conn.invalidate()
+        finally:
+            conn.close()
+
+    def _run(self, bind: Any, older_than: Optional[timedelta], lock: Optional[Connection] = None) -> None:
+        """Worker: purge in batches and record the progress after each one."""
+        db = Session(bind=bind, autoflush=False)
+        error = None
+        try:
+            game_crud.delete_completed_games(
+                db,
+                older_than=older_than,
+                batch_size=self.batch_size,
+                pause=self.pause_ms / 1000,
+                progress=self._report
+            )
+        except Exception as e:
+            db.rollback()
+            error = str(e)
+            print(f"Purge of completed games failed: {e}")
+        finally:
+            db.close()
+            if lock is not None:
+                self._release_purge_lock(lock)
+        with self._lock:
+            self._status.update(running=False, finished_at=datetime.now(timezone.utc), error=error)
+
+    def _report(self, deleted: int) -> None:
+        """Progress callback of delete_completed_games."""
+        with self._lock:
+            self._status["deleted"] = deleted
+
+    def wait_idle(self, timeout: Optional[float] = None) -> None:
+        """Block until the running purge (if any) has finished."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+# Create singleton instance
+purge_service = PurgeService(PURGE_BATCH_SIZE, PURGE_PAUSE_MS)
@@ -0,0 +1,354 @@
+"""
+Business logic service for post-game reviews.
+Replays finished 3x3 games against the solver in the background and
+stores per-move accuracy and blunder flags.
+"""
+import queue
+import threading
+from collections import defaultdict
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from app.model.game import Game, decode_history
+from app.crud import review_crud
+from app.services import bitboard, solver
+from app.config import env_int
+
+
+# Finished games waiting for review; further games are dropped when full
+# and picked up by the next sweep
+REVIEW_QUEUE_SIZE = env_int("REVIEW_QUEUE_SIZE", 10_000)
+
+# Seconds between sweeps for finished games without reviews (0: only at startup)
+REVIEW_SWEEP_SECONDS = env_int("REVIEW_SWEEP_SECONDS", 600)
+
+# Arbitrary key of the PostgreSQL advisory lock held by the one process that sweeps
+SWEEP_LOCK_KEY = 0x7474_7276
+
+# Background review threads and the number of games reviewed per transaction
+REVIEW_WORKERS = env_int("REVIEW_WORKERS", 1)
+REVIEW_BATCH_SIZE = env_int("REVIEW_BATCH_SIZE", 100)
+
+
+def _result(score: int) -> str:
+    """Map a solver score to the mover's result."""
+    if score > 0:
+        return 'win'
+    if score < 0:
+        return 'loss'
+    return 'draw'
+
+
+class ReviewService:
+    """
+    Service class for post-game reviews.
+
+    Games are queued with enqueue() when they finish. Worker threads started
+    with start() take them off the bounded queue in batches, so the request
+    that finished the game only pays for a non-blocking put. Games dropped
+    because the queue was full, or still queued when the server stopped, are
+    found again by sweep(), which start() runs at startup and then every
+    REVIEW_SWEEP_SECONDS in one app process at a time. A unique index on
+    (game_id, ply) keeps a game reviewed by two processes from being
+    stored twice.
+    """
+
+    def __init__(self, workers: int, queue_size: int, batch_size: int, sweep_seconds: int = 0):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.sweep_seconds = sweep_seconds
+        self._queue: "queue.Queue[Optional[Tuple[Any, UUID]]]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._sweeper: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Games queued or being reviewed, so a sweep does not queue them twice
+        self._pending: Set[UUID] = set()
+        self._stopping = threading.Event()
+
+    @staticmethod
+    def review_moves(moves: Sequence[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Compare every move of a 3x3 game with perfect play.
+
+        Args:
+            moves: (player, position) pairs in play order
+
+        Returns:
+            One dictionary per move with ply, player, position, played_result,
+            best_result, best_position, accuracy and is_blunder. Accuracy is
+            1.0 for a best move and 0.0 for the worst legal move; a blunder
+            is a move that gives away a better result.
+        """
+        x_bits = o_bits = 0
+        reviews = []
+        for ply, (player, position) in enumerate(moves, start=1):
+            scores = dict(solver.score_moves(x_bits, o_bits, player))
+            played = scores[position - 1]
+            best = max(scores.values())
+            worst = min(scores.values())
+            reviews.append({
+                "ply": ply,
+                "player": player,
+                "position": position,
+                "played_result": _result(played),
+                "best_result": _result(best),
+                "best_position": min(index for index, score in scores.items() if score == best) + 1,
+                "accuracy": 1.0 if best == worst else (played - worst) / (best - worst),
+                "is_blunder": _result(played) != _result(best),
+            })
+            x_bits, o_bits = bitboard.place(x_bits, o_bits, position - 1, player)
+        return reviews
+
+    @staticmethod
+    def review_games(db: Session, game_ids: Sequence[UUID]) -> int:
+        """
+        Review a batch of finished games in one transaction.
+
+        Games that are unfinished, not 3x3 or already reviewed are skipped.
+
+        Args:
+            db: Database session
+            game_ids: UUIDs of the games to review
+
+        Returns:
+            Number of games reviewed
+        """
+        reviewed = review_crud.get_reviewed_game_ids(db, game_ids)
+        pending = [game_id for game_id in dict.fromkeys(game_ids) if game_id not in reviewed]
+        if not pending:
+            return 0
+
+        # Moves come from move_history, which outlives move partitions dropped by retention
+        games = db.query(Game.id, Game.move_history).filter(
+            Game.id.in_(pending),
+            Game.status.in_(("won", "draw")),
+            Game.board_rows == 3,
+            Game.board_cols == 3,
+            Game.win_length == 3
+        ).all()
+        if not games:
+            return 0
+
+        rows = []
+        for game in games:
+            positions = decode_history(game.move_history or b"", 9)
+            moves = [('X' if ply % 2 else 'O', position) for ply, position in enumerate(positions, start=1)]
+            for review in ReviewService.review_moves(moves):
+                review["game_id"] = game.id
+                rows.append(review)
+        review_crud.create_reviews(db, rows)
+        return len(games)
+
+    def enqueue(self, db: Session, game_id: UUID) -> bool:
+        """
+        Queue a finished game for review without blocking.
+
+        Args:
+            db: Database session the game was stored with
+            game_id: UUID of the finished game
+
+        Returns:
+            True if queued (or already queued), False if the queue is full
+        """
+        with self._lock:
+            if game_id in self._pending:
+                return True
+            self._pending.add(game_id)
+        try:
+            self._queue.put_nowait((db.get_bind(), game_id))
+        except queue.Full:
+            with self._lock:
+                self._pending.discard(game_id)
+            print(f"Review queue is full, game {game_id} is left for the next sweep")
+            return False
+        return True
+
+    def sweep(self, bind: Engine) -> int:
+        """
+        Queue every finished 3x3 game that has no reviews and is not queued yet.
+
+        Waits for room in the queue instead of dropping games, so it is meant
+        to run in a background thread.
+
+        Args:
+            bind: Engine of the database to sweep
+
+        Returns:
+            Number of games queued
+        """
+        queued = 0
+        after = None
+        db = Session(bind=bind, autoflush=False)
+        try:
+            while not self._stopping.is_set():
+                page = review_crud.get_unreviewed_games(db, after=after, limit=self.batch_size)
+                db.rollback()
+                if not page:
+                    break
+                for _, game_id in page:
+                    with self._lock:
+                        if game_id in self._pending:
+                            continue
+                        self._pending.add(game_id)
+                    if not self._put_until_stopped((bind, game_id)):
+                        with self._lock:
+                            self._pending.discard(game_id)
+                        return queued
+                    queued += 1
+                after = page[-1]
+        finally:
+            db.close()
+        return queued
+
+    def _put_until_stopped(self, item: Tuple[Any, UUID]) -> bool:
+        """Wait for room in the queue; return False if the service stops first."""
+        while not self._stopping.is_set():
+            try:
+                self._queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def start(self, bind: Optional[Engine] = None) -> None:
+        """
+        Start the background review threads (once).
+
+        Args:
+            bind: Engine to sweep for unreviewed games at startup and then
+                every sweep_seconds; None starts the workers only
+        """
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"game-review-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            if bind is not None:
+                self._sweeper = threading.Thread(target=self._sweep_loop, args=(bind,), name="game-review-sweep", daemon=True)
+                self._sweeper.start()
+
+    @staticmethod
+    def _take_sweep_lock(bind: Engine) -> Optional[Connection]:
+        """
+        Try to take the PostgreSQL advisory lock SWEEP_LOCK_KEY.
+
+        Returns the connection holding the lock, or None if another process
+        holds it.
+        """
+        conn = bind.connect()
+        try:
+            locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SWEEP_LOCK_KEY}).scalar()
+            conn.commit()
+        except Exception:
+            conn.invalidate()
+            conn.close()
+            raise
+        if not locked:
+            conn.close()
+            return None
+        return conn
+
+    @staticmethod
+    def _release_sweep_lock(conn: Connection) -> None:
+        """Release the sweep lock before the connection goes back to the pool."""
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SWEEP_LOCK_KEY})
+            conn.commit()
+        except Exception:
+            # Closing the broken connection ends its session and the lock with it
+            conn.invalidate()
+        finally:
+            conn.close()
+
+    def _sweep_loop(self, bind: Engine) -> None:
+        """
+        Sweeper loop: sweep now, then every sweep_seconds until stopped.
+
+        With several app processes on one PostgreSQL database only the one
+        holding the sweep lock sweeps; the others retry at every interval
+        and take over if that process goes away.
+        """
+        shared = bind.dialect.name == "postgresql"
+        lock: Optional[Connection] = None
+        try:
+            while True:
+                try:
+                    if shared and lock is None:
+                        lock = self._take_sweep_lock(bind)
+                    if lock is not None or not shared:
+                        queued = self.sweep(bind)
+                        if queued:
+                            print(f"Queued {queued} unreviewed game(s) for review")
+                except Exception as e:
+                    print(f"Review sweep failed: {e}")
+                    if lock is not None:
+                        # The lock connection may be broken; take the lock again next time
+                        self._release_sweep_lock(lock)
+                        lock = None
+                if self.sweep_seconds <= 0 or self._stopping.wait(self.sweep_seconds):
+                    return
+        finally:
+            if lock is not None:
+                self._release_sweep_lock(lock)
+
+    def _run(self) -> None:
+        """Worker loop: review queued games in batches until stopped."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # A stop marker always ends the batch, so each thread takes exactly one
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            by_bind: Dict[Any, List[UUID]] = defaultdict(list)
+            for item in batch:
+                if item is None:
+                    stopping = True
+                else:
+                    by_bind[item[0]].append(item[1])
+
+            for bind, game_ids in by_bind.items():
+                db = Session(bind=bind, autoflush=False)
+                try:
+                    ReviewService.review_games(db, game_ids)
+                except Exception as e:
+                    db.rollback()
+                    print(f"Review of {len(game_ids)} game(s) failed: {e}")
+                finally:
+                    db.close()
+            with self._lock:
+                for item in batch:
+                    if item is not None:
+                        self._pending.discard(item[1])
+            for _ in batch:
+                self._queue.task_done()
+
+    def wait_idle(self) -> None:
+        """Block until every queued game has been processed."""
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        """Stop the sweep and the review threads after the games queued so far."""
+        self._stopping.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+            sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None:
+            sweeper.join(timeout=10)
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=10)
+
+
+# Create singleton instance
+review_service = ReviewService(REVIEW_WORKERS, REVIEW_QUEUE_SIZE, REVIEW_BATCH_SIZE, REVIEW_SWEEP_SECONDS)
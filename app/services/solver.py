@@ -0,0 +1,199 @@
+"""
+Negamax solver for the computer opponent.
+
+Searches the bitboard representation with alpha-beta pruning. Exact results
+are stored in a process-wide transposition table keyed by the canonical
+(symmetry-reduced) position, so repeated positions across all bot games are
+only searched once per worker process.
+"""
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+from app.services import bitboard, symmetry
+
+# Strength levels map to a search depth in plies.
+LEVELS: Dict[str, int] = {
+    'easy': 1,
+    'medium': 2,
+    'hard': bitboard.CELL_COUNT,
+}
+DEFAULT_LEVEL = 'hard'
+
+# Transposition table flags
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Process-wide transposition table: canonical key -> (score, flag)
+_TRANSPOSITIONS: Dict[int, Tuple[int, int]] = {}
+
+# Process-wide memo of completed root searches on canonical positions:
+# (me, opp, depth) -> scores
+_ROOT_SCORES: Dict[Tuple[int, int, int], Tuple[Tuple[int, int], ...]] = {}
+
+
+class SearchTimeout(Exception):
+    """Raised internally when the per-move time budget is exhausted."""
+
+
+def _negamax(
+    me: int,
+    opp: int,
+    depth: int,
+    alpha: int,
+    beta: int,
+    deadline: Optional[float]
+) -> int:
+    """
+    Score a position for the side to move.
+
+    A win scores 1 + the number of empty cells left when it happens, so faster
+    wins and slower losses are preferred. Unresolved leaves score 0.
+    """
+    if bitboard.LINE_TABLE[opp]:
+        return -(1 + bitboard.empty_mask(me, opp).bit_count())
+    empty = bitboard.empty_mask(me, opp)
+    if not empty:
+        return 0
+    if depth == 0:
+        return 0
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+
+    # Only full-depth results are exact, so only those go into the table.
+    exhaustive = depth >= empty.bit_count()
+    key = symmetry.canonical_key(me, opp) if exhaustive else None
+    if key is not None:
+        cached = _TRANSPOSITIONS.get(key)
+        if cached is not None:
+            score, flag = cached
+            if flag == EXACT:
+                return score
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+    original_alpha = alpha
+    best = -bitboard.CELL_COUNT - 1
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        score = -_negamax(opp, me | bit, depth - 1, -beta, -alpha, deadline)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    if key is not None:
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        _TRANSPOSITIONS[key] = (best, flag)
+    return best
+
+
+def _search_root(
+    me: int,
+    opp: int,
+    depth: int,
+    deadline: Optional[float]
+) -> Tuple[Tuple[int, int], ...]:
+    """Score every legal move of the side to move at the given depth."""
+    window = bitboard.CELL_COUNT + 1
+    scores = []
+    empty = bitboard.empty_mask(me, opp)
+    for index in range(bitboard.CELL_COUNT):
+        if empty >> index & 1:
+            score = -_negamax(opp, me | 1 << index, depth - 1, -window, window, deadline)
+            scores.append((index, score))
+    return tuple(scores)
+
+
+def score_moves(
+    x_bits: int,
+    o_bits: int,
+    player: str,
+    depth: int = bitboard.CELL_COUNT,
+    time_budget: Optional[float] = None
+) -> Tuple[Tuple[int, int], ...]:
+    """
+    Score every legal move for the player to move.
+
+    With a time budget the search deepens one ply at a time and returns the
+    scores of the deepest completed iteration. Completed searches are
+    memoized process-wide.
+
+    Args:
+        x_bits: Bit mask of X marks
+        o_bits: Bit mask of O marks
+        player: Player to move ('X' or 'O')
+        depth: Maximum search depth in plies
+        time_budget: Optional wall-clock budget in seconds
+
+    Returns:
+        Tuple of (cell index, score) pairs; positive scores win for player
+    """
+    me, opp = (x_bits, o_bits) if player == 'X' else (o_bits, x_bits)
+    me, opp, transform = symmetry.canonicalize_bits(me, opp)
+    depth = max(1, min(depth, bitboard.empty_mask(me, opp).bit_count()))
+    key = (me, opp, depth)
+    scores = _ROOT_SCORES.get(key)
+
+    if scores is None and time_budget is None:
+        scores = _ROOT_SCORES[key] = _search_root(me, opp, depth, None)
+    elif scores is None:
+        deadline = time.perf_counter() + time_budget
+        scores = _search_root(me, opp, 1, None)
+        for current in range(2, depth + 1):
+            try:
+                scores = _search_root(me, opp, current, deadline)
+            except SearchTimeout:
+                break
+        else:
+            _ROOT_SCORES[key] = scores
+
+    # Map cells from the canonical board back to the caller's board
+    inverse = symmetry.PERMUTATIONS[transform]
+    return tuple(sorted((inverse[index], score) for index, score in scores))
+
+
+def choose_move(
+    x_bits: int,
+    o_bits: int,
+    player: str,
+    level: str = DEFAULT_LEVEL,
+    time_budget: Optional[float] = None
+) -> int:
+    """
+    Pick a move for the computer opponent.
+
+    Args:
+        x_bits: Bit mask of X marks
+        o_bits: Bit mask of O marks
+        player: Player to move ('X' or 'O')
+        level: Strength level ('easy', 'medium', or 'hard')
+        time_budget: Optional wall-clock budget in seconds
+
+    Returns:
+        Cell index (0-8) of the chosen move
+
+    Raises:
+        ValueError: If the level is unknown or no move is available
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown bot level: {level}")
+    if not bitboard.empty_mask(x_bits, o_bits):
+        raise ValueError("No legal moves available")
+
+    scores = score_moves(x_bits, o_bits, player, LEVELS[level], time_budget)
+    best = max(score for _, score in scores)
+    return random.choice([index for index, score in scores if score == best])
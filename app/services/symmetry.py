@@ -0,0 +1,127 @@
+"""
+Symmetry canonicalization for 3x3 board states.
+
+The square has 8 symmetries (4 rotations, each optionally mirrored). Every
+board_state is mapped to a canonical representative of its symmetry class,
+together with the transform that produced it, so positions and moves can be
+converted back and forth. Caches, solver tables and analytics key on the
+canonical form, which shrinks the position space about 8x.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from app.services import bitboard
+
+# Cell permutations, one per transform: new cell i takes old cell PERMUTATIONS[t][i].
+PERMUTATIONS: Tuple[Tuple[int, ...], ...] = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # identity
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # rotate 90 clockwise
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # rotate 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # rotate 270 clockwise
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # mirror left-right
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # mirror top-bottom
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # mirror main diagonal
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # mirror anti-diagonal
+)
+IDENTITY = 0
+
+# CELL_MAP[t][old cell] is the cell it moves to under transform t.
+CELL_MAP: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(permutation.index(old) for old in range(bitboard.CELL_COUNT))
+    for permutation in PERMUTATIONS
+)
+
+# INVERSE[t] is the transform that undoes transform t.
+INVERSE: Tuple[int, ...] = tuple(
+    PERMUTATIONS.index(CELL_MAP[t]) for t in range(len(PERMUTATIONS))
+)
+
+# BIT_TABLES[t][bits] is the 9-bit mask after applying transform t.
+BIT_TABLES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(
+        sum(1 << new for new, old in enumerate(permutation) if bits >> old & 1)
+        for bits in range(bitboard.FULL_MASK + 1)
+    )
+    for permutation in PERMUTATIONS
+)
+
+
+def transform_bits(x_bits: int, o_bits: int, transform: int) -> Tuple[int, int]:
+    """Apply a transform to a bitboard position."""
+    table = BIT_TABLES[transform]
+    return table[x_bits], table[o_bits]
+
+
+def transform_board(board_state: str, transform: int) -> str:
+    """Apply a transform to a 9-character board_state string."""
+    return ''.join(board_state[old] for old in PERMUTATIONS[transform])
+
+
+def canonical_key(x_bits: int, o_bits: int) -> int:
+    """Return the packed key of the canonical form of a bitboard position."""
+    return min(table[x_bits] << bitboard.CELL_COUNT | table[o_bits] for table in BIT_TABLES)
+
+
+def canonicalize_bits(x_bits: int, o_bits: int) -> Tuple[int, int, int]:
+    """
+    Map a bitboard position to its canonical form.
+
+    The canonical form is the one with the smallest packed (x_bits, o_bits)
+    key; ties are broken by the lowest transform number.
+
+    Returns:
+        Tuple of (canonical x_bits, canonical o_bits, transform used)
+    """
+    best_key = -1
+    best_transform = IDENTITY
+    for transform, table in enumerate(BIT_TABLES):
+        key = table[x_bits] << bitboard.CELL_COUNT | table[o_bits]
+        if best_key < 0 or key < best_key:
+            best_key = key
+            best_transform = transform
+    return best_key >> bitboard.CELL_COUNT, best_key & bitboard.FULL_MASK, best_transform
+
+
+def canonicalize(board_state: str) -> Tuple[str, int]:
+    """
+    Map a board_state to its canonical form.
+
+    Args:
+        board_state: 9-character string representing the board
+
+    Returns:
+        Tuple of (canonical board_state, transform used), where
+        transform_board(board_state, transform) == canonical board_state
+    """
+    x_bits, o_bits, transform = canonicalize_bits(*bitboard.encode(board_state))
+    return bitboard.decode(x_bits, o_bits), transform
+
+
+def canonicalize_many(board_states: Iterable[str]) -> List[Tuple[str, int]]:
+    """
+    Canonicalize many boards at once.
+    Duplicate boards in the batch are only canonicalized once.
+
+    Args:
+        board_states: Iterable of 9-character board strings
+
+    Returns:
+        List of (canonical board_state, transform) in input order
+    """
+    seen: Dict[str, Tuple[str, int]] = {}
+    results = []
+    for board_state in board_states:
+        result = seen.get(board_state)
+        if result is None:
+            result = seen[board_state] = canonicalize(board_state)
+        results.append(result)
+    return results
+
+
+def map_position(position: int, transform: int) -> int:
+    """Map a position (1-9) on the original board to the transformed board."""
+    return CELL_MAP[transform][position - 1] + 1
+
+
+def unmap_position(position: int, transform: int) -> int:
+    """Map a position (1-9) on the transformed board back to the original board."""
+    return PERMUTATIONS[transform][position - 1] + 1
@@ -0,0 +1,351 @@
+"""
+Endgame tablebases for m,n,k board variants beyond 3x3.
+
+A tablebase stores the perfect-play value of every non-terminal position
+of one board shape that has at most `max_empties` empty cells. It is
+generated offline across a process pool and written as a compact, indexed
+binary file:
+
+    header  magic, version, rows, cols, win_length, max_empties, count
+    keys    count x uint64, sorted ascending (x_bits << cells | o_bits)
+    values  count x int8, value for the side to move
+
+Values use the solver's convention: a win scores 1 + the number of empty
+cells left when it happens (negative for a loss), a draw scores 0. The side
+to move follows from the mark counts, since X always moves first.
+
+Files listed in TABLEBASE_PATHS are memory-mapped read-only at import, so
+lookups are a zero-copy binary search and every worker process shares the
+same pages. Boards need at most 32 cells for keys to fit into 64 bits.
+
+Usage:
+    python -m app.services.tablebase --rows 4 --cols 4 --win-length 4 \
+        --max-empties 8 --workers 8 --output tablebase_4x4x4.bin
+"""
+import argparse
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from app.config import env_list
+from app.services import bitboard
+
+MAGIC = b"TTTB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHBBBB6xQ")
+MAX_CELLS = 32
+
+_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=32)
+def lines_through(rows: int, cols: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return, for every cell, the bit masks of all winning lines through it."""
+    masks: List[List[int]] = [[] for _ in range(rows * cols)]
+    for row in range(rows):
+        for col in range(cols):
+            for row_step, col_step in _DIRECTIONS:
+                end_row = row + (win_length - 1) * row_step
+                end_col = col + (win_length - 1) * col_step
+                if not (0 <= end_row < rows and 0 <= end_col < cols):
+                    continue
+                cells = [(row + step * row_step) * cols + col + step * col_step for step in range(win_length)]
+                mask = sum(1 << cell for cell in cells)
+                for cell in cells:
+                    masks[cell].append(mask)
+    return tuple(tuple(cell_masks) for cell_masks in masks)
+
+
+def _has_line(bits: int, lines: Tuple[Tuple[int, ...], ...]) -> bool:
+    """Check whether a player's marks contain a complete line."""
+    return any(mask & bits == mask for cell_masks in lines for mask in cell_masks)
+
+
+def _negamax(
+    me: int,
+    opp: int,
+    empty: int,
+    cells: int,
+    lines: Tuple[Tuple[int, ...], ...],
+    memo: Dict[int, int]
+) -> int:
+    """
+    Exact value of a non-terminal position for the side to move.
+
+    Every move is searched, even after a win is found, so all successors of
+    a covered position are covered as well.
+    """
+    key = me << cells | opp
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+
+    empties = empty.bit_count()
+    best = -(empties + 1)
+    remaining = empty
+    while remaining:
+        bit = remaining & -remaining
+        remaining ^= bit
+        placed = me | bit
+        if any(mask & placed == mask for mask in lines[bit.bit_length() - 1]):
+            score = empties
+        elif empties == 1:
+            score = 0
+        else:
+            score = -_negamax(opp, placed, empty ^ bit, cells, lines, memo)
+        if score > best:
+            best = score
+
+    memo[key] = best
+    return best
+
+
+def _solve_chunk(
+    rows: int,
+    cols: int,
+    win_length: int,
+    filled_sets: List[Tuple[int, ...]]
+) -> Tuple[array, array]:
+    """
+    Solve every legal non-terminal position on the given sets of filled cells.
+
+    Runs in a worker process.
+
+    Returns:
+        Tuple of (sorted keys, values) for the positions and everything
+        reachable below them
+    """
+    cells = rows * cols
+    full = (1 << cells) - 1
+    lines = lines_through(rows, cols, win_length)
+    memo: Dict[int, int] = {}
+    for filled in filled_sets:
+        x_count = (len(filled) + 1) // 2
+        filled_mask = sum(1 << cell for cell in filled)
+        for x_cells in itertools.combinations(filled, x_count):
+            x_bits = sum(1 << cell for cell in x_cells)
+            o_bits = filled_mask ^ x_bits
+            if _has_line(x_bits, lines) or _has_line(o_bits, lines):
+                continue
+            me, opp = (o_bits, x_bits) if x_count > len(filled) - x_count else (x_bits, o_bits)
+            _negamax(me, opp, full ^ filled_mask, cells, lines, memo)
+
+    # Memo keys are (side to move, other side); file keys are (X, O)
+    entries = {}
+    for key, value in memo.items():
+        me, opp = key >> cells, key & full
+        if me.bit_count() != opp.bit_count():
+            key = opp << cells | me
+        entries[key] = value
+    keys = array("Q", sorted(entries))
+    return keys, array("b", (entries[key] for key in keys))
+
+
+def _filled_sets(cells: int, max_empties: int, chunk_size: int) -> Iterator[List[Tuple[int, ...]]]:
+    """Yield chunks of the filled-cell sets with exactly max_empties empty cells."""
+    combinations = itertools.combinations(range(cells), cells - max_empties)
+    while True:
+        chunk = list(itertools.islice(combinations, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate(
+    rows: int,
+    cols: int,
+    win_length: int,
+    max_empties: int,
+    workers: Optional[int] = None,
+    chunk_size: int = 256
+) -> Tuple[array, array]:
+    """
+    Solve all non-terminal positions with at most max_empties empty cells.
+
+    Args:
+        rows: Board rows
+        cols: Board columns
+        win_length: Marks in a row needed to win
+        max_empties: Largest number of empty cells covered
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Filled-cell sets per worker task
+
+    Returns:
+        Tuple of (sorted uint64 keys, int8 values)
+
+    Raises:
+        ValueError: If the board has more than 32 cells
+    """
+    cells = rows * cols
+    if cells > MAX_CELLS:
+        raise ValueError(f"Tablebases support at most {MAX_CELLS} cells")
+    max_empties = min(max_empties, cells)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_solve_chunk, rows, cols, win_length, chunk)
+            for chunk in _filled_sets(cells, max_empties, chunk_size)
+        ]
+        chunks = [future.result() for future in futures]
+
+    # Chunks overlap below the top level; merge the sorted runs and drop duplicates
+    keys = array("Q")
+    values = array("b")
+    runs = [zip(chunk_keys, chunk_values) for chunk_keys, chunk_values in chunks]
+    for key, value in heapq.merge(*runs, key=lambda item: item[0]):
+        if not keys or keys[-1] != key:
+            keys.append(key)
+            values.append(value)
+    return keys, values
+
+
+def write_tablebase(
+    path: Union[str, Path],
+    rows: int,
+    cols: int,
+    win_length: int,
+    max_empties: int,
+    keys: array,
+    values: array
+) -> None:
+    """Write generated keys and values, with header, to a binary file."""
+    if sys.byteorder != "little":
+        keys.byteswap()
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, rows, cols, win_length, max_empties, len(keys)))
+        keys.tofile(handle)
+        values.tofile(handle)
+
+
+class Tablebase:
+    """Memory-mapped tablebase for one board shape."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map a tablebase file read-only.
+
+        Raises:
+            ValueError: If the file is not a compatible tablebase
+        """
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, rows, cols, win_length, max_empties, count = HEADER.unpack_from(mapped, 0)
+        expected_size = HEADER.size + count * 9
+        if (magic, version) != (MAGIC, FORMAT_VERSION) or len(mapped) != expected_size \
+                or sys.byteorder != "little":
+            mapped.close()
+            raise ValueError(f"{path} is not a compatible tablebase")
+
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.max_empties = max_empties
+        self.cells = rows * cols
+        view = memoryview(mapped)
+        self.keys = view[HEADER.size:HEADER.size + count * 8].cast("Q")
+        self.values = view[HEADER.size + count * 8:].cast("b")
+        self.lines = lines_through(rows, cols, win_length)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def value(self, x_bits: int, o_bits: int) -> Optional[int]:
+        """Return the value for the side to move, or None if the position is not covered."""
+        key = x_bits << self.cells | o_bits
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.values[index]
+        return None
+
+    def score_moves(self, board_state: str) -> Optional[List[Tuple[int, int]]]:
+        """
+        Score every legal move of a position for the side to move.
+
+        Args:
+            board_state: board_state string of this board shape
+
+        Returns:
+            List of (position, score) pairs, or None if the position or one
+            of its successors is not covered
+        """
+        if len(board_state) != self.cells:
+            return None
+        x_bits, o_bits = bitboard.encode(board_state)
+        empty = ~(x_bits | o_bits) & ((1 << self.cells) - 1)
+        empties = empty.bit_count()
+        if not empties or empties > self.max_empties:
+            return None
+
+        x_to_move = x_bits.bit_count() == o_bits.bit_count()
+        me = x_bits if x_to_move else o_bits
+        scores = []
+        for index in range(self.cells):
+            bit = 1 << index
+            if not empty & bit:
+                continue
+            placed = me | bit
+            if any(mask & placed == mask for mask in self.lines[index]):
+                scores.append((index + 1, empties))
+                continue
+            if empties == 1:
+                scores.append((index + 1, 0))
+                continue
+            child = self.value(placed, o_bits) if x_to_move else self.value(x_bits, placed)
+            if child is None:
+                return None
+            scores.append((index + 1, -child))
+        return scores
+
+    def best_move(self, board_state: str) -> Optional[int]:
+        """Return the best position (1-based) for the side to move, or None if not covered."""
+        scores = self.score_moves(board_state)
+        if not scores:
+            return None
+        return max(scores, key=lambda item: item[1])[0]
+
+
+def load_tablebases(paths: List[str]) -> Dict[Tuple[int, int, int], Tablebase]:
+    """Map every tablebase file, keyed by (rows, cols, win_length)."""
+    tables = {}
+    for path in paths:
+        table = Tablebase(path)
+        tables[(table.rows, table.cols, table.win_length)] = table
+    return tables
+
+
+TABLES = load_tablebases(env_list("TABLEBASE_PATHS", []))
+
+
+def get_tablebase(rows: int, cols: int, win_length: int) -> Optional[Tablebase]:
+    """Return the loaded tablebase for a board shape, if any."""
+    return TABLES.get((rows, cols, win_length))
+
+
+def main() -> None:
+    """Parse arguments, generate a tablebase and write it to disk."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, required=True, help="Board rows")
+    parser.add_argument("--cols", type=int, required=True, help="Board columns")
+    parser.add_argument("--win-length", type=int, required=True, help="Marks in a row needed to win")
+    parser.add_argument("--max-empties", type=int, default=8, help="Largest number of empty cells covered")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--output", required=True, help="Output file")
+    args = parser.parse_args()
+
+    keys, values = generate(args.rows, args.cols, args.win_length, args.max_empties, args.workers)
+    write_tablebase(args.output, args.rows, args.cols, args.win_length, args.max_empties, keys, values)
+    print(f"Tablebase with {len(keys)} position(s) written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
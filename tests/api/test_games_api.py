@@ -10,8 +10,9 @@ from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.api import auth, games
-from app.engine import Base, get_db
+from app.engine import Base, get_db, get_read_db
 from app.crud import game_crud
+from app.services.purge_service import purge_service
 
 
 @pytest.fixture()
@@ -44,6 +45,7 @@ def client(db_session_factory):
 			db.close()
 
 	app.dependency_overrides[get_db] = override_get_db
+	app.dependency_overrides[get_read_db] = override_get_db
 
 	with TestClient(app) as test_client:
 		yield test_client
@@ -143,6 +145,49 @@ class TestCreateAndJoinGame:
 		assert response.status_code == 404
 		assert "not found" in response.json()["detail"]
 
+	def test_create_game_against_computer_and_move(self, client: TestClient):
+		player_x = _register_user(client, "bot_x")
+		token_x = _login_user(client, player_x["payload"]["username"])
+
+		response = client.post("/games?opponent=computer&level=hard", headers=_auth_headers(token_x))
+
+		assert response.status_code == 201
+		game = response.json()
+		assert game["status"] == "ongoing"
+		assert game["bot_level"] == "hard"
+		assert game["player_o_id"] is not None
+
+		move_response = client.put(f"/games/{game['id']}/move/5", headers=_auth_headers(token_x))
+
+		assert move_response.status_code == 200
+		body = move_response.json()
+		assert [move["player"] for move in body["moves"]] == ["X", "O"]
+		assert body["board_state"].count("O") == 1
+		assert body["current_player"] == "X"
+
+	def test_create_gomoku_game_against_computer(self, client: TestClient):
+		player_x = _register_user(client, "gomoku_bot_x")
+		token_x = _login_user(client, player_x["payload"]["username"])
+
+		response = client.post(
+			"/games?opponent=computer&level=easy&rows=15&cols=15&win_length=5",
+			headers=_auth_headers(token_x),
+		)
+
+		assert response.status_code == 201
+		game = response.json()
+		assert (game["board_rows"], game["board_cols"], game["win_length"]) == (15, 15, 5)
+		assert game["bot_level"] == "easy"
+		assert game["status"] == "ongoing"
+
+	def test_register_reserved_computer_username_returns_400(self, client: TestClient):
+		response = client.post(
+			"/auth/register",
+			json={"username": "computer", "email": "computer@example.com", "password": "secret123"},
+		)
+
+		assert response.status_code == 400
+
 	def test_join_game_already_taken_returns_400(self, client: TestClient):
 		player_x = _register_user(client, "join_taken_x")
 		player_o = _register_user(client, "join_taken_o")
@@ -187,6 +232,42 @@ class TestGameReadEndpoints:
 		assert waiting_game["id"] in waiting_ids
 		assert ongoing_game["id"] in ongoing_ids
 
+	def test_list_games_pages_with_cursor(self, client: TestClient):
+		player_x = _register_user(client, "page_x")
+		player_o = _register_user(client, "page_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+		created = [_create_game(client, token_x)["id"] for _ in range(5)]
+		joined = _create_game(client, token_o)
+		assert client.post(f"/games/{joined['id']}/join", headers=_auth_headers(token_x)).status_code == 200
+
+		seen = []
+		cursor = None
+		while True:
+			params = {"limit": 2, "status": "waiting"}
+			if cursor:
+				params["after"] = cursor
+			response = client.get("/games", params=params, headers=_auth_headers(token_x))
+			assert response.status_code == 200
+			seen.extend(game["id"] for game in response.json())
+			cursor = response.headers.get("X-Next-Cursor")
+			if not cursor:
+				break
+
+		assert seen == created
+
+		mine = client.get("/games/user/me?status=ongoing&limit=1", headers=_auth_headers(token_x))
+		assert [game["id"] for game in mine.json()] == [joined["id"]]
+		assert "X-Next-Cursor" in mine.headers
+
+	def test_list_games_invalid_cursor_returns_400(self, client: TestClient):
+		user = _register_user(client, "page_bad")
+		token = _login_user(client, user["payload"]["username"])
+
+		response = client.get("/games?after=not-a-cursor", headers=_auth_headers(token))
+
+		assert response.status_code == 400
+
 	def test_get_game_by_id_not_found_returns_404(self, client: TestClient):
 		user = _register_user(client, "game_get_missing")
 		token = _login_user(client, user["payload"]["username"])
@@ -199,6 +280,51 @@ class TestGameReadEndpoints:
 		assert response.status_code == 404
 		assert "not found" in response.json()["detail"]
 
+	def test_get_archived_game_falls_back_to_archive(self, client: TestClient, db_session_factory, monkeypatch, tmp_path):
+		from datetime import timedelta
+		from app.services.archive import archive_games, get_archive
+
+		monkeypatch.setenv("ARCHIVE_DIR", str(tmp_path))
+		player_x = _register_user(client, "archive_x")
+		player_o = _register_user(client, "archive_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+		game = _create_game(client, token_x)
+		assert client.post(f"/games/{game['id']}/join", headers=_auth_headers(token_o)).status_code == 200
+		for position, token in [(1, token_x), (4, token_o), (2, token_x), (5, token_o), (3, token_x)]:
+			assert client.put(f"/games/{game['id']}/move/{position}", headers=_auth_headers(token)).status_code == 200
+		before = client.get(f"/games/{game['id']}", headers=_auth_headers(token_x)).json()
+
+		db = db_session_factory()
+		try:
+			assert archive_games(db, get_archive(), timedelta(0)) == 1
+		finally:
+			db.close()
+
+		response = client.get(f"/games/{game['id']}", headers=_auth_headers(token_x))
+		assert response.status_code == 200
+		body = response.json()
+		assert body["status"] == before["status"] == "won"
+		assert [move["position"] for move in body["moves"]] == [move["position"] for move in before["moves"]]
+		assert all(move["id"] for move in body["moves"])
+
+	def test_export_streams_games_as_ndjson_and_csv(self, client: TestClient):
+		import json
+
+		user = _register_user(client, "export_user")
+		token = _login_user(client, user["payload"]["username"])
+		created = [_create_game(client, token)["id"] for _ in range(3)]
+
+		ndjson = client.get("/games/export?chunk_size=2", headers=_auth_headers(token))
+		csv_response = client.get("/games/export?format=csv", headers=_auth_headers(token))
+
+		assert ndjson.status_code == 200
+		assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+		assert [json.loads(line)["id"] for line in ndjson.text.splitlines()] == created
+		assert csv_response.status_code == 200
+		assert csv_response.headers["content-type"].startswith("text/csv")
+		assert len(csv_response.text.splitlines()) == 4
+
 	def test_get_game_board_success(self, client: TestClient):
 		player_x = _register_user(client, "board_x")
 		player_o = _register_user(client, "board_o")
@@ -217,6 +343,69 @@ class TestGameReadEndpoints:
 		board = board_response.json()["board"]
 		assert board == [["X", "-", "-"], ["-", "-", "-"], ["-", "-", "-"]]
 
+	def test_get_game_analysis_returns_move_values(self, client: TestClient):
+		player_x = _register_user(client, "analysis_x")
+		player_o = _register_user(client, "analysis_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+
+		game = _create_game(client, token_x)
+		assert client.post(f"/games/{game['id']}/join", headers=_auth_headers(token_o)).status_code == 200
+		for position, token in ((1, token_x), (4, token_o), (2, token_x), (5, token_o)):
+			assert client.put(f"/games/{game['id']}/move/{position}", headers=_auth_headers(token)).status_code == 200
+
+		response = client.get(f"/games/{game['id']}/analysis", headers=_auth_headers(token_x))
+
+		assert response.status_code == 200
+		analysis = response.json()
+		assert analysis["player"] == "X"
+		assert analysis["best_move"] == 3
+		moves = {move["position"]: move for move in analysis["moves"]}
+		assert moves[3] == {"position": 3, "result": "win", "plies_to_result": 1}
+		assert moves[6]["result"] == "draw"
+		assert moves[7] == {"position": 7, "result": "loss", "plies_to_result": 2}
+
+	def test_get_game_analysis_rejects_large_board(self, client: TestClient):
+		player_x = _register_user(client, "analysis_big")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		game = client.post("/games?rows=5&cols=5&win_length=4", headers=_auth_headers(token_x)).json()
+
+		response = client.get(f"/games/{game['id']}/analysis", headers=_auth_headers(token_x))
+
+		assert response.status_code == 400
+
+	def test_get_game_review_pending_then_complete(self, client: TestClient, db_session_factory):
+		from app.services import ReviewService
+
+		player_x = _register_user(client, "review_x")
+		player_o = _register_user(client, "review_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+
+		game = _create_game(client, token_x)
+		assert client.post(f"/games/{game['id']}/join", headers=_auth_headers(token_o)).status_code == 200
+		assert client.get(f"/games/{game['id']}/review", headers=_auth_headers(token_x)).status_code == 400
+		for position, token in ((1, token_x), (4, token_o), (2, token_x), (5, token_o), (3, token_x)):
+			assert client.put(f"/games/{game['id']}/move/{position}", headers=_auth_headers(token)).status_code == 200
+
+		pending = client.get(f"/games/{game['id']}/review", headers=_auth_headers(token_x))
+		assert pending.status_code == 200
+		assert pending.json()["status"] == "pending"
+
+		db = db_session_factory()
+		try:
+			assert ReviewService.review_games(db, [UUID(game["id"])]) == 1
+		finally:
+			db.close()
+
+		response = client.get(f"/games/{game['id']}/review", headers=_auth_headers(token_x))
+		review = response.json()
+		assert review["status"] == "complete"
+		assert [move["position"] for move in review["moves"]] == [1, 4, 2, 5, 3]
+		assert review["moves"][1]["is_blunder"] is True
+		assert review["accuracy_x"] == 1.0
+		assert review["accuracy_o"] < 1.0
+
 	def test_get_my_games_returns_only_games_for_current_user(self, client: TestClient):
 		player_x = _register_user(client, "my_x")
 		player_o = _register_user(client, "my_o")
@@ -242,6 +431,84 @@ class TestGameReadEndpoints:
 		assert game_for_outsider["id"] not in game_ids
 
 
+class TestListQueryCounts:
+	@staticmethod
+	def _count_queries(db_session_factory, request):
+		from sqlalchemy import event
+
+		statements = []
+		engine = db_session_factory.kw["bind"]
+		listener = lambda *args: statements.append(args[2])
+		event.listen(engine, "before_cursor_execute", listener)
+		try:
+			response = request()
+		finally:
+			event.remove(engine, "before_cursor_execute", listener)
+		assert response.status_code == 200
+		return len(statements), response.json()
+
+	@staticmethod
+	def _create_games_with_moves(client, token_x, token_o, count):
+		for _ in range(count):
+			game = _create_game(client, token_x)
+			assert client.post(f"/games/{game['id']}/join", headers=_auth_headers(token_o)).status_code == 200
+			assert client.put(f"/games/{game['id']}/move/1", headers=_auth_headers(token_x)).status_code == 200
+			assert client.put(f"/games/{game['id']}/move/5", headers=_auth_headers(token_o)).status_code == 200
+
+	def test_list_endpoints_query_count_does_not_grow_with_games(self, client: TestClient, db_session_factory):
+		player_x = _register_user(client, "count_x")
+		player_o = _register_user(client, "count_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+
+		self._create_games_with_moves(client, token_x, token_o, 2)
+		few_all, _ = self._count_queries(db_session_factory, lambda: client.get("/games", headers=_auth_headers(token_x)))
+		few_mine, _ = self._count_queries(db_session_factory, lambda: client.get("/games/user/me", headers=_auth_headers(token_x)))
+
+		self._create_games_with_moves(client, token_x, token_o, 8)
+		many_all, games = self._count_queries(db_session_factory, lambda: client.get("/games", headers=_auth_headers(token_x)))
+		many_mine, mine = self._count_queries(db_session_factory, lambda: client.get("/games/user/me", headers=_auth_headers(token_x)))
+
+		# user lookup, games, one batched moves query
+		assert few_all == many_all == 3
+		assert few_mine == many_mine == 3
+		assert len(games) == len(mine) == 10
+		assert all([move["position"] for move in game["moves"]] == [1, 5] for game in games)
+
+	def test_get_game_reads_history_from_game_row(self, client: TestClient, db_session_factory):
+		player_x = _register_user(client, "row_x")
+		player_o = _register_user(client, "row_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+		self._create_games_with_moves(client, token_x, token_o, 1)
+		game_id = client.get("/games/user/me", headers=_auth_headers(token_x)).json()[0]["id"]
+
+		count, body = self._count_queries(
+			db_session_factory,
+			lambda: client.get(f"/games/{game_id}", headers=_auth_headers(token_x)),
+		)
+
+		# user lookup, game row
+		assert count == 2
+		assert [(move["ply"], move["player"], move["position"]) for move in body["moves"]] == [(1, "X", 1), (2, "O", 5)]
+		assert body["moves"][0]["player_id"] == player_x["response"]["id"]
+
+	def test_move_is_one_read_and_one_write_transaction(self, client: TestClient, db_session_factory):
+		player_x = _register_user(client, "atomic_x")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		game = client.post("/games?opponent=computer&level=hard", headers=_auth_headers(token_x)).json()
+
+		count, body = self._count_queries(
+			db_session_factory,
+			lambda: client.put(f"/games/{game['id']}/move/5", headers=_auth_headers(token_x)),
+		)
+
+		# user lookup, game with moves, one insert for both moves, one game update
+		assert count == 4
+		assert [move["player"] for move in body["moves"]] == ["X", "O"]
+		assert body["board_state"].count("X") == body["board_state"].count("O") == 1
+
+
 class TestMoveAndDeleteGame:
 	def test_make_move_waiting_game_returns_400(self, client: TestClient):
 		player_x = _register_user(client, "wait_move_x")
@@ -305,6 +572,46 @@ class TestMoveAndDeleteGame:
 		assert body["moves"][0]["position"] == 5
 		assert body["moves"][0]["player"] == "X"
 
+	def test_gomoku_game_on_large_board(self, client: TestClient):
+		player_x = _register_user(client, "gomoku_x")
+		player_o = _register_user(client, "gomoku_o")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		token_o = _login_user(client, player_o["payload"]["username"])
+
+		response = client.post("/games?rows=15&cols=15&win_length=5", headers=_auth_headers(token_x))
+		assert response.status_code == 201
+		game = response.json()
+		assert game["board_state"] == "-" * 225
+		assert (game["board_rows"], game["board_cols"], game["win_length"]) == (15, 15, 5)
+		assert client.post(f"/games/{game['id']}/join", headers=_auth_headers(token_o)).status_code == 200
+
+		body = None
+		for col in range(5):
+			body = client.put(f"/games/{game['id']}/move/{16 + col}", headers=_auth_headers(token_x)).json()
+			if col < 4:
+				reply = client.put(f"/games/{game['id']}/move/{31 + col}", headers=_auth_headers(token_o))
+				assert reply.status_code == 200
+
+		assert body["status"] == "won"
+		assert body["winner"] == "X"
+		assert len(body["moves"]) == 9
+
+		board = client.get(f"/games/{game['id']}/board", headers=_auth_headers(token_x)).json()["board"]
+		assert len(board) == 15
+		assert board[1][:5] == ["X"] * 5
+
+		out_of_bounds = client.put(f"/games/{game['id']}/move/226", headers=_auth_headers(token_o))
+		assert out_of_bounds.status_code == 400
+		assert out_of_bounds.json()["detail"] == "Position must be between 1 and 225"
+
+	def test_create_game_invalid_win_length_returns_400(self, client: TestClient):
+		player_x = _register_user(client, "bad_dims_x")
+		token_x = _login_user(client, player_x["payload"]["username"])
+
+		response = client.post("/games?rows=4&cols=4&win_length=5", headers=_auth_headers(token_x))
+
+		assert response.status_code == 400
+
 	def test_delete_game_success_and_missing_returns_404(self, client: TestClient):
 		player_x = _register_user(client, "delete_x")
 		token_x = _login_user(client, player_x["payload"]["username"])
@@ -348,3 +655,33 @@ class TestMoveAndDeleteGame:
 		remaining_ids = {game["id"] for game in all_games.json()}
 		assert waiting_game["id"] in remaining_ids
 		assert completed_game["id"] not in remaining_ids
+
+	def test_delete_completed_games_in_background(self, client: TestClient, db_session_factory):
+		player_x = _register_user(client, "purge_background_x")
+		token_x = _login_user(client, player_x["payload"]["username"])
+		completed_game = _create_game(client, token_x)
+
+		db = db_session_factory()
+		try:
+			game_crud.update_game_board(
+				db=db,
+				game_id=UUID(completed_game["id"]),
+				board_state="XXXOO----",
+				current_player="X",
+				status="won",
+				winner="X",
+			)
+		finally:
+			db.close()
+
+		response = client.delete("/games/completed/all?background=true", headers=_auth_headers(token_x))
+		assert response.status_code == 202
+		assert response.json()["running"] is True
+
+		purge_service.wait_idle(timeout=10)
+		progress = client.get("/games/completed/purge", headers=_auth_headers(token_x))
+		assert progress.status_code == 200
+		assert progress.json()["running"] is False
+		assert progress.json()["deleted"] == 1
+		assert progress.json()["error"] is None
+		assert client.get(f"/games/{completed_game['id']}", headers=_auth_headers(token_x)).status_code == 404
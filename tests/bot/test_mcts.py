@@ -0,0 +1,149 @@
+import pytest
+import random
+import time
+
+from app.bot import mcts
+from app.services.bot_pool import BotPool
+
+
+def _board(rows, cols, marks):
+	cells = ["-"] * (rows * cols)
+	for position, mark in marks.items():
+		cells[position - 1] = mark
+	return "".join(cells)
+
+
+def test_geometry_detects_lines_in_every_direction():
+	geometry = mcts.get_geometry(5, 5, 4)
+	for positions in ([1, 2, 3, 4], [2, 7, 12, 17], [1, 7, 13, 19], [5, 9, 13, 17]):
+		cells = mcts.encode(_board(5, 5, {position: "X" for position in positions}))
+		assert geometry.wins(cells, positions[-1] - 1)
+	cells = mcts.encode(_board(5, 5, {1: "X", 2: "X", 3: "X", 5: "X"}))
+	assert not geometry.wins(cells, 2)
+
+
+def test_choose_move_takes_immediate_win():
+	board = _board(9, 9, {1: "O", 2: "O", 3: "O", 4: "O", 19: "X", 20: "X", 21: "X", 23: "X"})
+	assert mcts.choose_move("win", 9, 9, 5, board, "O", time_budget=0.05) == 5
+
+
+def test_choose_move_blocks_opponent_win():
+	board = _board(9, 9, {41: "X", 42: "X", 43: "X", 44: "X", 10: "O", 20: "O", 30: "O"})
+	assert mcts.choose_move("block", 9, 9, 5, board, "O", time_budget=0.05) in (40, 45)
+
+
+def test_choose_move_opens_in_center_and_respects_budget():
+	started = time.perf_counter()
+	assert mcts.choose_move("open", 15, 15, 5, _board(15, 15, {}), "X", time_budget=0.1) == 113
+	assert time.perf_counter() - started < 1.0
+
+
+def test_tree_is_reused_between_moves():
+	mcts.forget("reuse")
+	board = _board(7, 7, {25: "X"})
+	position = mcts.choose_move("reuse", 7, 7, 4, board, "O", time_budget=0.2, seed=1)
+	tree = mcts._TREES["reuse"]
+	reply = max(tree.root.children, key=lambda child: child.visits)
+	visits = reply.visits
+	assert visits > 0
+
+	board = _board(7, 7, {25: "X", position: "O", reply.move + 1: "X"})
+	mcts.choose_move("reuse", 7, 7, 4, board, "O", time_budget=0.05, seed=1)
+	assert mcts._TREES["reuse"] is tree
+	assert tree.cells.count(mcts.EMPTY_CODE) == 49 - 4
+
+
+def test_unrelated_board_starts_a_new_tree():
+	mcts.choose_move("fresh", 7, 7, 4, _board(7, 7, {25: "X"}), "O", time_budget=0.02)
+	tree = mcts._TREES["fresh"]
+	mcts.choose_move("fresh", 7, 7, 4, _board(7, 7, {1: "X", 2: "O", 3: "X"}), "O", time_budget=0.02)
+	assert mcts._TREES["fresh"] is not tree
+
+
+def test_search_never_loses_on_three_by_three():
+	rng = random.Random(5)
+	for game in range(5):
+		board = list("-" * 9)
+		player = "X"
+		status = "ongoing"
+		while status == "ongoing":
+			if player == "X":
+				position = rng.choice([i + 1 for i, cell in enumerate(board) if cell == "-"])
+			else:
+				position = mcts.choose_move(f"ttt-{game}", 3, 3, 3, "".join(board), "O", time_budget=0.05, seed=game)
+			board[position - 1] = player
+			cells = mcts.encode("".join(board))
+			if mcts.get_geometry(3, 3, 3).wins(cells, position - 1):
+				status = "won"
+				assert player == "O"
+			elif "-" not in board:
+				status = "draw"
+			player = "O" if player == "X" else "X"
+
+
+def test_bot_pool_runs_search_in_worker_process():
+	from uuid import uuid4
+
+	pool = BotPool(1)
+	chosen = []
+	try:
+		future = pool.submit(uuid4(), 5, 5, 4, _board(5, 5, {13: "X"}), "O", 0.05, chosen.append)
+		future.result(timeout=60)
+		# The callback runs right after the result is set
+		deadline = time.perf_counter() + 5
+		while not chosen and time.perf_counter() < deadline:
+			time.sleep(0.01)
+	finally:
+		pool.shutdown()
+	assert len(chosen) == 1
+	assert 1 <= chosen[0] <= 25 and chosen[0] != 13
+
+
+def test_bot_pool_workers_do_not_load_the_web_or_database_stack():
+	from uuid import uuid4
+
+	pool = BotPool(1)
+	game_id = uuid4()
+	try:
+		pool.submit(game_id, 5, 5, 4, _board(5, 5, {13: "X"}), "O", 0.05, lambda position: None).result(timeout=60)
+		# The shard has now unpickled mcts.choose_move; list what that imported
+		modules = pool._shard(game_id).submit(eval, "sorted(__import__('sys').modules)").result(timeout=60)
+	finally:
+		pool.shutdown()
+	assert "app.bot.mcts" in modules
+	assert not [
+		name for name in modules
+		if name in ("app.main", "app.engine", "app.services", "fastapi") or name.startswith("sqlalchemy")
+	]
+
+
+def test_bot_pool_reports_failed_search():
+	from uuid import uuid4
+
+	pool = BotPool(1)
+	errors = []
+	game_id = uuid4()
+	try:
+		# A full board has no legal move, so the search in the worker raises
+		future = pool.submit(game_id, 3, 3, 3, "XOXOXOOXO", "O", 0.05, lambda position: None, on_error=errors.append)
+		with pytest.raises(ValueError):
+			future.result(timeout=60)
+		deadline = time.perf_counter() + 5
+		while not errors and time.perf_counter() < deadline:
+			time.sleep(0.01)
+		assert not pool.is_pending(game_id)
+	finally:
+		pool.shutdown()
+	assert len(errors) == 1
+
+
+def test_inline_bot_pool_forgets_game_tree():
+	from uuid import uuid4
+
+	pool = BotPool(0)
+	game_id = uuid4()
+	pool.submit(game_id, 5, 5, 4, _board(5, 5, {13: "X"}), "O", 0.05, lambda position: None)
+	assert str(game_id) in mcts._TREES
+
+	pool.forget(game_id)
+	assert str(game_id) not in mcts._TREES
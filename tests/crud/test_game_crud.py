@@ -1,10 +1,13 @@
 import pytest
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 
 from app.engine import Base
-from app.crud import game_crud
+from app.model.game import Game
+from app.model.move import Move
+from app.crud import game_crud, user_crud
 from app.services import GameService
 
 
@@ -93,6 +96,32 @@ def test_delete_completed_games_only_removes_finished(db_session):
 	assert game_crud.get_game_by_id(db_session, ongoing.id) is not None
 
 
+def test_delete_completed_games_in_batches_with_moves_and_cutoff(db_session):
+	user = user_crud.create_user(db_session, "purger", "purger@example.com", "secret123")
+	finished = []
+	for _ in range(5):
+		game = game_crud.create_game(db_session, player_x_id=user.id)
+		game_crud.record_moves(db_session, game, [(user.id, "X", 1)], "X--------", "O")
+		finished.append(game)
+	recent = game_crud.create_game(db_session, status="draw")
+	old = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=10)
+	db_session.execute(update(Game).where(Game.id.in_([game.id for game in finished])).values(status="won", updated_at=old))
+	db_session.commit()
+	reported = []
+
+	deleted_count = game_crud.delete_completed_games(
+		db_session,
+		older_than=timedelta(days=1),
+		batch_size=2,
+		progress=reported.append
+	)
+
+	assert deleted_count == 5
+	assert reported == [2, 4, 5]
+	assert db_session.query(Move).count() == 0
+	assert game_crud.get_game_by_id(db_session, recent.id) is not None
+
+
 def test_valid_move_then_update_board(db_session):
 	game = game_crud.create_game(db_session)
 	assert GameService.is_valid_move(game.board_state, 1) is True
@@ -123,3 +152,29 @@ def test_full_board_draw_status(db_session):
 	)
 	assert updated is not None
 	assert updated.status == "draw"
+
+
+def test_record_moves_stores_moves_and_board_together(db_session):
+	user = user_crud.create_user(db_session, "recorder", "recorder@example.com", "secret123")
+	game = game_crud.create_game(db_session)
+	loaded = game_crud.get_game_with_moves(db_session, game.id)
+	assert loaded.moves == []
+
+	created = game_crud.record_moves(
+		db_session,
+		loaded,
+		[(user.id, "X", 5), (user.id, "O", 1)],
+		board_state="O---X----",
+		current_player="X"
+	)
+
+	assert [move.position for move in created] == [5, 1]
+	assert [move.position for move in loaded.moves] == [5, 1]
+	# Only this commit keeps the objects loaded; the session default is unchanged
+	assert "board_state" in loaded.__dict__
+	assert db_session.expire_on_commit is True
+	db_session.expire_all()
+	reloaded = game_crud.get_game_with_moves(db_session, game.id)
+	assert reloaded.board_state == "O---X----"
+	assert reloaded.current_player == "X"
+	assert [(move.player, move.position) for move in reloaded.moves] == [("X", 5), ("O", 1)]
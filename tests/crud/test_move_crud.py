@@ -1,4 +1,5 @@
 import pytest
+from datetime import timedelta
 from uuid import UUID
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -49,6 +50,46 @@ def test_get_moves_by_game_ordered(db_session, setup_game):
 	assert [m.position for m in moves] == [1, 2]
 
 
+def test_get_moves_by_game_since_skips_only_older_moves(db_session, setup_game):
+	user_x, user_o, game = setup_game
+	move_crud.create_move(db_session, game.id, user_x.id, "X", 1)
+	move_crud.create_move(db_session, game.id, user_o.id, "O", 2)
+	created_at = game.created_at.replace(tzinfo=None)
+
+	assert [m.position for m in move_crud.get_moves_by_game(db_session, game.id, since=created_at)] == [1, 2]
+	assert move_crud.get_moves_by_game(db_session, game.id, since=created_at + timedelta(days=2)) == []
+	grouped = move_crud.get_moves_by_games(db_session, [game.id], since=created_at)
+	assert [m.position for m in grouped[game.id]] == [1, 2]
+
+
+def test_get_moves_by_games_groups_in_one_query(db_session, setup_game):
+	from sqlalchemy import event
+
+	user_x, user_o, game = setup_game
+	other = game_crud.create_game(db_session, player_x_id=user_x.id, player_o_id=user_o.id)
+	empty = game_crud.create_game(db_session, player_x_id=user_x.id, player_o_id=user_o.id)
+	move_crud.create_move(db_session, game.id, user_x.id, "X", 1)
+	move_crud.create_move(db_session, other.id, user_x.id, "X", 5)
+	move_crud.create_move(db_session, game.id, user_o.id, "O", 2)
+
+	game_ids = [game.id, other.id, empty.id]
+
+	statements = []
+	engine = db_session.get_bind()
+	listener = lambda *args: statements.append(args[2])
+	event.listen(engine, "before_cursor_execute", listener)
+	try:
+		moves = move_crud.get_moves_by_games(db_session, game_ids)
+	finally:
+		event.remove(engine, "before_cursor_execute", listener)
+
+	assert len(statements) == 1
+	assert [move.position for move in moves[game_ids[0]]] == [1, 2]
+	assert [move.position for move in moves[game_ids[1]]] == [5]
+	assert moves[game_ids[2]] == []
+	assert move_crud.get_moves_by_games(db_session, []) == {}
+
+
 def test_get_moves_by_player(db_session, setup_game):
 	user_x, user_o, game = setup_game
 	move_crud.create_move(db_session, game.id, user_x.id, "X", 1)
@@ -0,0 +1,207 @@
+import pytest
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Uuid, create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.engine import migrations
+from app.crud import game_crud, move_crud, user_crud
+from app.model import Game, User
+
+
+@pytest.fixture()
+def engine(tmp_path):
+	engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+	try:
+		yield engine
+	finally:
+		engine.dispose()
+
+
+def _index_names(engine):
+	inspector = inspect(engine)
+	return {index["name"] for table in ("games", "moves") for index in inspector.get_indexes(table)}
+
+
+def test_migrate_records_versions_once(engine):
+	Base.metadata.create_all(bind=engine)
+
+	assert migrations.migrate(engine) == [version for version, _, _ in migrations.MIGRATIONS]
+	assert migrations.migrate(engine) == []
+
+
+def test_migrate_upgrades_existing_schema(engine):
+	Base.metadata.create_all(bind=engine)
+	with engine.begin() as conn:
+		for name in _index_names(engine):
+			conn.execute(text(f"DROP INDEX {name}"))
+		conn.execute(text("ALTER TABLE games DROP COLUMN version"))
+		conn.execute(text("ALTER TABLE games DROP COLUMN move_history"))
+		conn.execute(text("ALTER TABLE moves DROP COLUMN ply"))
+		conn.execute(text("INSERT INTO games (id, current_player, status, board_state, board_rows, board_cols, win_length, created_at, updated_at) "
+			"VALUES ('00000000000000000000000000000001', 'X', 'ongoing', 'X---O----', 3, 3, 3, '2024-01-01', '2024-01-01')"))
+		for number, (player, position) in enumerate([("O", 5), ("X", 1)]):
+			conn.execute(text("INSERT INTO moves (id, game_id, player_id, player, position, created_at) "
+				f"VALUES ('0000000000000000000000000000001{number}', '00000000000000000000000000000001', "
+				f"'00000000000000000000000000000009', '{player}', {position}, '2024-01-01 00:00:0{2 - number}')"))
+
+	migrations.migrate(engine)
+
+	assert {
+		"ix_games_created_at_id",
+		"ix_games_status",
+		"ix_games_player_x_id",
+		"ix_games_player_o_id",
+		"ix_games_waiting_created_at_id",
+		"ix_games_ongoing_created_at_id",
+		"ix_moves_game_id_created_at",
+		"ux_moves_game_id_ply",
+	} <= _index_names(engine)
+	with engine.connect() as conn:
+		assert conn.execute(text("SELECT version FROM games")).scalar_one() == 1
+		assert conn.execute(text("SELECT move_history FROM games")).scalar_one() == bytes([1, 5])
+		assert conn.execute(text("SELECT player, ply FROM moves ORDER BY ply")).all() == [("X", 1), ("O", 2)]
+
+
+def test_migrate_backfills_plies_and_histories_in_batches(engine, monkeypatch):
+	monkeypatch.setattr(migrations, "MIGRATION_BATCH_SIZE", 2)
+	Base.metadata.create_all(bind=engine)
+	with engine.begin() as conn:
+		conn.execute(text("DROP INDEX ux_moves_game_id_ply"))
+		conn.execute(text("ALTER TABLE games DROP COLUMN move_history"))
+		conn.execute(text("ALTER TABLE moves DROP COLUMN ply"))
+		for game in range(5):
+			conn.execute(text("INSERT INTO games (id, current_player, status, board_state, board_rows, board_cols, win_length, version, created_at, updated_at) "
+				f"VALUES ('0000000000000000000000000000000{game}', 'X', 'ongoing', '---------', 3, 3, 3, 1, '2024-01-01', '2024-01-01')"))
+			for ply in range(game):
+				conn.execute(text("INSERT INTO moves (id, game_id, player_id, player, position, created_at) "
+					f"VALUES ('000000000000000000000000000001{game}{ply}', '0000000000000000000000000000000{game}', "
+					f"'00000000000000000000000000000009', 'X', {9 - ply}, '2024-01-01 00:00:0{ply}')"))
+
+	migrations.migrate(engine)
+
+	with engine.connect() as conn:
+		histories = conn.execute(text("SELECT move_history FROM games ORDER BY id")).scalars().all()
+		assert histories == [bytes(range(9, 9 - game, -1)) for game in range(5)]
+		assert conn.execute(text("SELECT COUNT(*) FROM moves WHERE ply IS NULL")).scalar_one() == 0
+
+
+def test_migrate_removes_duplicate_reviews(engine):
+	Base.metadata.create_all(bind=engine)
+	with engine.begin() as conn:
+		conn.execute(text("DROP INDEX ux_move_reviews_game_id_ply"))
+		for number in range(3):
+			conn.execute(text("INSERT INTO move_reviews (id, game_id, ply, player, position, played_result, best_result, "
+				"best_position, accuracy, is_blunder, created_at) "
+				f"VALUES ('0000000000000000000000000000002{number}', '00000000000000000000000000000001', {min(number, 1) + 1}, "
+				"'X', 5, 'draw', 'draw', 5, 1.0, 0, '2024-01-01')"))
+
+	migrations.migrate(engine)
+
+	assert "ux_move_reviews_game_id_ply" in {index["name"] for index in inspect(engine).get_indexes("move_reviews")}
+	with engine.connect() as conn:
+		assert conn.execute(text("SELECT ply FROM move_reviews ORDER BY ply")).scalars().all() == [1, 2]
+
+
+def _create_baseline_schema(engine):
+	# The users, games and moves tables as created by the first release, before any migration
+	metadata = MetaData()
+	Table(
+		"users", metadata,
+		Column("id", Uuid, primary_key=True),
+		Column("username", String(50), unique=True, nullable=False),
+		Column("email", String(100), unique=True, nullable=False),
+		Column("hashed_password", String(255), nullable=False),
+		Column("created_at", DateTime, nullable=False),
+	)
+	Table(
+		"games", metadata,
+		Column("id", Uuid, primary_key=True),
+		Column("player_x_id", Uuid, ForeignKey("users.id"), nullable=True),
+		Column("player_o_id", Uuid, ForeignKey("users.id"), nullable=True),
+		Column("current_player", String(1), nullable=False),
+		Column("status", String(20), nullable=False),
+		Column("winner", String(1), nullable=True),
+		Column("board_state", String(9), nullable=False),
+		Column("created_at", DateTime, nullable=False),
+		Column("updated_at", DateTime, nullable=False),
+	)
+	Table(
+		"moves", metadata,
+		Column("id", Uuid, primary_key=True),
+		Column("game_id", Uuid, ForeignKey("games.id", ondelete="CASCADE"), nullable=False),
+		Column("player_id", Uuid, ForeignKey("users.id"), nullable=False),
+		Column("player", String(1), nullable=False),
+		Column("position", Integer, nullable=False),
+		Column("created_at", DateTime, nullable=False),
+	)
+	metadata.create_all(bind=engine)
+
+
+def test_migrate_upgrades_baseline_schema(engine):
+	_create_baseline_schema(engine)
+	with engine.begin() as conn:
+		conn.execute(text("INSERT INTO users (id, username, email, hashed_password, created_at) "
+			"VALUES ('00000000000000000000000000000009', 'legacy', 'legacy@example.com', '-', '2024-01-01')"))
+		conn.execute(text("INSERT INTO games (id, player_x_id, player_o_id, current_player, status, board_state, created_at, updated_at) "
+			"VALUES ('00000000000000000000000000000001', '00000000000000000000000000000009', '00000000000000000000000000000009', "
+			"'O', 'ongoing', 'X--------', '2024-01-01', '2024-01-01')"))
+		conn.execute(text("INSERT INTO moves (id, game_id, player_id, player, position, created_at) "
+			"VALUES ('00000000000000000000000000000010', '00000000000000000000000000000001', "
+			"'00000000000000000000000000000009', 'X', 1, '2024-01-01 00:00:01')"))
+
+	# What init_db() does: create the missing tables, then migrate
+	Base.metadata.create_all(bind=engine)
+	assert migrations.migrate(engine) == [version for version, _, _ in migrations.MIGRATIONS]
+
+	db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+	try:
+		game = game_crud.get_games_page(db)[0]
+		assert (game.board_rows, game.board_cols, game.win_length, game.bot_level) == (3, 3, 3, None)
+		assert game.version == 1
+		assert game.history_positions == [1]
+		assert [move.ply for move in move_crud.get_moves_by_game(db, game.id)] == [1]
+		assert game_crud.create_game(db, board_rows=4, board_cols=4).board_state == "-" * 16
+	finally:
+		db.close()
+
+
+def test_hot_queries_use_indexes(engine):
+	Base.metadata.create_all(bind=engine)
+	migrations.migrate(engine)
+	db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+	user_id = user_crud.create_user(db, "planner", "planner@example.com", "secret123").id
+	game_id = game_crud.create_game(db, player_x_id=user_id).id
+	statuses = ["waiting", "ongoing", "won", "draw", "won", "draw"]
+	for number in range(300):
+		player = User(username=f"player{number}", email=f"player{number}@example.com", hashed_password="-")
+		db.add(player)
+		db.flush()
+		db.add(Game(status=statuses[number % 6], player_x_id=player.id, player_o_id=player.id))
+	db.commit()
+	with engine.begin() as conn:
+		# Planner statistics, as on a database that has been running for a while
+		conn.execute(text("ANALYZE"))
+
+	statements = []
+	listener = lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, parameters))
+	event.listen(engine, "before_cursor_execute", listener)
+	try:
+		game_crud.get_games_page(db, status="waiting", limit=10)
+		game_crud.get_games_page(db, status="ongoing", limit=10)
+		game_crud.get_games_page(db, user_id=user_id, limit=10)
+		move_crud.get_moves_by_game(db, game_id)
+	finally:
+		event.remove(engine, "before_cursor_execute", listener)
+
+	plans = []
+	with engine.connect() as conn:
+		for statement, parameters in statements:
+			rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+			plans.append(" ".join(row[-1] for row in rows))
+	db.close()
+
+	waiting, ongoing, mine, moves = plans
+	assert "ix_games_waiting_created_at_id" in waiting
+	assert "ix_games_ongoing_created_at_id" in ongoing
+	assert "ix_games_player_x_id" in mine and "ix_games_player_o_id" in mine
+	assert "ux_moves_game_id_ply" in moves
@@ -0,0 +1,97 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.engine import Base, engine, partitioning
+from app.model.game import Game
+from app.model.move import Move
+from app.model.user import User
+
+
+def test_add_months_crosses_year_boundaries():
+	assert partitioning.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+	assert partitioning.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_names_round_trip():
+	assert partitioning.partition_name(date(2026, 3, 1)) == "moves_p2026_03"
+	assert partitioning.partition_month("moves_p2026_03") == date(2026, 3, 1)
+	assert partitioning.partition_month(partitioning.DEFAULT_PARTITION) is None
+
+
+def test_create_partition_sql_covers_one_month():
+	sql = partitioning.create_partition_sql(date(2026, 12, 1))
+
+	assert "moves_p2026_12 PARTITION OF moves" in sql
+	assert "FROM ('2026-12-01') TO ('2027-01-01')" in sql
+
+
+def test_plan_maintenance_creates_missing_and_expires_old_months():
+	existing = [date(2026, month, 1) for month in range(1, 12)]
+
+	create, expired = partitioning.plan_maintenance(existing, date(2026, 10, 17), months_ahead=3, retain_months=6)
+
+	assert create == [date(2026, 12, 1), date(2027, 1, 1)]
+	assert expired == [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)]
+
+
+def test_plan_maintenance_keeps_everything_without_retention():
+	_, expired = partitioning.plan_maintenance([date(2020, 1, 1)], date(2026, 10, 17), months_ahead=0)
+
+	assert expired == []
+
+
+def test_partitioning_requires_postgres():
+	engine = create_engine("sqlite://")
+	with engine.begin() as conn:
+		with pytest.raises(RuntimeError):
+			partitioning.maintain(conn)
+
+
+@pytest.fixture()
+def postgres_conn():
+	if engine.dialect.name != "postgresql":
+		pytest.skip("Partition pruning needs PostgreSQL")
+	try:
+		conn = engine.connect()
+	except OperationalError as e:
+		pytest.skip(f"PostgreSQL is not reachable: {e}")
+	try:
+		yield conn
+	finally:
+		conn.close()
+
+
+def test_since_bound_prunes_move_partitions(postgres_conn):
+	conn = postgres_conn
+	transaction = conn.begin()
+	try:
+		# A scratch schema keeps the test tables untouched; the rollback removes it
+		conn.execute(text("CREATE SCHEMA partition_pruning_test"))
+		conn.execute(text("SET LOCAL search_path TO partition_pruning_test"))
+		Base.metadata.create_all(conn)
+		user_id = conn.execute(
+			insert(User.__table__).values(username="pruner", email="pruner@example.com", hashed_password="secret123")
+			.returning(User.__table__.c.id)
+		).scalar_one()
+		game_id = conn.execute(
+			insert(Game.__table__).values(player_x_id=user_id).returning(Game.__table__.c.id)
+		).scalar_one()
+		conn.execute(insert(Move.__table__), [
+			{"game_id": game_id, "player_id": user_id, "player": "X", "position": ply, "ply": ply,
+			 "created_at": datetime(2026, 5 + ply, 15)}
+			for ply in range(1, 6)
+		])
+
+		assert partitioning.convert(conn, months_ahead=0, today=date(2026, 10, 17))[0] == date(2026, 6, 1)
+		plan = "\n".join(conn.execute(
+			text("EXPLAIN (COSTS OFF) SELECT * FROM moves WHERE game_id = :game AND created_at >= :since"),
+			{"game": game_id, "since": datetime(2026, 9, 1)}
+		).scalars())
+	finally:
+		transaction.rollback()
+
+	assert "moves_p2026_09" in plan and "moves_p2026_10" in plan
+	assert not any(f"moves_p2026_{month:02d}" in plan for month in (6, 7, 8))
@@ -33,3 +33,68 @@ def test_init_db_creates_tables(sqlite_session_module):
 	sqlite_session_module.init_db()
 	inspector = inspect(sqlite_session_module.engine)
 	assert "temp_test_table" in inspector.get_table_names()
+
+
+@pytest.fixture()
+def replica_session_module(tmp_path, monkeypatch):
+	primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+	replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+	monkeypatch.setattr(session_module, "SessionLocal", sessionmaker(bind=primary))
+	monkeypatch.setattr(session_module, "read_engine", replica)
+	monkeypatch.setattr(session_module, "ReadSessionLocal", sessionmaker(bind=replica))
+	monkeypatch.setattr(session_module, "REPLICA_LAG_CHECK_MS", 0)
+	try:
+		yield session_module
+	finally:
+		primary.dispose()
+		replica.dispose()
+
+
+def _read_bind(module):
+	db = next(module.get_read_db())
+	try:
+		return db.get_bind()
+	finally:
+		db.close()
+
+
+def test_get_read_db_uses_primary_without_replica(sqlite_session_module, monkeypatch):
+	monkeypatch.setattr(sqlite_session_module, "ReadSessionLocal", None)
+	monkeypatch.setattr(sqlite_session_module, "read_engine", None)
+
+	assert _read_bind(sqlite_session_module) is sqlite_session_module.engine
+
+
+def test_get_read_db_routes_to_replica_until_lag_exceeds_threshold(replica_session_module, monkeypatch):
+	assert _read_bind(replica_session_module) is replica_session_module.read_engine
+
+	monkeypatch.setattr(replica_session_module, "replica_lag", lambda bind: replica_session_module.REPLICA_MAX_LAG_MS / 1000 + 1)
+	assert _read_bind(replica_session_module) is not replica_session_module.read_engine
+
+
+def test_get_read_db_falls_back_when_replica_is_unreachable(replica_session_module, monkeypatch):
+	def _unreachable(bind):
+		raise ConnectionError("replica down")
+
+	monkeypatch.setattr(replica_session_module, "replica_lag", _unreachable)
+
+	assert _read_bind(replica_session_module) is not replica_session_module.read_engine
+
+
+def test_standby_lag_needs_a_streaming_wal_receiver():
+	assert session_module.standby_lag(False, False, None, None) == 0.0
+	assert session_module.standby_lag(True, True, True, 600.0) == 0.0
+	# Receive and replay positions match when the receiver is disconnected too
+	assert session_module.standby_lag(True, False, True, 600.0) == 600.0
+	assert session_module.standby_lag(True, True, False, 2.5) == 2.5
+	assert session_module.standby_lag(True, False, None, None) == float("inf")
+
+
+def test_lag_check_runs_without_holding_the_lock(replica_session_module, monkeypatch):
+	def _check(bind):
+		assert not replica_session_module._replica_lock.locked()
+		return 0.0
+
+	monkeypatch.setattr(replica_session_module, "replica_lag", _check)
+
+	assert _read_bind(replica_session_module) is replica_session_module.read_engine
@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker
 
 from app.engine import Base
 from app.crud import game_crud
+from app.model.game import decode_history, encode_history
 from app.services import GameService
 
 
@@ -101,3 +102,11 @@ def test_full_board_draw():
 	status, winner = GameService.get_game_status(board)
 	assert status == "draw"
 	assert winner is None
+
+
+def test_move_history_round_trip():
+	assert encode_history([5, 1, 9], 9) == bytes([5, 1, 9])
+	assert decode_history(bytes([5, 1, 9]), 9) == [5, 1, 9]
+	# 19x19 boards need two bytes per move
+	assert len(encode_history([361, 1], 361)) == 4
+	assert decode_history(encode_history([361, 1], 361), 361) == [361, 1]
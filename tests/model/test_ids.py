@@ -0,0 +1,47 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud
+from app.model.ids import uuid7
+
+
+@pytest.fixture()
+def db_session():
+	engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+
+def test_uuid7_sets_version_variant_and_timestamp():
+	before = time.time_ns() // 1_000_000
+	key = uuid7()
+	after = time.time_ns() // 1_000_000
+
+	assert key.version == 7
+	assert key.variant == "specified in RFC 4122"
+	# A counter overflow may push the timestamp one millisecond ahead
+	assert before <= key.int >> 80 <= after + 1
+
+
+def test_uuid7_is_strictly_increasing():
+	keys = [uuid7() for _ in range(20_000)]
+
+	assert keys == sorted(keys)
+	assert len(set(keys)) == len(keys)
+
+
+def test_models_default_to_uuid7(db_session):
+	first = game_crud.create_game(db_session)
+	second = game_crud.create_game(db_session)
+
+	assert first.id.version == 7
+	assert first.id < second.id
@@ -87,6 +87,7 @@ def test_game_with_moves_includes_moves():
 		player_id=uuid4(),
 		player="X",
 		position=1,
+		ply=1,
 		created_at=now
 	)
 	game = GameWithMoves(
@@ -13,6 +13,7 @@ def test_move_response_happy_path():
 		player_id=uuid4(),
 		player="X",
 		position=5,
+		ply=1,
 		created_at=now
 	)
 	assert move.player == "X"
@@ -0,0 +1,81 @@
+import io
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud, move_crud, user_crud
+from app.services import export
+from app.scripts.import_games import copy_payload, import_games, read_records
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+	engines = []
+
+	def _factory(name):
+		engine = create_engine(f"sqlite:///{tmp_path / name}")
+		Base.metadata.create_all(bind=engine)
+		engines.append(engine)
+		return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+	try:
+		yield _factory
+	finally:
+		for engine in engines:
+			engine.dispose()
+
+
+@pytest.mark.parametrize("dump_format", ["ndjson", "csv"])
+def test_export_then_import_round_trips(session_factory, dump_format):
+	source = session_factory("source.db")()
+	user_x = user_crud.create_user(source, "dump_x", "dump_x@example.com", "secret123")
+	user_o = user_crud.create_user(source, "dump_o", "dump_o@example.com", "secret123")
+	played = game_crud.create_game(source, player_x_id=user_x.id, player_o_id=user_o.id)
+	game_crud.record_moves(source, played, [(user_x.id, "X", 5), (user_o.id, "O", 1), (user_x.id, "X", 9)], "O---X---X", "O")
+	game_crud.create_game(source, player_x_id=user_x.id, status="waiting")
+	dump = "".join(export.render_chunks(source, dump_format))
+	played_id, user_x_id, user_o_id = played.id, user_x.id, user_o.id
+	source.close()
+
+	target = session_factory("target.db")()
+	assert import_games(target, read_records(io.StringIO(dump), dump_format), batch_size=1) == (2, 3)
+
+	assert "".join(export.render_chunks(target, dump_format)) == dump
+	moves = move_crud.get_moves_by_game(target, played_id)
+	assert [(move.ply, move.player, move.player_id, move.position) for move in moves] == [
+		(1, "X", user_x_id, 5), (2, "O", user_o_id, 1), (3, "X", user_x_id, 9)
+	]
+	target.close()
+
+
+def test_import_generates_missing_ids_and_board(session_factory):
+	db = session_factory("generated.db")()
+	user_x = user_crud.create_user(db, "gen_x", "gen_x@example.com", "secret123")
+	user_o = user_crud.create_user(db, "gen_o", "gen_o@example.com", "secret123")
+	record = {"player_x_id": str(user_x.id), "player_o_id": str(user_o.id), "moves": [1, 2]}
+
+	assert import_games(db, [record]) == (1, 2)
+
+	game = game_crud.get_games_page(db)[0]
+	assert game.board_state == "XO-------"
+	assert game.history_positions == [1, 2]
+	db.close()
+
+
+def test_import_rejects_moves_without_players(session_factory):
+	db = session_factory("invalid.db")()
+	with pytest.raises(ValueError):
+		import_games(db, [{"moves": [1]}])
+	db.close()
+
+
+def test_copy_payload_writes_nulls_bytes_and_timestamps():
+	row = {"id": uuid4(), "winner": None, "move_history": bytes([5, 1]), "created_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+	line = copy_payload([row], ["id", "winner", "move_history", "created_at"]).getvalue().strip()
+
+	assert line == f"{row['id']},,\\x0501,2024-01-02T03:04:05"
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud
+from app.scripts.rederive_game_status import rederive_statuses
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+	engine = create_engine(f"sqlite:///{tmp_path / 'games.db'}")
+	Base.metadata.create_all(bind=engine)
+	try:
+		yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	finally:
+		engine.dispose()
+
+
+def test_rederive_fixes_only_stale_rows(session_factory):
+	db = session_factory()
+	stale = game_crud.create_game(db)
+	game_crud.update_game_board(db, stale.id, "XXXOO----", "X", status="ongoing")
+	correct = game_crud.create_game(db)
+	game_crud.update_game_board(db, correct.id, "XOXXOOOXX", "X", status="draw")
+	waiting = game_crud.create_game(db, status="waiting")
+	stale_id, waiting_id = stale.id, waiting.id
+	db.close()
+
+	read_db, write_db = session_factory(), session_factory()
+	try:
+		assert rederive_statuses(read_db, write_db, chunk_size=2, dry_run=True) == (2, 1, 0)
+		assert rederive_statuses(read_db, write_db, chunk_size=2) == (2, 1, 0)
+	finally:
+		read_db.close()
+		write_db.close()
+
+	db = session_factory()
+	try:
+		fixed = game_crud.get_game_by_id(db, stale_id)
+		assert (fixed.status, fixed.winner) == ("won", "X")
+		assert game_crud.get_game_by_id(db, waiting_id).status == "waiting"
+	finally:
+		db.close()
+
+
+def test_rederive_skips_games_changed_by_live_moves(session_factory, monkeypatch):
+	from app.services import batch_eval
+
+	db = session_factory()
+	raced = game_crud.create_game(db)
+	game_crud.update_game_board(db, raced.id, "XXXOO----", "X", status="ongoing")
+	untouched = game_crud.create_game(db)
+	game_crud.update_game_board(db, untouched.id, "OOOXX-X--", "X", status="ongoing")
+	raced_id, untouched_id = raced.id, untouched.id
+	db.close()
+
+	evaluate = batch_eval.evaluate_board_states
+
+	def evaluate_during_move(boards):
+		# A move lands between reading the chunk and writing it back
+		mover = session_factory()
+		try:
+			game_crud.update_game_board(mover, raced_id, "XXXOO----", "O", status="ongoing")
+		finally:
+			mover.close()
+		return evaluate(boards)
+
+	monkeypatch.setattr(batch_eval, "evaluate_board_states", evaluate_during_move)
+	read_db, write_db = session_factory(), session_factory()
+	try:
+		assert rederive_statuses(read_db, write_db, chunk_size=10) == (2, 1, 1)
+	finally:
+		read_db.close()
+		write_db.close()
+
+	db = session_factory()
+	try:
+		assert (game_crud.get_game_by_id(db, untouched_id).status, game_crud.get_game_by_id(db, untouched_id).winner) == ("won", "O")
+		assert game_crud.get_game_by_id(db, raced_id).current_player == "O"
+	finally:
+		db.close()
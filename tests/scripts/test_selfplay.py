@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud, move_crud, user_crud
+from app.scripts.selfplay import POLICIES, load_records, play_batch, play_game
+from app.services import game_service
+
+
+@pytest.fixture()
+def db_session():
+	engine = create_engine("sqlite:///:memory:")
+	Base.metadata.create_all(bind=engine)
+	session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+	try:
+		yield session
+	finally:
+		session.close()
+		engine.dispose()
+
+
+def _replay(moves):
+	board = "-" * 9
+	player = "X"
+	for position in moves:
+		board = game_service.make_move(board, int(position), player)
+		player = game_service.get_next_player(player)
+	return board
+
+
+def test_random_games_follow_the_rules():
+	rng = random.Random(7)
+	for _ in range(200):
+		record = play_game(POLICIES["random"], POLICIES["random"], rng)
+		assert len(set(record["moves"])) == len(record["moves"])
+		board = _replay(record["moves"])
+		assert game_service.get_game_status(board) == (record["status"], record["winner"])
+
+
+def test_solver_self_play_always_draws():
+	rng = random.Random(1)
+	for _ in range(5):
+		record = play_game(POLICIES["solver"], POLICIES["solver"], rng)
+		assert record["status"] == "draw"
+		assert len(record["moves"]) == 9
+
+
+def test_solver_never_loses_to_random():
+	rng = random.Random(3)
+	for _ in range(50):
+		record = play_game(POLICIES["random"], POLICIES["solver"], rng)
+		assert record["winner"] != "X"
+
+
+def test_play_batch_is_reproducible_with_seed():
+	_, _, first = play_batch(20, "mixed", "random", seed=42)
+	_, _, second = play_batch(20, "mixed", "random", seed=42)
+	assert first == second
+	assert len(first) == 20
+
+
+def test_load_records_inserts_games_and_moves(db_session):
+	player_x = user_crud.create_user(db_session, "selfplay_x", "x@example.com", "password123")
+	player_o = user_crud.create_user(db_session, "selfplay_o", "o@example.com", "password123")
+	records = [
+		{"moves": "14253", "status": "won", "winner": "X"},
+		{"moves": "512346879", "status": "draw", "winner": None},
+	]
+
+	assert load_records(db_session, records, player_x.id, player_o.id) == 2
+
+	games = game_crud.get_all_games(db_session)
+	assert len(games) == 2
+	won = next(game for game in games if game.status == "won")
+	assert won.board_state == "XXXOO----"
+	assert won.current_player == "X"
+	moves = move_crud.get_moves_by_game(db_session, won.id)
+	assert [move.position for move in moves] == [1, 4, 2, 5, 3]
+	assert [move.player_id for move in moves[:2]] == [player_x.id, player_o.id]
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud, move_crud, user_crud
+from app.services.archive import BLOCK_GAMES, GameArchive, archive_games
+
+
+@pytest.fixture()
+def db_session():
+	engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+
+def _finished_game(db, user, moves, updated_days_ago):
+	game = game_crud.create_game(db, player_x_id=user.id, player_o_id=user.id)
+	board = ["-"] * 9
+	for ply, position in enumerate(moves):
+		board[position - 1] = "X" if ply % 2 == 0 else "O"
+	game_crud.record_moves(
+		db,
+		game,
+		[(user.id, "X" if ply % 2 == 0 else "O", position) for ply, position in enumerate(moves)],
+		board_state="".join(board),
+		current_player="X",
+		status="won",
+		winner="X"
+	)
+	game.updated_at = datetime.now(timezone.utc) - timedelta(days=updated_days_ago)
+	db.commit()
+	return game.id
+
+
+def test_write_segment_and_lookup(tmp_path):
+	archive = GameArchive(tmp_path)
+	records = [{"id": str(uuid4()), "number": number} for number in range(BLOCK_GAMES + 10)]
+	archive.write_segment(records[:100])
+	archive.write_segment(records[100:])
+
+	for record in records[::37]:
+		assert archive.get(UUID(record["id"])) == record
+	assert archive.get(uuid4()) is None
+	assert sorted(path.name for path in tmp_path.iterdir()) == [
+		"segment-00000001.dat", "segment-00000001.idx", "segment-00000002.dat", "segment-00000002.idx"
+	]
+
+
+def test_archive_games_moves_old_finished_games(db_session, tmp_path):
+	user = user_crud.create_user(db_session, "archiver", "archiver@example.com", "secret123")
+	old_id = _finished_game(db_session, user, [1, 4, 2, 5, 3], updated_days_ago=40)
+	recent_id = _finished_game(db_session, user, [1, 4, 2, 5, 3], updated_days_ago=1)
+	ongoing_id = game_crud.create_game(db_session, player_x_id=user.id).id
+	archive = GameArchive(tmp_path)
+
+	assert archive_games(db_session, archive, timedelta(days=30), batch_size=1) == 1
+
+	assert game_crud.get_game_by_id(db_session, old_id) is None
+	assert move_crud.get_moves_by_game(db_session, old_id) == []
+	assert game_crud.get_game_by_id(db_session, recent_id) is not None
+	assert game_crud.get_game_by_id(db_session, ongoing_id) is not None
+	record = archive.get(old_id)
+	assert record["status"] == "won"
+	assert record["board_state"] == "XXXOO----"
+	assert [(move["ply"], move["position"]) for move in record["moves"]] == [(1, 1), (2, 4), (3, 2), (4, 5), (5, 3)]
+
+
+def test_archive_games_falls_back_to_move_history(db_session, tmp_path):
+	user = user_crud.create_user(db_session, "retained", "retained@example.com", "secret123")
+	user_id = user.id
+	game_id = _finished_game(db_session, user, [1, 4, 2, 5, 3], updated_days_ago=400)
+	# A dropped moves partition takes the rows, but not games.move_history
+	move_crud.delete_moves_by_game(db_session, game_id)
+	archive = GameArchive(tmp_path)
+
+	assert archive_games(db_session, archive, timedelta(days=30)) == 1
+
+	record = archive.get(game_id)
+	assert [(move["ply"], move["player"], move["position"]) for move in record["moves"]] == [
+		(1, "X", 1), (2, "O", 4), (3, "X", 2), (4, "O", 5), (5, "X", 3)
+	]
+	assert all(move["player_id"] == str(user_id) for move in record["moves"])
@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services import batch_eval
+from app.services import GameService
+
+
+def _all_boards():
+	boards = []
+	for code in range(3 ** 9):
+		cells = []
+		for _ in range(9):
+			code, digit = divmod(code, 3)
+			cells.append("-XO"[digit])
+		boards.append("".join(cells))
+	return boards
+
+
+def test_encode_boards_matches_bitboard_encoding():
+	x_bits, o_bits = batch_eval.encode_boards(["XO-------", "--------O"])
+	assert x_bits.tolist() == [1, 0]
+	assert o_bits.tolist() == [2, 256]
+
+
+def test_evaluate_batch_matches_game_service_for_every_board():
+	boards = _all_boards()
+	status, winner = batch_eval.evaluate_board_states(boards)
+	for board, status_code, winner_code in zip(boards, status, winner):
+		expected = GameService.get_game_status(board)
+		assert (batch_eval.STATUS_NAMES[status_code], batch_eval.WINNER_NAMES[winner_code]) == expected
+
+
+def test_encode_boards_rejects_wrong_length():
+	with pytest.raises(ValueError):
+		batch_eval.encode_boards(["XO"])
+
+
+def test_encode_boards_rejects_ragged_batch():
+	# 8 + 10 cells add up to two boards, but neither board is valid
+	with pytest.raises(ValueError, match="exactly 9 cells"):
+		batch_eval.encode_boards(["XO------", "XO--------"])
+
+
+@pytest.mark.parametrize("board", ["XO------x", "XO------ ", "XO------é"])
+def test_encode_boards_rejects_unknown_cells(board):
+	with pytest.raises(ValueError, match="X, O and -"):
+		batch_eval.encode_boards(["---------", board])
@@ -0,0 +1,76 @@
+from app.services import bitboard
+from app.services import GameService
+
+
+def test_encode_decode_round_trip():
+	board = "XO-OX--OX"
+	x_bits, o_bits = bitboard.encode(board)
+	assert x_bits == 0b100010001
+	assert o_bits == 0b010001010
+	assert bitboard.decode(x_bits, o_bits) == board
+
+
+def test_empty_mask_is_complement_of_occupied():
+	x_bits, o_bits = bitboard.encode("XOX-O----")
+	assert bitboard.mask_to_positions(bitboard.empty_mask(x_bits, o_bits)) == [4, 6, 7, 8, 9]
+
+
+def test_winner_uses_line_table():
+	assert bitboard.winner(*bitboard.encode("OOO-XX-X-")) == "O"
+	assert bitboard.winner(*bitboard.encode("--X-X-X--")) == "X"
+	assert bitboard.winner(*bitboard.encode("XOXOXOOXO")) is None
+
+
+def test_status_matches_string_rules_for_every_board():
+	for code in range(3 ** 9):
+		cells = []
+		for _ in range(9):
+			code, digit = divmod(code, 3)
+			cells.append("-XO"[digit])
+		board = "".join(cells)
+		expected_winner = None
+		for pattern in GameService.WIN_PATTERNS:
+			a, b, c = (board[i] for i in pattern)
+			if a != "-" and a == b == c:
+				expected_winner = a
+				break
+		x_bits, o_bits = bitboard.encode(board)
+		winner = bitboard.winner(x_bits, o_bits)
+		if expected_winner is not None:
+			# Boards with two winners are unreachable; X is reported first.
+			assert winner is not None
+		else:
+			assert winner is None
+			expected_status = "ongoing" if "-" in board else "draw"
+			assert bitboard.status(x_bits, o_bits) == (expected_status, None)
+
+
+def test_place_sets_only_the_player_bit():
+	assert bitboard.place(0, 0, 4, "X") == (1 << 4, 0)
+	assert bitboard.place(1, 0, 8, "O") == (1, 1 << 8)
+
+
+def test_lines_through_cells():
+	assert len(bitboard.LINES_THROUGH[4]) == 4
+	assert len(bitboard.LINES_THROUGH[0]) == 3
+	assert len(bitboard.LINES_THROUGH[1]) == 2
+
+
+def test_apply_move_detects_win_through_last_cell():
+	state = bitboard.BoardState.from_board_state("XX-OO----")
+	new_state, status, winner = bitboard.apply_move(state, 2, "X")
+	assert (status, winner) == ("won", "X")
+	assert new_state.filled == 5
+	assert bitboard.decode(new_state.x_bits, new_state.o_bits) == "XXXOO----"
+
+
+def test_apply_move_uses_filled_count_for_draw():
+	state = bitboard.BoardState.from_board_state("XOXXOOOX-")
+	assert state.filled == 8
+	_, status, winner = bitboard.apply_move(state, 8, "X")
+	assert (status, winner) == ("draw", None)
+
+
+def test_apply_move_ongoing():
+	_, status, winner = bitboard.apply_move(bitboard.BoardState(0, 0, 0), 4, "X")
+	assert (status, winner) == ("ongoing", None)
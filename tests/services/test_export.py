@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud, user_crud
+from app.services import export
+
+
+@pytest.fixture()
+def db_session():
+	engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+
+@pytest.fixture()
+def games(db_session):
+	user = user_crud.create_user(db_session, "exporter", "exporter@example.com", "secret123")
+	played = game_crud.create_game(db_session, player_x_id=user.id, player_o_id=user.id)
+	game_crud.record_moves(db_session, played, [(user.id, "X", 5), (user.id, "O", 1)], "O---X----", "X")
+	waiting = game_crud.create_game(db_session, player_x_id=user.id, status="waiting")
+	extra = [game_crud.create_game(db_session, player_x_id=user.id) for _ in range(3)]
+	return [played, waiting] + extra
+
+
+def test_ndjson_export_streams_in_chunks(db_session, games):
+	chunks = list(export.render_chunks(db_session, "ndjson", chunk_size=2))
+
+	assert len(chunks) == 3
+	records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+	assert [record["id"] for record in records] == [str(game.id) for game in games]
+	assert records[0]["moves"] == [5, 1]
+	assert records[1]["moves"] == [] and records[1]["player_o_id"] is None
+	assert list(records[0]) == export.EXPORT_COLUMNS
+
+
+def test_csv_export_has_header_and_one_row_per_game(db_session, games):
+	rows = list(csv.reader(io.StringIO("".join(export.render_chunks(db_session, "csv", chunk_size=2)))))
+
+	assert rows[0] == export.EXPORT_COLUMNS
+	assert len(rows) == len(games) + 1
+	assert rows[1][export.EXPORT_COLUMNS.index("moves")] == "5 1"
+	assert rows[2][export.EXPORT_COLUMNS.index("player_o_id")] == ""
+
+
+def test_csv_export_of_empty_table_is_header_only(db_session):
+	assert "".join(export.render_chunks(db_session, "csv")).strip() == ",".join(export.EXPORT_COLUMNS)
@@ -4,7 +4,7 @@ from sqlalchemy.orm import sessionmaker
 from uuid import UUID
 
 from app.services import GameService
-from app.services.game_service import GameValidationError, GameNotFoundError
+from app.services.game_service import GameValidationError, GameNotFoundError, GameConflictError
 from app.engine import Base
 from app.crud import user_crud, game_crud
 
@@ -174,3 +174,57 @@ def test_join_game_as_player_o_rejects_non_waiting_status(db_session):
 
 	with pytest.raises(GameValidationError):
 		GameService.join_game_as_player_o(db_session, game.id, user_o.id)
+
+
+def test_get_game_status_after_move_matches_full_rescan():
+	board = "XO-XO----"
+	new_board, status, winner = GameService.get_game_status_after_move(board, 7, "X")
+	assert new_board == "XO-XO-X--"
+	assert (status, winner) == GameService.get_game_status(new_board) == ("won", "X")
+
+
+def test_get_game_status_after_move_invalid_raises():
+	with pytest.raises(ValueError):
+		GameService.get_game_status_after_move("X--------", 1, "O")
+
+
+def test_analyze_position_values_and_distances():
+	# X to move: 3 wins now, 6 blocks O and draws, anything else lets O win next move
+	analysis = dict(
+		(position, (result, plies))
+		for position, result, plies in GameService.analyze_position("XX-OO----", "X")
+	)
+	assert analysis[3] == ("win", 1)
+	assert analysis[6] == ("draw", 5)
+	assert analysis[7] == analysis[8] == analysis[9] == ("loss", 2)
+
+
+def test_analyze_position_empty_board_is_a_draw():
+	analysis = GameService.analyze_position("-" * 9, "X")
+	assert len(analysis) == 9
+	assert all(result == "draw" and plies == 9 for _, result, plies in analysis)
+
+
+def test_analyze_position_finished_game_has_no_moves():
+	assert GameService.analyze_position("XXXOO----", "O") == []
+
+
+def test_join_game_as_player_o_conflicts_with_concurrent_join(db_session):
+	user_x = user_crud.create_user(db_session, "race_join_x", "race_join_x@example.com", "secret123")
+	first = user_crud.create_user(db_session, "race_join_a", "race_join_a@example.com", "secret123")
+	second = user_crud.create_user(db_session, "race_join_b", "race_join_b@example.com", "secret123")
+	game = game_crud.create_game(db_session, player_x_id=user_x.id, status="waiting")
+	other = sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind())()
+	try:
+		# Read before the first join commits, as a concurrent request would
+		stale = game_crud.get_game_by_id(other, game.id)
+		assert stale.player_o_id is None
+		GameService.join_game_as_player_o(db_session, game.id, first.id)
+
+		with pytest.raises(GameConflictError):
+			GameService.join_game_as_player_o(other, game.id, second.id)
+	finally:
+		other.close()
+
+	db_session.expire_all()
+	assert game_crud.get_game_by_id(db_session, game.id).player_o_id == first.id
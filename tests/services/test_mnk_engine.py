@@ -0,0 +1,70 @@
+import pytest
+
+from app.services import mnk_engine
+from app.services.mnk_engine import MNKBoard
+
+
+def _position(board: MNKBoard, row: int, col: int) -> int:
+	return row * board.cols + col + 1
+
+
+def test_empty_board_state_scales_with_dimensions():
+	board = MNKBoard(15, 15, 5)
+	assert board.size == 225
+	assert board.to_board_state() == "-" * 225
+	assert board.filled == 0
+
+
+def test_horizontal_five_in_a_row_wins():
+	board = MNKBoard(15, 15, 5)
+	for col in range(4):
+		assert board.place(_position(board, 7, col), "X") == ("ongoing", None)
+	assert board.place(_position(board, 7, 4), "X") == ("won", "X")
+
+
+def test_diagonal_win_through_middle_of_run():
+	board = MNKBoard(15, 15, 5)
+	for step in (0, 1, 3, 4):
+		board.place(_position(board, 2 + step, 2 + step), "O")
+	assert board.place(_position(board, 4, 4), "O") == ("won", "O")
+
+
+def test_anti_diagonal_win():
+	board = MNKBoard(6, 7, 4)
+	for step in range(3):
+		board.place(_position(board, step, 5 - step), "X")
+	assert board.place(_position(board, 3, 2), "X") == ("won", "X")
+
+
+def test_run_does_not_wrap_around_rows():
+	board = MNKBoard(4, 4, 3)
+	board.place(4, "X")
+	board.place(5, "X")
+	assert board.place(6, "X") == ("ongoing", None)
+
+
+def test_full_board_without_run_is_draw():
+	board = MNKBoard(3, 3, 3, "XOXXOOOX-")
+	assert board.filled == 8
+	assert board.place(9, "X") == ("draw", None)
+
+
+def test_invalid_moves_raise():
+	board = MNKBoard(4, 4, 3)
+	board.place(1, "X")
+	with pytest.raises(ValueError):
+		board.place(1, "O")
+	with pytest.raises(ValueError):
+		board.place(17, "O")
+
+
+def test_board_state_length_must_match():
+	with pytest.raises(ValueError):
+		MNKBoard(4, 4, 3, "---------")
+
+
+def test_validate_dimensions():
+	assert mnk_engine.validate_dimensions(15, 15, 5) is None
+	assert mnk_engine.validate_dimensions(3, 3, 4) is not None
+	assert mnk_engine.validate_dimensions(2, 3, 3) is not None
+	assert mnk_engine.validate_dimensions(20, 20, 5) is not None
@@ -60,6 +60,14 @@ def test_validate_move_occupied(users_and_game):
 	assert error == "Position 1 is already occupied or out of bounds"
 
 
+def test_validate_move_rejects_empty_cell_of_decided_board(users_and_game):
+	user_x, _, game = users_and_game
+	# X already has the top row; the outcome table has no legal moves left
+	game.board_state = "XXXOO----"
+	error = MoveService.validate_move(game, position=9, player_id=user_x.id)
+	assert error == "Position 9 is already occupied or out of bounds"
+
+
 def test_validate_move_wrong_turn(users_and_game):
 	user_x, user_o, game = users_and_game
 	game.current_player = "O"
@@ -99,3 +107,225 @@ def test_execute_move_draw_last_move(db_session, users_and_game):
 	assert result["status"] == "draw"
 	assert result["winner"] is None
 	assert result["game"].board_state == "XOXOXOOXO"
+
+
+def test_execute_move_against_computer_plays_reply(db_session):
+	from app.services import GameService
+
+	user_x = user_crud.create_user(db_session, "botx", "botx@example.com", "secret123")
+	game = GameService.create_game_vs_computer(db_session, user_x.id, level="hard")
+	assert game.status == "ongoing"
+
+	result = MoveService.execute_move(db_session, game, position=1, player_id=user_x.id)
+
+	assert result["bot_move"] is not None
+	assert result["bot_move"].player == "O"
+	assert result["bot_move"].player_id == game.player_o_id
+	assert result["game"].board_state.count("O") == 1
+	assert result["game"].current_player == "X"
+
+
+def test_execute_move_against_computer_blocks_win(db_session):
+	from app.services import GameService
+
+	user_x = user_crud.create_user(db_session, "blockx", "blockx@example.com", "secret123")
+	game = GameService.create_game_vs_computer(db_session, user_x.id, level="medium")
+	game.board_state = "X---O----"
+
+	result = MoveService.execute_move(db_session, game, position=2, player_id=user_x.id)
+
+	assert result["bot_move"].position == 3
+	assert result["game"].board_state == "XXO-O----"
+
+
+def test_execute_move_against_computer_on_large_board(db_session, monkeypatch):
+	import importlib
+	from app.services import GameService
+	from app.services.bot_pool import BotPool
+	from app.crud import move_crud
+
+	move_service_module = importlib.import_module("app.services.move_service")
+	monkeypatch.setattr(move_service_module, "bot_pool", BotPool(0))
+	monkeypatch.setattr(move_service_module, "BOT_MCTS_TIME_BUDGET", 0.05)
+	user_x = user_crud.create_user(db_session, "mctsx", "mctsx@example.com", "secret123")
+	game = GameService.create_game_vs_computer(
+		db_session, user_x.id, level="hard", board_rows=7, board_cols=7, win_length=4
+	)
+
+	result = MoveService.execute_move(db_session, game, position=25, player_id=user_x.id)
+
+	assert result["bot_move"] is None
+	assert result["message"] == "Move successful. Waiting for the computer's move."
+	db_session.expire_all()
+	stored = game_crud.get_game_by_id(db_session, game.id)
+	assert stored.board_state.count("O") == 1
+	assert stored.current_player == "X"
+	moves = move_crud.get_moves_by_game(db_session, game.id)
+	assert [move.player for move in moves] == ["X", "O"]
+
+
+def test_apply_bot_move_ignores_stale_board(db_session):
+	user_x = user_crud.create_user(db_session, "stalex", "stalex@example.com", "secret123")
+	game = game_crud.create_game(
+		db_session, player_x_id=user_x.id, player_o_id=user_x.id, board_rows=5, board_cols=5, win_length=4
+	)
+
+	assert MoveService.apply_bot_move(db_session.get_bind(), game.id, "X" + "-" * 24, position=2) is None
+
+
+def test_failed_bot_search_falls_back_to_heuristic_move(db_session, monkeypatch):
+	import importlib
+	from app.bot import mcts
+	from app.services import GameService
+	from app.services.bot_pool import BotPool
+
+	move_service_module = importlib.import_module("app.services.move_service")
+	monkeypatch.setattr(move_service_module, "bot_pool", BotPool(0))
+
+	def _broken_search(*args, **kwargs):
+		raise RuntimeError("search crashed")
+
+	monkeypatch.setattr(mcts, "choose_move", _broken_search)
+	user_x = user_crud.create_user(db_session, "fallbackx", "fallbackx@example.com", "secret123")
+	game = GameService.create_game_vs_computer(
+		db_session, user_x.id, level="hard", board_rows=5, board_cols=5, win_length=4
+	)
+
+	MoveService.execute_move(db_session, game, position=1, player_id=user_x.id)
+
+	db_session.expire_all()
+	stored = game_crud.get_game_by_id(db_session, game.id)
+	assert stored.current_player == "X"
+	# Nothing to win or block yet, so the computer takes the centre
+	assert stored.board_state[12] == "O"
+
+
+def test_resume_pending_bot_moves_replies_in_stuck_games(db_session, monkeypatch):
+	import importlib
+	from app.services import GameService
+	from app.services.bot_pool import BotPool
+
+	move_service_module = importlib.import_module("app.services.move_service")
+	monkeypatch.setattr(move_service_module, "bot_pool", BotPool(0))
+	monkeypatch.setattr(move_service_module, "BOT_MCTS_TIME_BUDGET", 0.05)
+	user_x = user_crud.create_user(db_session, "stuckx", "stuckx@example.com", "secret123")
+	game = GameService.create_game_vs_computer(
+		db_session, user_x.id, level="hard", board_rows=5, board_cols=5, win_length=4
+	)
+	# X has moved, but the search for the reply was lost in a restart
+	game_crud.record_moves(db_session, game, [(user_x.id, "X", 1)], "X" + "-" * 24, "O")
+
+	assert MoveService.resume_pending_bot_moves(db_session) == 1
+
+	db_session.expire_all()
+	stored = game_crud.get_game_by_id(db_session, game.id)
+	assert stored.current_player == "X"
+	assert stored.board_state.count("O") == 1
+	assert MoveService.resume_pending_bot_moves(db_session) == 0
+
+
+def test_fallback_bot_position_wins_then_blocks():
+	assert MoveService.fallback_bot_position(4, 4, 3, "OO--XX----------") == 3
+	assert MoveService.fallback_bot_position(4, 4, 3, "O---XX----------") == 7
+
+
+def test_execute_move_against_computer_uses_tablebase(db_session, monkeypatch, tmp_path):
+	from app.services import GameService, tablebase
+
+	keys, values = tablebase.generate(3, 4, 3, max_empties=4, workers=1)
+	tablebase.write_tablebase(tmp_path / "tb.bin", 3, 4, 3, 4, keys, values)
+	monkeypatch.setitem(tablebase.TABLES, (3, 4, 3), tablebase.Tablebase(tmp_path / "tb.bin"))
+	user_x = user_crud.create_user(db_session, "tablex", "tablex@example.com", "secret123")
+	game = GameService.create_game_vs_computer(
+		db_session, user_x.id, level="hard", board_rows=3, board_cols=4, win_length=3
+	)
+	game.board_state = "XX-OOX-OXO--"
+
+	result = MoveService.execute_move(db_session, game, position=7, player_id=user_x.id)
+
+	# O completes its column 4-8-12 instead of waiting for the search
+	assert result["bot_move"].position == 12
+	assert (result["status"], result["winner"]) == ("won", "O")
+
+
+def test_execute_move_on_stale_game_conflicts(db_session, users_and_game):
+	from app.crud import move_crud
+	from app.services import GameConflictError
+
+	user_x, _, game = users_and_game
+	factory = sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind())
+	other = factory()
+	try:
+		stale = game_crud.get_game_with_moves(other, game.id)
+		MoveService.execute_move(db_session, game, position=1, player_id=user_x.id)
+
+		with pytest.raises(GameConflictError):
+			MoveService.execute_move(other, stale, position=2, player_id=user_x.id)
+	finally:
+		other.close()
+
+	db_session.expire_all()
+	assert game_crud.get_game_by_id(db_session, game.id).board_state == "X--------"
+	assert [move.position for move in move_crud.get_moves_by_game(db_session, game.id)] == [1]
+
+
+def test_parallel_moves_keep_board_and_history_consistent(tmp_path):
+	import threading
+	from app.crud import move_crud
+	from app.services import GameConflictError
+
+	engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	setup = factory()
+	user_x = user_crud.create_user(setup, "racex", "racex@example.com", "secret123")
+	user_o = user_crud.create_user(setup, "raceo", "raceo@example.com", "secret123")
+	players = {"X": user_x.id, "O": user_o.id}
+	game_id = game_crud.create_game(setup, player_x_id=user_x.id, player_o_id=user_o.id).id
+	setup.close()
+
+	for _ in range(5):
+		db = factory()
+		game = game_crud.get_game_by_id(db, game_id)
+		board, player = game.board_state, game.current_player
+		db.close()
+		if game.status != "ongoing":
+			break
+
+		free = [index + 1 for index, cell in enumerate(board) if cell == "-"][:4]
+		barrier = threading.Barrier(len(free))
+		outcomes = []
+
+		def _play(position: int) -> None:
+			session = factory()
+			try:
+				loaded = game_crud.get_game_with_moves(session, game_id)
+				# Every thread validates against the same board before anyone writes
+				barrier.wait()
+				MoveService.execute_move(session, loaded, position=position, player_id=players[player])
+				outcomes.append("ok")
+			except GameConflictError:
+				outcomes.append("conflict")
+			finally:
+				session.close()
+
+		threads = [threading.Thread(target=_play, args=(position,)) for position in free]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		assert sorted(outcomes) == ["conflict"] * (len(free) - 1) + ["ok"]
+
+	db = factory()
+	game = game_crud.get_game_by_id(db, game_id)
+	moves = move_crud.get_moves_by_game(db, game_id)
+	replayed = ["-"] * 9
+	for move in moves:
+		assert replayed[move.position - 1] == "-"
+		replayed[move.position - 1] = move.player
+	assert "".join(replayed) == game.board_state
+	assert [move.player for move in moves] == ["X", "O", "X", "O", "X"][:len(moves)]
+	assert game.version == len(moves) + 1
+	db.close()
+	engine.dispose()
@@ -0,0 +1,58 @@
+import pytest
+
+from app.services import bitboard, outcome_table
+from app.services import GameService
+
+
+def test_table_marks_every_reachable_position():
+	reachable = sum(
+		1 for index in range(outcome_table.POSITION_COUNT)
+		if outcome_table.TABLE[index * outcome_table.RECORD_SIZE] & outcome_table.REACHABLE
+	)
+	assert reachable == 5478
+
+
+def test_empty_board_is_a_draw_with_perfect_play():
+	outcome = outcome_table.lookup(0, 0)
+	assert outcome.status == "ongoing"
+	assert outcome.value == 0
+	assert outcome.plies_to_end == 9
+	assert outcome.legal_mask == bitboard.FULL_MASK
+
+
+def test_status_matches_bitboard_rules():
+	for board in ("XXXOO----", "XOXXOOOXX", "XO-------", "OO-XX-X--"):
+		x_bits, o_bits = bitboard.encode(board)
+		assert outcome_table.status(x_bits, o_bits) == bitboard.status(x_bits, o_bits)
+
+
+def test_unreachable_position_falls_back_to_bitboard():
+	x_bits, o_bits = bitboard.encode("XOXOXOOXO")
+	assert outcome_table.lookup(x_bits, o_bits) is None
+	assert outcome_table.status(x_bits, o_bits) == ("draw", None)
+
+
+def test_best_positions_take_the_win():
+	assert GameService.get_best_positions("XX-OO----") == [3]
+	assert GameService.get_best_positions("XXXOO----") == []
+
+
+def test_best_positions_block_the_threat():
+	assert GameService.get_best_positions("XX--O----") == [3]
+
+
+def test_write_and_load_mapped_table(tmp_path):
+	path = tmp_path / "outcome_table.bin"
+	outcome_table.write_table(path)
+
+	table = outcome_table.load_table(path)
+
+	assert bytes(table) == outcome_table.build_table()
+
+
+def test_load_table_rejects_foreign_file(tmp_path):
+	path = tmp_path / "outcome_table.bin"
+	path.write_bytes(b"not a table" * 10)
+
+	with pytest.raises(ValueError):
+		outcome_table.load_table(path)
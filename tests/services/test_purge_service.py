@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.engine import engine
+from app.crud import game_crud
+from app.services.purge_service import PurgeService, PURGE_LOCK_KEY
+
+
+def test_start_refuses_a_second_purge_until_the_first_finishes(monkeypatch):
+	release = threading.Event()
+	monkeypatch.setattr(game_crud, "delete_completed_games", lambda db, **kwargs: release.wait(10))
+	service = PurgeService(batch_size=10, pause_ms=0)
+	sqlite_engine = create_engine("sqlite://")
+	db = Session(bind=sqlite_engine)
+	try:
+		assert service.start(db) is True
+		assert service.start(db) is False
+		assert service.status(db)["running"] is True
+
+		release.set()
+		service.wait_idle(timeout=10)
+		assert service.status(db)["running"] is False
+		assert service.start(db) is True
+		service.wait_idle(timeout=10)
+	finally:
+		release.set()
+		db.close()
+		sqlite_engine.dispose()
+
+
+@pytest.fixture()
+def postgres_conn():
+	if engine.dialect.name != "postgresql":
+		pytest.skip("The purge lock needs PostgreSQL")
+	try:
+		conn = engine.connect()
+	except OperationalError as e:
+		pytest.skip(f"PostgreSQL is not reachable: {e}")
+	try:
+		yield conn
+	finally:
+		conn.close()
+
+
+def test_purge_in_another_process_blocks_start_and_shows_as_running(postgres_conn):
+	# The lock taken on a second connection stands for another app process
+	postgres_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": PURGE_LOCK_KEY})
+	postgres_conn.commit()
+	service = PurgeService(batch_size=10, pause_ms=0)
+	db = Session(bind=engine)
+	try:
+		assert service.start(db) is False
+		assert service.status(db)["running"] is True
+
+		postgres_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PURGE_LOCK_KEY})
+		postgres_conn.commit()
+		assert service.status(db)["running"] is False
+	finally:
+		db.close()
@@ -0,0 +1,171 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.engine import Base
+from app.crud import game_crud, move_crud, review_crud, user_crud
+from app.services import ReviewService
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+	engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}", connect_args={"check_same_thread": False})
+	Base.metadata.create_all(bind=engine)
+	try:
+		yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+	finally:
+		engine.dispose()
+
+
+def _finished_game(db, moves, status, winner):
+	user_x = user_crud.create_user(db, f"x_{uuid4().hex[:8]}", f"{uuid4().hex[:8]}@example.com", "secret123")
+	user_o = user_crud.create_user(db, f"o_{uuid4().hex[:8]}", f"{uuid4().hex[:8]}@example.com", "secret123")
+	game = game_crud.create_game(db, player_x_id=user_x.id, player_o_id=user_o.id)
+	board = ["-"] * 9
+	played = []
+	for ply, position in enumerate(moves):
+		player = "X" if ply % 2 == 0 else "O"
+		played.append((user_x.id if player == "X" else user_o.id, player, position))
+		board[position - 1] = player
+	game_crud.record_moves(db, game, played, board_state="".join(board), current_player=player, status=status, winner=winner)
+	return game.id
+
+
+def test_review_moves_flags_blunders():
+	# O answers the center with an edge, which loses by force
+	reviews = ReviewService.review_moves([("X", 5), ("O", 2), ("X", 1), ("O", 9), ("X", 3)])
+
+	assert [review["ply"] for review in reviews] == [1, 2, 3, 4, 5]
+	assert reviews[0]["played_result"] == "draw"
+	assert reviews[0]["is_blunder"] is False
+	assert reviews[0]["accuracy"] == 1.0
+	assert reviews[1]["played_result"] == "loss"
+	assert reviews[1]["best_result"] == "draw"
+	assert reviews[1]["is_blunder"] is True
+	assert reviews[1]["best_position"] in (1, 3, 7, 9)
+	assert reviews[2]["played_result"] == "win"
+	# Once lost, the only defence is not a blunder
+	assert reviews[3]["is_blunder"] is False
+	# X lets the forced win slip into a draw
+	assert (reviews[4]["played_result"], reviews[4]["is_blunder"]) == ("draw", True)
+
+
+def test_review_games_stores_reviews_once(session_factory):
+	db = session_factory()
+	try:
+		game_id = _finished_game(db, [5, 2, 1, 9, 3, 7, 4, 6, 8], "draw", None)
+		unfinished = game_crud.create_game(db).id
+
+		assert ReviewService.review_games(db, [game_id, unfinished]) == 1
+		assert ReviewService.review_games(db, [game_id]) == 0
+
+		reviews = review_crud.get_reviews_by_game(db, game_id)
+		assert [review.position for review in reviews] == [5, 2, 1, 9, 3, 7, 4, 6, 8]
+		assert review_crud.get_reviews_by_game(db, unfinished) == []
+	finally:
+		db.close()
+
+
+def test_review_games_reads_moves_from_history(session_factory):
+	db = session_factory()
+	try:
+		game_id = _finished_game(db, [1, 4, 2, 5, 3], "won", "X")
+		# Move rows may be gone after partition retention; move_history still has every move
+		move_crud.delete_moves_by_game(db, game_id)
+
+		assert ReviewService.review_games(db, [game_id]) == 1
+
+		reviews = review_crud.get_reviews_by_game(db, game_id)
+		assert [(review.player, review.position) for review in reviews] == [("X", 1), ("O", 4), ("X", 2), ("O", 5), ("X", 3)]
+	finally:
+		db.close()
+
+
+def test_background_workers_review_queued_games(session_factory):
+	db = session_factory()
+	service = ReviewService(workers=2, queue_size=100, batch_size=3)
+	try:
+		game_ids = [_finished_game(db, [1, 4, 2, 5, 3], "won", "X") for _ in range(5)]
+		service.start()
+		for game_id in game_ids:
+			assert service.enqueue(db, game_id)
+		service.wait_idle()
+
+		for game_id in game_ids:
+			reviews = review_crud.get_reviews_by_game(db, game_id)
+			assert len(reviews) == 5
+	finally:
+		service.shutdown()
+		db.close()
+
+
+def test_enqueue_drops_games_when_queue_is_full(session_factory, capsys):
+	db = session_factory()
+	service = ReviewService(workers=1, queue_size=1, batch_size=10)
+	try:
+		assert service.enqueue(db, uuid4()) is True
+		dropped = uuid4()
+		assert service.enqueue(db, dropped) is False
+		assert str(dropped) in capsys.readouterr().out
+	finally:
+		db.close()
+
+
+def test_startup_sweep_reviews_dropped_games(session_factory):
+	db = session_factory()
+	service = ReviewService(workers=1, queue_size=1, batch_size=2)
+	try:
+		game_ids = [_finished_game(db, [1, 4, 2, 5, 3], "won", "X") for _ in range(4)]
+		reviewed = game_ids[0]
+		ReviewService.review_games(db, [reviewed])
+		unfinished = game_crud.create_game(db).id
+		# Only one game fits; the others are dropped as if the queue had been full
+		assert service.enqueue(db, game_ids[1]) is True
+		assert service.enqueue(db, game_ids[2]) is False
+
+		service.start(db.get_bind())
+		service._sweeper.join(timeout=10)
+		service.wait_idle()
+
+		for game_id in game_ids:
+			assert len(review_crud.get_reviews_by_game(db, game_id)) == 5
+		assert review_crud.get_reviews_by_game(db, unfinished) == []
+	finally:
+		service.shutdown()
+		db.close()
+
+
+def test_sweep_skips_games_already_queued(session_factory):
+	db = session_factory()
+	service = ReviewService(workers=1, queue_size=10, batch_size=10)
+	try:
+		game_ids = [_finished_game(db, [1, 4, 2, 5, 3], "won", "X") for _ in range(3)]
+		assert service.enqueue(db, game_ids[0]) is True
+
+		assert service.sweep(db.get_bind()) == 2
+		assert service.sweep(db.get_bind()) == 0
+	finally:
+		db.close()
+
+
+def test_services_sweeping_one_database_store_each_review_once(session_factory):
+	db = session_factory()
+	services = [ReviewService(workers=1, queue_size=100, batch_size=5) for _ in range(2)]
+	try:
+		game_ids = [_finished_game(db, [1, 4, 2, 5, 3], "won", "X") for _ in range(10)]
+		# Two app processes: each sweeps and reviews the same backlog
+		for service in services:
+			assert service.sweep(db.get_bind()) == 10
+		for service in services:
+			service.start()
+		for service in services:
+			service.wait_idle()
+
+		for game_id in game_ids:
+			assert [review.ply for review in review_crud.get_reviews_by_game(db, game_id)] == [1, 2, 3, 4, 5]
+	finally:
+		for service in services:
+			service.shutdown()
+		db.close()
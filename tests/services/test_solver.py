@@ -0,0 +1,65 @@
+import pytest
+
+from app.services import bitboard, solver
+
+
+def _play_out(level_x: str, level_o: str) -> str:
+	board = bitboard.BoardState(0, 0, 0)
+	player = "X"
+	status = "ongoing"
+	winner = None
+	while status == "ongoing":
+		level = level_x if player == "X" else level_o
+		index = solver.choose_move(board.x_bits, board.o_bits, player, level)
+		board, status, winner = bitboard.apply_move(board, index, player)
+		player = "O" if player == "X" else "X"
+	return winner or "draw"
+
+
+def test_perfect_play_is_a_draw():
+	assert _play_out("hard", "hard") == "draw"
+
+
+def test_hard_never_loses_to_easy():
+	for _ in range(20):
+		assert _play_out("easy", "hard") != "X"
+		assert _play_out("hard", "easy") != "O"
+
+
+def test_takes_immediate_win():
+	x_bits, o_bits = bitboard.encode("XX-OO----")
+	assert solver.choose_move(x_bits, o_bits, "X", "easy") == 2
+
+
+def test_medium_blocks_immediate_threat():
+	x_bits, o_bits = bitboard.encode("XX--O----")
+	assert solver.choose_move(x_bits, o_bits, "O", "medium") == 2
+
+
+def test_hard_avoids_losing_corner_reply():
+	x_bits, o_bits = bitboard.encode("X---O---X")
+	scores = dict(solver.score_moves(x_bits, o_bits, "O"))
+	assert scores[2] < 0 and scores[6] < 0
+	assert solver.choose_move(x_bits, o_bits, "O", "hard") in (1, 3, 5, 7)
+
+
+def test_results_are_memoized_on_canonical_position():
+	solver._ROOT_SCORES.clear()
+	corner_scores = dict(solver.score_moves(*bitboard.encode("X--------"), "O"))
+	rotated_scores = dict(solver.score_moves(*bitboard.encode("--X------"), "O"))
+
+	assert len(solver._ROOT_SCORES) == 1
+	# The centre reply is the only safe one in both orientations
+	assert corner_scores[4] == rotated_scores[4] == 0
+	assert corner_scores[8] < 0 and rotated_scores[6] < 0
+
+
+def test_time_budget_returns_a_legal_move():
+	x_bits, o_bits = bitboard.encode("----X----")
+	index = solver.choose_move(x_bits, o_bits, "O", "hard", time_budget=0.0)
+	assert bitboard.empty_mask(x_bits, o_bits) >> index & 1
+
+
+def test_unknown_level_raises():
+	with pytest.raises(ValueError):
+		solver.choose_move(0, 0, "X", "grandmaster")
@@ -0,0 +1,65 @@
+from app.services import bitboard, symmetry
+
+
+def test_inverse_transforms_round_trip():
+	board = "XO--X-O--"
+	for transform in range(8):
+		transformed = symmetry.transform_board(board, transform)
+		assert symmetry.transform_board(transformed, symmetry.INVERSE[transform]) == board
+
+
+def test_bit_tables_match_string_transforms():
+	board = "XOX-O--X-"
+	x_bits, o_bits = bitboard.encode(board)
+	for transform in range(8):
+		expected = symmetry.transform_board(board, transform)
+		assert bitboard.decode(*symmetry.transform_bits(x_bits, o_bits, transform)) == expected
+
+
+def test_canonicalize_returns_transform_used():
+	board = "--X-O----"
+	canonical, transform = symmetry.canonicalize(board)
+	assert symmetry.transform_board(board, transform) == canonical
+
+
+def test_symmetric_boards_share_canonical_form():
+	corners = ["X--------", "--X------", "------X--", "--------X"]
+	canonical_forms = {canonical for canonical, _ in symmetry.canonicalize_many(corners)}
+	assert len(canonical_forms) == 1
+
+
+def test_reachable_positions_shrink_about_eightfold():
+	seen = set()
+	canonical = set()
+	stack = [(0, 0, "X")]
+	while stack:
+		x_bits, o_bits, player = stack.pop()
+		if (x_bits, o_bits) in seen:
+			continue
+		seen.add((x_bits, o_bits))
+		canonical.add(symmetry.canonical_key(x_bits, o_bits))
+		if bitboard.status(x_bits, o_bits)[0] != "ongoing":
+			continue
+		empty = bitboard.empty_mask(x_bits, o_bits)
+		for index in range(9):
+			if empty >> index & 1:
+				stack.append((*bitboard.place(x_bits, o_bits, index, player), "O" if player == "X" else "X"))
+	assert len(seen) == 5478
+	assert len(canonical) == 765
+
+
+def test_map_and_unmap_positions():
+	board = "X--------"
+	canonical, transform = symmetry.canonicalize("--X------")
+	assert canonical == board
+	mapped = symmetry.map_position(3, transform)
+	assert mapped == 1
+	assert symmetry.unmap_position(mapped, transform) == 3
+
+
+def test_canonicalize_many_preserves_order():
+	boards = ["----X----", "X--------", "----X----"]
+	results = symmetry.canonicalize_many(boards)
+	assert [canonical for canonical, _ in results] == [
+		symmetry.canonicalize(board)[0] for board in boards
+	]
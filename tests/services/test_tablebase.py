@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from app.services import bitboard, mnk_engine, solver, tablebase
+from app.services import GameService
+
+
+@pytest.fixture(scope="module")
+def full_3x3(tmp_path_factory):
+	path = tmp_path_factory.mktemp("tablebase") / "tablebase_3x3x3.bin"
+	keys, values = tablebase.generate(3, 3, 3, max_empties=9, workers=1)
+	tablebase.write_tablebase(path, 3, 3, 3, 9, keys, values)
+	return tablebase.Tablebase(path)
+
+
+@pytest.fixture(scope="module")
+def endgame_3x4(tmp_path_factory):
+	path = tmp_path_factory.mktemp("tablebase") / "tablebase_3x4x3.bin"
+	keys, values = tablebase.generate(3, 4, 3, max_empties=4, workers=2, chunk_size=64)
+	tablebase.write_tablebase(path, 3, 4, 3, 4, keys, values)
+	return tablebase.Tablebase(path)
+
+
+def test_full_3x3_covers_every_non_terminal_position(full_3x3):
+	assert len(full_3x3) == 4520
+	assert full_3x3.value(0, 0) == 0
+
+
+def test_full_3x3_matches_solver(full_3x3):
+	rng = random.Random(11)
+	for _ in range(200):
+		board = ["-"] * 9
+		player = "X"
+		for _ in range(rng.randint(0, 7)):
+			board[rng.choice([i for i, cell in enumerate(board) if cell == "-"])] = player
+			player = "O" if player == "X" else "X"
+		board_state = "".join(board)
+		x_bits, o_bits = bitboard.encode(board_state)
+		if bitboard.winner(x_bits, o_bits):
+			continue
+		expected = [(index + 1, score) for index, score in solver.score_moves(x_bits, o_bits, player)]
+		assert full_3x3.score_moves(board_state) == expected
+
+
+def _reference_score(board_state, player):
+	"""Plain minimax on MNKBoard, in the tablebase's score convention."""
+	best = None
+	for position in mnk_engine.MNKBoard(3, 4, 3, board_state).available_positions():
+		board = mnk_engine.MNKBoard(3, 4, 3, board_state)
+		status, _ = board.place(position, player)
+		empties = len(board.available_positions())
+		if status == "won":
+			score = empties + 1
+		elif status == "draw":
+			score = 0
+		else:
+			score = -_reference_score(board.to_board_state(), "O" if player == "X" else "X")
+		best = score if best is None else max(best, score)
+	return best
+
+
+def test_endgame_matches_reference_minimax(endgame_3x4):
+	rng = random.Random(5)
+	checked = 0
+	while checked < 30:
+		board = ["-"] * 12
+		player = "X"
+		for _ in range(rng.randint(8, 11)):
+			board[rng.choice([i for i, cell in enumerate(board) if cell == "-"])] = player
+			player = "O" if player == "X" else "X"
+		board_state = "".join(board)
+		reference = mnk_engine.MNKBoard(3, 4, 3, board_state)
+		if any(
+			reference.run_length(index, row_step, col_step) >= 3
+			for index, cell in enumerate(board_state) if cell != "-"
+			for row_step, col_step in mnk_engine.DIRECTIONS
+		):
+			continue
+		scores = endgame_3x4.score_moves(board_state)
+		assert max(score for _, score in scores) == _reference_score(board_state, player)
+		checked += 1
+
+
+def test_endgame_lookup_covers_only_late_positions(endgame_3x4):
+	# X to move with four empty cells: 3 completes the top row, 11 the diagonal
+	assert endgame_3x4.best_move("XX-OOX-OXO--") == 3
+	assert endgame_3x4.score_moves("X-----------") is None
+	assert endgame_3x4.score_moves("XX-") is None
+
+
+def test_load_rejects_foreign_file(tmp_path):
+	path = tmp_path / "tablebase.bin"
+	path.write_bytes(b"not a tablebase" * 10)
+
+	with pytest.raises(ValueError):
+		tablebase.Tablebase(path)
+
+
+def test_generate_rejects_boards_over_32_cells():
+	with pytest.raises(ValueError):
+		tablebase.generate(5, 7, 4, max_empties=2, workers=1)
+
+
+def test_best_positions_use_loaded_tablebase(endgame_3x4, monkeypatch):
+	monkeypatch.setitem(tablebase.TABLES, (3, 4, 3), endgame_3x4)
+
+	assert GameService.get_best_positions("XX-OOX-OXO--", 3, 4, 3) == [3, 11]
+	assert GameService.get_best_positions("X-----------", 3, 4, 3) == []
+	assert GameService.get_best_positions("-" * 16, 4, 4, 4) == []